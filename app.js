@@ -346,7 +346,7 @@ function showNotification(message, type = 'info', duration = 4000) {
 }
 
 /**
- * Salva dados da aplicação
+ * Salva dados da aplicação (retorna false se a gravação falhou, ex.: cota do localStorage)
  */
 async function saveAppData() {
     try {
@@ -359,10 +359,12 @@ async function saveAppData() {
         localStorage.setItem('cfoProData', JSON.stringify(dataToSave));
         
         debugLog('debug', 'Dados salvos no localStorage');
+        return true;
         
     } catch (error) {
         debugLog('error', 'Erro ao salvar dados:', error);
         showNotification('Erro ao salvar dados', 'error');
+        return false;
     }
 }
 
@@ -29,7 +29,9 @@ let appData = {
         geminiApiKey: '',
         lastBackup: null,
         autoBackup: true,
-        debugMode: false
+        debugMode: false,
+        savedViews: [],
+        fiscalYearStartMonth: 1
     },
     backups: [],
     filters: {
@@ -46,13 +48,16 @@ let appData = {
     ui: {
         currentTab: 'dashboard',
         sortColumn: 'Data',
-        sortDirection: 'desc'
+        sortDirection: 'desc',
+        comparisonBasis: 'mom',
+        virtualScroll: false
     }
 };
 
 // Estado global da aplicação
 let appState = {
     isInitialized: false,
+    dataVersion: 0,
     charts: {},
     intervalHandlers: {
         autoBackup: null,
@@ -61,7 +66,85 @@ let appState = {
     cache: {
         filteredTransactions: [],
         kpiCache: null,
+        kpiCacheVersion: -1,
         lastCacheUpdate: null
+    },
+    cube: {
+        partitions: new Map()
+    },
+    accountIndex: {
+        version: -1,
+        chart: null,
+        byCode: new Map()
+    },
+    monthRows: new Map(),
+    tabRenderCache: new Map(),
+    virtualTable: null,
+    reconciliationQueue: null,
+    classificationRuleset: null,
+    chartOfAccountsVersion: 0,
+    classificationOptions: {
+        version: -1,
+        chart: null,
+        entries: new Map()
+    },
+    classifier: {
+        worker: null,
+        engine: null,
+        model: null,
+        loaded: false,
+        chain: Promise.resolve(),
+        requests: new Map(),
+        nextRequest: 1,
+        suggestions: new Map(),
+        trainTimer: null,
+        refreshToken: 0,
+        stats: null
+    },
+    searchIndex: null,
+    searchIndexBuild: null,
+    auditBuilds: new Map(),
+    filterPipeline: null,
+    queryCache: new Map(),
+    savedViewResults: new Map(),
+    facetIndex: null,
+    facetResult: null,
+    exportInProgress: false,
+    sortIndex: null,
+    selection: new Set(),
+    idIndex: {
+        byId: new Map(),
+        positions: new Map(),
+        positionsDirty: false
+    },
+    warmCache: new Map(),
+    idle: {
+        handle: null,
+        queue: [],
+        version: -1
+    },
+    currentReport: null,
+    transfers: {
+        proposals: null,
+        version: -1
+    },
+    matching: {
+        worker: null,
+        engine: null,
+        requests: new Map(),
+        nextRequest: 1,
+        running: false,
+        result: null
+    },
+    saveQueue: {
+        pending: 0,
+        saving: 0,
+        handle: null,
+        current: null
+    },
+    sketches: {
+        byMonth: new Map(),
+        dirtyMonths: new Set()
     }
 };
 
@@ -155,6 +238,13 @@ function formatDate(dateString) {
     }
 }
 
+/**
+ * Dia (em dias desde 1970-01-01 UTC) de uma data; NaN se inválida
+ */
+function toEpochDay(value) {
+    return Math.floor(new Date(value).getTime() / 86400000);
+}
+
 /**
  * Formatação de mês/ano para agrupamento
  */
@@ -241,6 +331,925 @@ function throttle(func, limit) {
     };
 }
 
+// ==========================================
+// RATEIO DE LANÇAMENTOS (SPLIT)
+// ==========================================
+
+/**
+ * Código numérico no início do nome de uma conta ("2.2.1 Salários" -> "2.2.1")
+ */
+const ACCOUNT_CODE_PATTERN = /^(\d+(?:\.\d+)*)\s/;
+
+/**
+ * Código de uma conta do plano (o próprio nome, se não houver código numérico)
+ */
+function getAccountCode(accountName) {
+    const match = ACCOUNT_CODE_PATTERN.exec(accountName);
+    return match ? match[1] : accountName;
+}
+
+/**
+ * Índice código/nome -> caminho completo no plano de contas
+ * (reconstruído quando o plano de contas muda)
+ */
+function getAccountIndex() {
+    const index = appState.accountIndex;
+    if (index.version === appState.chartOfAccountsVersion && index.chart === appData.chartOfAccounts) {
+        return index.byCode;
+    }
+
+    const byCode = new Map();
+    const register = (name, path) => {
+        byCode.set(name, path);
+        if (!byCode.has(getAccountCode(name))) byCode.set(getAccountCode(name), path);
+    };
+
+    Object.entries(appData.chartOfAccounts || {}).forEach(([level1, children]) => {
+        register(level1, { level1, level2: '', level3: '' });
+        Object.entries(children || {}).forEach(([level2, accounts]) => {
+            register(level2, { level1, level2, level3: '' });
+            (accounts || []).forEach(level3 => register(level3, { level1, level2, level3 }));
+        });
+    });
+
+    index.version = appState.chartOfAccountsVersion;
+    index.chart = appData.chartOfAccounts;
+    index.byCode = byCode;
+    return byCode;
+}
+
+/**
+ * Caminho (níveis 1/2/3) de um código de classificação do rateio.
+ * Códigos desconhecidos aparecem como nível 1 para não sumirem dos totais.
+ */
+function resolveAllocationAccount(code) {
+    return getAccountIndex().get(code) || { level1: code, level2: '', level3: '' };
+}
+
+/**
+ * Valor da linha em centavos (entrada ou saída), base do rateio
+ */
+function getTransactionAmountCents(transaction) {
+    return toCents(transaction['Entrada (R$)']) || toCents(transaction['Saída (R$)']);
+}
+
+/**
+ * Rateio efetivo de uma transação: a lista de [código, centro de custo, centavos]
+ * quando a soma fecha com o valor da linha; caso contrário null (vale a classificação da linha)
+ */
+function getEffectiveAllocations(transaction) {
+    const allocations = transaction.allocations;
+    if (!Array.isArray(allocations) || allocations.length === 0) return null;
+
+    let total = 0;
+    for (let i = 0; i < allocations.length; i++) {
+        total += allocations[i][2];
+    }
+    return total === getTransactionAmountCents(transaction) ? allocations : null;
+}
+
+/**
+ * Valida um rateio para a transação. Retorna a lista de erros (vazia se válido).
+ */
+function validateAllocations(transaction, allocations) {
+    const errors = [];
+    const income = toCents(transaction['Entrada (R$)']);
+    const expense = toCents(transaction['Saída (R$)']);
+    const index = getAccountIndex();
+
+    if (income > 0 && expense > 0) {
+        errors.push('Transação com entrada e saída simultaneamente não pode ser rateada');
+    }
+    if (!Array.isArray(allocations) || allocations.length < 2) {
+        errors.push('O rateio precisa de pelo menos duas partes');
+        return errors;
+    }
+
+    let total = 0;
+    allocations.forEach(([code, , cents], position) => {
+        if (!index.has(code)) {
+            errors.push(`Parte ${position + 1}: classificação "${code}" não existe no plano de contas`);
+        }
+        if (!Number.isInteger(cents) || cents <= 0) {
+            errors.push(`Parte ${position + 1}: valor deve ser positivo`);
+        }
+        total += cents;
+    });
+
+    const amount = getTransactionAmountCents(transaction);
+    if (total !== amount) {
+        errors.push(`Soma do rateio (${formatCurrency(total / 100)}) difere do valor da transação (${formatCurrency(amount / 100)})`);
+    }
+
+    return errors;
+}
+
+/**
+ * Rateio em texto: "código | centro de custo | valor; ..."
+ */
+function formatAllocations(allocations) {
+    if (!Array.isArray(allocations)) return '';
+    return allocations
+        .map(([code, costCenter, cents]) => `${code} | ${costCenter || ''} | ${(cents / 100).toFixed(2).replace('.', ',')}`)
+        .join('; ');
+}
+
+/**
+ * Converte o texto de rateio em [código, centro de custo, centavos].
+ * Lança erro se alguma parte estiver fora do formato.
+ */
+function parseAllocationsText(text) {
+    return String(text || '').split(';')
+        .map(part => part.trim())
+        .filter(Boolean)
+        .map((part, position) => {
+            const fields = part.split('|').map(field => field.trim());
+            if (fields.length !== 3 || !fields[0]) {
+                throw new Error(`Parte ${position + 1} inválida: use "código | centro de custo | valor"`);
+            }
+            return [fields[0], fields[1], toCents(fields[2])];
+        });
+}
+
+/**
+ * Quantidade de transações com rateio
+ */
+function countSplitTransactions() {
+    let count = 0;
+    appData.transactions.forEach(transaction => {
+        if (Array.isArray(transaction.allocations) && transaction.allocations.length > 0) count++;
+    });
+    return count;
+}
+
+// ==========================================
+// CUBO ANALÍTICO (AGREGAÇÕES PRÉ-CALCULADAS)
+// ==========================================
+
+/**
+ * Dimensões do cubo, na ordem usada para compor a chave das células
+ */
+const CUBE_DIMENSIONS = ['month', 'level1', 'level2', 'level3', 'bank', 'costCenter', 'status'];
+
+/**
+ * Converte um valor monetário para centavos inteiros
+ * (somas incrementais em centavos não acumulam erro de ponto flutuante)
+ */
+function toCents(value) {
+    return Math.round(parseValue(value) * 100);
+}
+
+/**
+ * Transferência entre contas próprias já aceita (não é receita nem despesa)
+ */
+function isInternalTransfer(transaction) {
+    return !!transaction.transferId;
+}
+
+/**
+ * Mês (YYYY-MM) de referência de uma transação
+ */
+function getTransactionMonth(transaction) {
+    return transaction['Mes'] || formatMonthYear(new Date(transaction['Data']));
+}
+
+/**
+ * Coordenadas de uma transação no cubo
+ */
+function getCubeCoordinates(transaction) {
+    return {
+        month: getTransactionMonth(transaction),
+        level1: transaction['Classificação Nível 1'] || '',
+        level2: transaction['Classificação Nível 2'] || '',
+        level3: transaction['Classificação Nível 3'] || '',
+        bank: transaction['Banco Origem/Destino'] || '',
+        costCenter: transaction['Centro de Custo'] || '',
+        status: transaction['Status Conciliação'] || ''
+    };
+}
+
+/**
+ * Soma (sign = 1) ou subtrai (sign = -1) uma transação do cubo.
+ * Linhas com rateio são distribuídas entre as células de cada parte; a linha
+ * conta uma única vez, numa célula sem valores nas suas próprias coordenadas
+ * (assim as células continuam cobrindo os campos da linha, usados pela consulta).
+ */
+function applyTransactionToCube(transaction, sign) {
+    const coordinates = getCubeCoordinates(transaction);
+
+    // Transferências entre contas próprias contam como linha, mas não como valor
+    const measureSign = isInternalTransfer(transaction) ? 0 : sign;
+
+    const allocations = getEffectiveAllocations(transaction);
+    if (!allocations) {
+        applyToCubeCell(
+            coordinates,
+            sign,
+            measureSign * toCents(transaction['Entrada (R$)']),
+            measureSign * toCents(transaction['Saída (R$)']),
+            sign
+        );
+        return;
+    }
+
+    applyToCubeCell(coordinates, sign, 0, 0, sign);
+
+    const isIncome = toCents(transaction['Entrada (R$)']) > 0;
+    allocations.forEach(([code, costCenter, cents]) => {
+        const account = resolveAllocationAccount(code);
+        const amount = measureSign * cents;
+        applyToCubeCell(
+            { ...coordinates, ...account, costCenter: costCenter || '' },
+            sign,
+            isIncome ? amount : 0,
+            isIncome ? 0 : amount,
+            0
+        );
+    });
+}
+
+/**
+ * Soma uma contribuição na célula correspondente do cubo.
+ * As células são particionadas por mês para que consultas por período
+ * visitem apenas as partições relevantes; entries conta as contribuições
+ * (linhas ou partes de rateio) e decide quando a célula deixa de existir.
+ */
+function applyToCubeCell(coordinates, sign, revenueCents, expensesCents, count) {
+    const partitions = appState.cube.partitions;
+
+    let partition = partitions.get(coordinates.month);
+    if (!partition) {
+        if (sign < 0) return;
+        partition = new Map();
+        partitions.set(coordinates.month, partition);
+    }
+
+    const key = CUBE_DIMENSIONS.map(dimension => coordinates[dimension]).join('\u001f');
+    let cell = partition.get(key);
+    if (!cell) {
+        if (sign < 0) return;
+        cell = { ...coordinates, revenueCents: 0, expensesCents: 0, count: 0, entries: 0 };
+        partition.set(key, cell);
+    }
+
+    cell.revenueCents += revenueCents;
+    cell.expensesCents += expensesCents;
+    cell.count += count;
+    cell.entries += sign;
+
+    if (cell.entries <= 0) {
+        partition.delete(key);
+        if (partition.size === 0) {
+            partitions.delete(coordinates.month);
+        }
+    }
+}
+
+/**
+ * Reconstrói o cubo inteiro a partir das transações
+ */
+function rebuildCube() {
+    appState.cube.partitions = new Map();
+    appData.transactions.forEach(transaction => applyTransactionToCube(transaction, 1));
+
+    debugLog('debug', 'Cubo reconstruído:', {
+        months: appState.cube.partitions.size,
+        cells: countCubeCells()
+    });
+}
+
+/**
+ * Quantidade total de células materializadas
+ */
+function countCubeCells() {
+    let cells = 0;
+    appState.cube.partitions.forEach(partition => {
+        cells += partition.size;
+    });
+    return cells;
+}
+
+/**
+ * Verifica se uma célula atende aos filtros informados.
+ * Cada filtro é um valor exato ou uma função (valor) => boolean.
+ */
+function cubeCellMatches(cell, where) {
+    for (const dimension in where) {
+        const condition = where[dimension];
+        if (typeof condition === 'function') {
+            if (!condition(cell[dimension])) return false;
+        } else if (cell[dimension] !== condition) {
+            return false;
+        }
+    }
+    return true;
+}
+
+/**
+ * Agrega o cubo pelas dimensões informadas (roll-up).
+ * Retorna uma linha por combinação de valores, com receitas e despesas em reais.
+ *
+ * Ex.: rollupCube(['month']) ou rollupCube(['level1', 'level2'], { status: 'Conciliado' })
+ */
+function rollupCube(dimensions = [], where = {}) {
+    const groups = new Map();
+    const monthFilter = where.month;
+    const cellFilters = { ...where };
+    delete cellFilters.month;
+
+    appState.cube.partitions.forEach((partition, month) => {
+        if (monthFilter !== undefined) {
+            const monthMatches = typeof monthFilter === 'function' ? monthFilter(month) : month === monthFilter;
+            if (!monthMatches) return;
+        }
+
+        partition.forEach(cell => {
+            if (!cubeCellMatches(cell, cellFilters)) return;
+
+            const groupKey = dimensions.map(dimension => cell[dimension]).join('\u001f');
+            let group = groups.get(groupKey);
+            if (!group) {
+                group = { revenueCents: 0, expensesCents: 0, count: 0 };
+                dimensions.forEach(dimension => {
+                    group[dimension] = cell[dimension];
+                });
+                groups.set(groupKey, group);
+            }
+
+            group.revenueCents += cell.revenueCents;
+            group.expensesCents += cell.expensesCents;
+            group.count += cell.count;
+        });
+    });
+
+    return Array.from(groups.values()).map(group => {
+        const { revenueCents, expensesCents, ...row } = group;
+        row.revenue = revenueCents / 100;
+        row.expenses = expensesCents / 100;
+        return row;
+    });
+}
+
+/**
+ * Totais gerais do cubo (roll-up sem dimensões)
+ */
+function getCubeTotals(where = {}) {
+    return rollupCube([], where)[0] || { revenue: 0, expenses: 0, count: 0 };
+}
+
+// ==========================================
+// MANUTENÇÃO DOS ÍNDICES DE TRANSAÇÕES
+// ==========================================
+
+/**
+ * Marca que os dados mudaram (invalida caches derivados)
+ */
+function bumpDataVersion() {
+    appState.dataVersion++;
+    appState.cache.kpiCache = null;
+
+    // Pré-cálculos em andamento ficaram obsoletos
+    cancelIdleWarmup();
+}
+
+/**
+ * Marca que o plano de contas mudou (invalida as opções de classificação em cache).
+ * Deve ser chamada por qualquer rotina que altere appData.chartOfAccounts
+ * (inclusão, edição, exclusão ou importação de contas).
+ */
+function bumpChartOfAccountsVersion() {
+    appState.chartOfAccountsVersion++;
+
+    // Partes de rateio são resolvidas pelo plano de contas: o cubo precisa ser refeito
+    if (countCubeCells() > 0 && countSplitTransactions() > 0) {
+        rebuildTransactionIndexes();
+    }
+}
+
+/**
+ * Registra uma transação nas estruturas derivadas
+ */
+function indexTransaction(transaction) {
+    appState.idIndex.byId.set(transaction.id, transaction);
+    applyTransactionToCube(transaction, 1);
+
+    const month = getTransactionMonth(transaction);
+    if (!appState.monthRows.has(month)) {
+        appState.monthRows.set(month, new Set());
+    }
+    appState.monthRows.get(month).add(transaction);
+
+    addTransactionToSketches(transaction, month);
+    addToSearchIndex(transaction);
+    applyTransactionToSavedViews(transaction, 1);
+    applyTransactionToFacets(transaction, 1);
+}
+
+/**
+ * Remove uma transação das estruturas derivadas
+ */
+function unindexTransaction(transaction) {
+    appState.idIndex.byId.delete(transaction.id);
+    applyTransactionToCube(transaction, -1);
+
+    const month = getTransactionMonth(transaction);
+    const rows = appState.monthRows.get(month);
+    if (rows) {
+        rows.delete(transaction);
+        if (rows.size === 0) {
+            appState.monthRows.delete(month);
+        }
+    }
+
+    // Esboços não suportam remoção: o mês é reconstruído sob demanda
+    appState.sketches.dirtyMonths.add(month);
+    removeFromSearchIndex(transaction);
+    applyTransactionToSavedViews(transaction, -1);
+    applyTransactionToFacets(transaction, -1);
+}
+
+/**
+ * Altera campos de uma transação mantendo os índices consistentes
+ */
+function updateTransactionFields(transaction, changes) {
+    unindexTransaction(transaction);
+    Object.assign(transaction, changes);
+    indexTransaction(transaction);
+    bumpDataVersion();
+}
+
+/**
+ * Busca uma transação pelo id em O(1)
+ */
+function getTransactionById(transactionId) {
+    return appState.idIndex.byId.get(transactionId) || null;
+}
+
+/**
+ * Posição de uma transação em appData.transactions (-1 se não existir)
+ */
+function getTransactionPosition(transactionId) {
+    const idIndex = appState.idIndex;
+
+    // Posições são recalculadas de uma vez após compactações
+    if (idIndex.positionsDirty) {
+        idIndex.positions = new Map();
+        appData.transactions.forEach((transaction, position) => {
+            idIndex.positions.set(transaction.id, position);
+        });
+        idIndex.positionsDirty = false;
+    }
+
+    const position = idIndex.positions.get(transactionId);
+    return position === undefined ? -1 : position;
+}
+
+/**
+ * Altera várias transações de uma vez (uma única invalidação de caches).
+ * changes pode ser um objeto ou uma função transação -> objeto.
+ */
+function updateTransactionsBatch(transactions, changes) {
+    transactions.forEach(transaction => {
+        unindexTransaction(transaction);
+        Object.assign(transaction, typeof changes === 'function' ? changes(transaction) : changes);
+        indexTransaction(transaction);
+    });
+
+    if (transactions.length > 0) {
+        bumpDataVersion();
+    }
+    return transactions.length;
+}
+
+/**
+ * Acrescenta transações ao final da base, mantendo os índices
+ */
+function insertTransactions(transactions) {
+    const idIndex = appState.idIndex;
+
+    transactions.forEach(transaction => {
+        if (!transaction.id || idIndex.byId.has(transaction.id)) {
+            transaction.id = generateId();
+        }
+        appData.transactions.push(transaction);
+        if (!idIndex.positionsDirty) {
+            idIndex.positions.set(transaction.id, appData.transactions.length - 1);
+        }
+        indexTransaction(transaction);
+    });
+
+    bumpDataVersion();
+}
+
+/**
+ * Remove transações pelos ids em uma única passada.
+ * As removidas são marcadas primeiro e o array é compactado uma vez só,
+ * então excluir milhares de linhas custa O(n) em vez de O(n²).
+ * Retorna a quantidade removida.
+ */
+function removeTransactions(transactionIds) {
+    const removed = new Set();
+
+    transactionIds.forEach(transactionId => {
+        const transaction = getTransactionById(transactionId);
+        if (!transaction) return;
+        unindexTransaction(transaction);
+        removed.add(transaction);
+    });
+
+    if (removed.size === 0) return 0;
+
+    // Compactação in-place (preserva a referência de appData.transactions)
+    const transactions = appData.transactions;
+    let write = 0;
+    for (let read = 0; read < transactions.length; read++) {
+        const transaction = transactions[read];
+        if (!removed.has(transaction)) {
+            transactions[write++] = transaction;
+        }
+    }
+    transactions.length = write;
+
+    // Posições mudaram: bitmaps de facetas deixam de valer
+    appState.idIndex.positionsDirty = true;
+    invalidateFacetIndex();
+    bumpDataVersion();
+
+    // Transferência com um lado excluído: o outro lado volta a contar como receita/despesa
+    const counterparts = [];
+    removed.forEach(transaction => {
+        if (!isInternalTransfer(transaction)) return;
+        const counterpart = getTransactionById(transaction.transferId);
+        if (counterpart && counterpart.transferId === transaction.id) counterparts.push(counterpart);
+    });
+    if (counterparts.length > 0) {
+        updateTransactionsBatch(counterparts, { transferId: null });
+    }
+
+    return removed.size;
+}
+
+/**
+ * Reconstrói todas as estruturas derivadas (após carga ou importação)
+ */
+function rebuildTransactionIndexes() {
+    // Índice por id; ids repetidos recebem um novo id
+    const byId = new Map();
+    const positions = new Map();
+    appData.transactions.forEach((transaction, position) => {
+        if (!transaction.id || byId.has(transaction.id)) {
+            debugLog('warn', 'Transação com id ausente ou repetido, gerando novo id:', transaction.id);
+            transaction.id = generateId();
+        }
+        byId.set(transaction.id, transaction);
+        positions.set(transaction.id, position);
+    });
+    appState.idIndex = { byId, positions, positionsDirty: false };
+
+    rebuildCube();
+
+    appState.monthRows = new Map();
+    appState.sketches.byMonth = new Map();
+    appState.sketches.dirtyMonths = new Set();
+    invalidateSearchIndex();
+    invalidateSavedViewResults();
+    invalidateFacetIndex();
+    appData.transactions.forEach(transaction => {
+        const month = getTransactionMonth(transaction);
+        if (!appState.monthRows.has(month)) {
+            appState.monthRows.set(month, new Set());
+        }
+        appState.monthRows.get(month).add(transaction);
+        addTransactionToSketches(transaction, month);
+    });
+
+    bumpDataVersion();
+}
+
+// ==========================================
+// PRÉ-CÁLCULO EM TEMPO OCIOSO
+// ==========================================
+
+/**
+ * Tempo mínimo restante no período ocioso para iniciar mais uma tarefa (ms)
+ */
+const IDLE_MIN_SLICE_MS = 4;
+
+/**
+ * Espera sem interação do usuário antes de retomar o pré-cálculo (ms)
+ */
+const IDLE_RESUME_DELAY_MS = 1500;
+
+/**
+ * Memoiza um resultado derivado das transações pela versão dos dados
+ */
+function memoizeByVersion(name, compute) {
+    const cached = appState.warmCache.get(name);
+    if (cached && cached.version === appState.dataVersion) {
+        return cached.value;
+    }
+
+    const value = compute();
+    appState.warmCache.set(name, { version: appState.dataVersion, value });
+    return value;
+}
+
+/**
+ * Verifica se um resultado memoizado está válido para a versão atual
+ */
+function isWarm(name) {
+    const cached = appState.warmCache.get(name);
+    return !!cached && cached.version === appState.dataVersion;
+}
+
+/**
+ * Agenda um callback no próximo período ocioso (com fallback para setTimeout)
+ */
+function requestIdleSlice(callback) {
+    if (typeof window !== 'undefined' && typeof window.requestIdleCallback === 'function') {
+        return { type: 'idle', id: window.requestIdleCallback(callback, { timeout: 5000 }) };
+    }
+
+    return {
+        type: 'timeout',
+        id: setTimeout(() => {
+            const start = performance.now();
+            callback({
+                didTimeout: false,
+                timeRemaining: () => Math.max(0, 10 - (performance.now() - start))
+            });
+        }, 50)
+    };
+}
+
+/**
+ * Cancela um callback agendado por requestIdleSlice
+ */
+function cancelIdleSlice(handle) {
+    if (!handle) return;
+    if (handle.type === 'idle') {
+        window.cancelIdleCallback(handle.id);
+    } else {
+        clearTimeout(handle.id);
+    }
+}
+
+/**
+ * Tarefas de pré-cálculo das abas não visíveis, em fatias pequenas
+ */
+function getIdleWarmupTasks() {
+    return [
+        () => calculateDREData(),
+        () => calculateMonthlyCashflow(),
+        ...AUDIT_CHECKS.map(check => () => runAuditCheckSlice(check)),
+        () => calculateHistoricalMonthlyData(),
+        () => buildSearchIndexSlice(),
+        () => getFacetIndex()
+    ];
+}
+
+/**
+ * Inicia o pré-cálculo ocioso para a versão atual dos dados
+ */
+function scheduleIdleWarmup() {
+    if (appData.transactions.length === 0) return;
+
+    cancelIdleWarmup();
+    appState.idle.version = appState.dataVersion;
+    appState.idle.queue = getIdleWarmupTasks();
+    appState.idle.handle = requestIdleSlice(runIdleWarmup);
+}
+
+/**
+ * Executa tarefas enquanto houver tempo ocioso; reagenda o restante
+ */
+function runIdleWarmup(deadline) {
+    const idle = appState.idle;
+    idle.handle = null;
+
+    // Dados mudaram desde o agendamento: abandona
+    if (idle.version !== appState.dataVersion) {
+        idle.queue = [];
+        return;
+    }
+
+    try {
+        while (idle.queue.length > 0 && deadline.timeRemaining() > IDLE_MIN_SLICE_MS) {
+            const task = idle.queue.shift();
+
+            // Tarefas fatiadas retornam false enquanto não terminam
+            if (task() === false) {
+                idle.queue.unshift(task);
+            }
+        }
+    } catch (error) {
+        debugLog('warn', 'Pré-cálculo ocioso interrompido:', error);
+        idle.queue = [];
+        return;
+    }
+
+    if (idle.queue.length > 0) {
+        idle.handle = requestIdleSlice(runIdleWarmup);
+    } else {
+        debugLog('debug', 'Pré-cálculo ocioso concluído');
+    }
+}
+
+/**
+ * Abandona o pré-cálculo em andamento
+ */
+function cancelIdleWarmup() {
+    cancelIdleSlice(appState.idle.handle);
+    appState.idle.handle = null;
+    appState.idle.queue = [];
+}
+
+/**
+ * Retoma o pré-cálculo após um período sem interação
+ */
+const resumeIdleWarmup = debounce(scheduleIdleWarmup, IDLE_RESUME_DELAY_MS);
+
+/**
+ * Interrompe o pré-cálculo quando o usuário interage
+ */
+function handleUserActivityForWarmup() {
+    if (appState.idle.handle || appState.idle.queue.length > 0) {
+        cancelIdleWarmup();
+        resumeIdleWarmup();
+    }
+}
+
+// ==========================================
+// SALVAMENTO EM LOTE (WRITE-BEHIND)
+// ==========================================
+
+/**
+ * Alterações acumuladas que disparam um salvamento imediato
+ */
+const SAVE_BATCH_SIZE = 25;
+
+/**
+ * Registra alterações pendentes; o salvamento completo acontece em lote
+ * (a cada SAVE_BATCH_SIZE alterações, no próximo período ocioso ou ao sair)
+ */
+function queueAppDataSave(changes = 1) {
+    const queue = appState.saveQueue;
+    queue.pending += changes;
+    updateSaveIndicator();
+
+    if (queue.pending >= SAVE_BATCH_SIZE) {
+        flushAppDataSave();
+        return;
+    }
+
+    if (!queue.handle) {
+        queue.handle = requestIdleSlice(() => {
+            queue.handle = null;
+            flushAppDataSave();
+        });
+    }
+}
+
+/**
+ * Grava agora tudo o que está pendente
+ */
+async function flushAppDataSave() {
+    const queue = appState.saveQueue;
+    cancelIdleSlice(queue.handle);
+    queue.handle = null;
+
+    if (queue.current) await queue.current;
+    if (queue.pending === 0) return;
+
+    const batch = queue.pending;
+    queue.pending = 0;
+    queue.saving = batch;
+    updateSaveIndicator();
+
+    queue.current = (async () => {
+        const start = performance.now();
+        try {
+            // saveAppData trata o próprio erro e só informa se gravou
+            if (await saveAppData() === false) {
+                throw new Error('Falha ao gravar no localStorage');
+            }
+            debugLog('debug', 'Alterações salvas em lote:', { changes: batch, ms: Math.round(performance.now() - start) });
+        } catch (error) {
+            // Lote volta para a fila: continua indicado como não salvo
+            queue.pending += batch;
+            debugLog('error', 'Erro ao salvar alterações em lote:', error);
+        } finally {
+            queue.current = null;
+            queue.saving = 0;
+            updateSaveIndicator();
+        }
+    })();
+
+    return queue.current;
+}
+
+/**
+ * Indicador "não salvo / salvando" no cabeçalho
+ */
+function updateSaveIndicator() {
+    const element = document.getElementById('saveIndicator');
+    if (!element) return;
+
+    const { pending, saving } = appState.saveQueue;
+    element.hidden = pending === 0 && saving === 0;
+    element.textContent = saving > 0
+        ? 'Salvando...'
+        : `${pending.toLocaleString('pt-BR')} ${pending === 1 ? 'alteração não salva' : 'alterações não salvas'}`;
+}
+
+// ==========================================
+// MOTORES DE CÁLCULO EM WORKER
+// ==========================================
+
+/**
+ * Inicia um worker a partir de uma fábrica de motor autocontida (o código vai
+ * via toString, em Blob URL). O motor expõe métodos { tipo: payload => resultado }.
+ * Sem suporte a Worker, client.worker fica false e as chamadas rodam na thread principal.
+ */
+function startEngineWorker(client, factory) {
+    client.worker = false;
+
+    if (typeof Worker === 'undefined' || typeof Blob === 'undefined' || !URL.createObjectURL) return;
+
+    try {
+        const source = `const engine = (${factory.toString()})();
+self.onmessage = event => {
+    const { requestId, type, payload } = event.data;
+    try {
+        self.postMessage({ requestId, result: engine[type](payload) });
+    } catch (error) {
+        self.postMessage({ requestId, error: error.message });
+    }
+};`;
+        const worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+
+        worker.onmessage = event => {
+            const { requestId, result, error } = event.data;
+            const request = client.requests.get(requestId);
+            if (!request) return;
+            client.requests.delete(requestId);
+            if (error) request.reject(new Error(error));
+            else request.resolve(result);
+        };
+
+        worker.onerror = event => {
+            debugLog('warn', 'Worker indisponível, usando a thread principal:', event.message);
+            event.preventDefault?.();
+            worker.terminate();
+            client.worker = false;
+
+            // Reexecuta localmente o que estava na fila do worker
+            const pending = Array.from(client.requests.values());
+            client.requests.clear();
+            pending.forEach(request => {
+                try {
+                    request.resolve(runEngineLocally(client, factory, request.type, request.payload));
+                } catch (error) {
+                    request.reject(error);
+                }
+            });
+        };
+
+        client.worker = worker;
+    } catch (error) {
+        debugLog('warn', 'Não foi possível criar o worker:', error.message);
+    }
+}
+
+/**
+ * Executa uma operação do motor na thread principal.
+ * Se o cliente guarda um modelo (client.model), ele é carregado no motor local.
+ */
+function runEngineLocally(client, factory, type, payload) {
+    if (!client.engine) {
+        client.engine = factory();
+        if (client.model && client.engine.load) client.engine.load(client.model);
+    }
+    return client.engine[type](payload);
+}
+
+/**
+ * Envia uma operação ao motor (worker ou thread principal)
+ */
+function callEngine(client, factory, type, payload) {
+    if (client.worker === null) startEngineWorker(client, factory);
+
+    if (!client.worker) {
+        return new Promise(resolve => resolve(runEngineLocally(client, factory, type, payload)));
+    }
+
+    return new Promise((resolve, reject) => {
+        const requestId = client.nextRequest++;
+        client.requests.set(requestId, { resolve, reject, type, payload });
+        client.worker.postMessage({ requestId, type, payload });
+    });
+}
+
 // ==========================================
 // INICIALIZAÇÃO DA APLICAÇÃO
 // ==========================================
@@ -305,13 +1314,18 @@ async function loadAppData() {
 
         // Garante estrutura de dados correta
         ensureDataStructure();
+        bumpChartOfAccountsVersion();
 
         // Migra dados se necessário
         await migrateDataIfNeeded();
 
+        // Materializa agregações e índices
+        rebuildTransactionIndexes();
+
     } catch (error) {
         debugLog('error', 'Erro ao carregar dados:', error);
         await initializeExampleData();
+        rebuildTransactionIndexes();
     }
 }
 
@@ -474,6 +1488,7 @@ async function initializeExampleData() {
             ]
         }
     };
+    bumpChartOfAccountsVersion();
 
     debugLog('info', 'Dados de exemplo inicializados', {
         transactions: appData.transactions.length,
@@ -495,6 +1510,11 @@ function ensureDataStructure() {
         };
     }
 
+    // Visões salvas da consulta de transações
+    if (!Array.isArray(appData.settings.savedViews)) {
+        appData.settings.savedViews = [];
+    }
+
     // Estrutura de backups
     if (!appData.backups) {
         appData.backups = [];
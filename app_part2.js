@@ -39,6 +39,11 @@ async function initializeInterface() {
             debugModeToggle.checked = appData.settings.debugMode;
         }
 
+        const fiscalYearStart = document.getElementById('fiscalYearStartMonth');
+        if (fiscalYearStart) {
+            fiscalYearStart.value = String(getFiscalYearStartMonth());
+        }
+
         debugLog('info', 'Interface inicializada com sucesso');
 
     } catch (error) {
@@ -60,9 +65,27 @@ function setupEventListeners() {
         // Navegação e interface
         setupNavigationListeners();
 
+        // Dashboard
+        setupDashboardListeners();
+
+        // Relatórios
+        setupReportListeners();
+
         // Filtros e buscas
         setupFilterListeners();
 
+        // Seleção múltipla e ações em lote
+        setupBulkActionListeners();
+
+        // Regras de classificação
+        setupClassificationRuleListeners();
+
+        // Lançamentos previstos
+        setupExpectedEntryListeners();
+
+        // Transferências entre contas
+        setupTransferListeners();
+
         // Chat IA
         setupChatListeners();
 
@@ -75,6 +98,12 @@ function setupEventListeners() {
         // Event delegation global
         setupGlobalEventDelegation();
 
+        // Pré-cálculo ocioso
+        setupIdleWarmupListeners();
+
+        // Salvamento em lote ao sair da página
+        setupWriteBehindListeners();
+
         debugLog('info', 'Event listeners configurados com sucesso');
 
     } catch (error) {
@@ -120,6 +149,89 @@ function setupNavigationListeners() {
     debugLog('debug', 'Navigation listeners configurados');
 }
 
+/**
+ * Event listeners do dashboard
+ */
+function setupDashboardListeners() {
+    const comparisonBasis = document.getElementById('comparisonBasis');
+    if (comparisonBasis) {
+        comparisonBasis.addEventListener('change', function() {
+            changeComparisonBasis(this.value);
+        });
+    }
+
+    debugLog('debug', 'Dashboard listeners configurados');
+}
+
+/**
+ * Event listeners dos relatórios (período)
+ */
+function setupReportListeners() {
+    const regenerate = () => generateReport(appState.currentReport || 'dre');
+
+    const reportPeriod = document.getElementById('reportPeriod');
+    if (reportPeriod) {
+        reportPeriod.addEventListener('change', function() {
+            toggleReportCustomRange();
+            regenerate();
+        });
+    }
+
+    ['reportMonthFrom', 'reportMonthTo'].forEach(id => {
+        const input = document.getElementById(id);
+        if (input) {
+            input.addEventListener('change', regenerate);
+        }
+    });
+
+    const fiscalYearStart = document.getElementById('fiscalYearStartMonth');
+    if (fiscalYearStart) {
+        fiscalYearStart.addEventListener('change', function() {
+            appData.settings.fiscalYearStartMonth = parseInt(this.value, 10);
+            saveAppData();
+            renderReportPeriodOptions();
+            invalidateTabCache('reports');
+        });
+    }
+
+    debugLog('debug', 'Report listeners configurados');
+}
+
+/**
+ * Interação do usuário interrompe o pré-cálculo ocioso
+ */
+function setupIdleWarmupListeners() {
+    ['keydown', 'pointerdown', 'wheel'].forEach(eventName => {
+        document.addEventListener(eventName, handleUserActivityForWarmup, { capture: true, passive: true });
+    });
+
+    debugLog('debug', 'Listeners de pré-cálculo configurados');
+}
+
+/**
+ * Garante que alterações em lote sejam gravadas antes de sair da página
+ */
+function setupWriteBehindListeners() {
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flushAppDataSave();
+    });
+
+    window.addEventListener('pagehide', () => flushAppDataSave());
+
+    window.addEventListener('beforeunload', event => {
+        if (appState.saveQueue.pending === 0) return;
+
+        // saveAppData grava no localStorage de forma síncrona
+        flushAppDataSave();
+        if (appState.saveQueue.pending > 0) {
+            event.preventDefault();
+            event.returnValue = '';
+        }
+    });
+
+    debugLog('debug', 'Listeners de salvamento em lote configurados');
+}
+
 /**
  * Event listeners para filtros
  */
@@ -149,11 +261,58 @@ function setupFilterListeners() {
         clearFilters.addEventListener('click', clearAllFilters);
     }
 
+    // Linguagem de consulta e visões salvas
+    const queryInput = document.getElementById('transactionQuery');
+    const savedViewSelect = document.getElementById('savedViewSelect');
+    const saveView = document.getElementById('saveView');
+    const deleteView = document.getElementById('deleteView');
+
+    if (queryInput) {
+        queryInput.addEventListener('input', debounce(() => {
+            appData.pagination.page = 1;
+            filterTransactions();
+        }, 300));
+    }
+    if (savedViewSelect) {
+        savedViewSelect.addEventListener('change', function() {
+            if (this.value) applySavedView(this.value);
+        });
+    }
+    if (saveView) {
+        saveView.addEventListener('click', saveCurrentView);
+    }
+    if (deleteView) {
+        deleteView.addEventListener('click', deleteSelectedView);
+    }
+
+    // Exportação da visão atual
+    const exportViewCSV = document.getElementById('exportViewCSV');
+    const exportViewXLSX = document.getElementById('exportViewXLSX');
+    if (exportViewCSV) {
+        exportViewCSV.addEventListener('click', () => exportCurrentView('csv'));
+    }
+    if (exportViewXLSX) {
+        exportViewXLSX.addEventListener('click', () => exportCurrentView('xlsx'));
+    }
+
+    // Facetas: clique aplica o valor como filtro
+    const facets = document.getElementById('transactionFacets');
+    if (facets) {
+        facets.addEventListener('click', function(e) {
+            const item = e.target.closest('.facet-item');
+            if (item) applyFacetFilter(item.dataset.facet, item.dataset.value);
+        });
+    }
+
     // Paginação
     const itemsPerPage = document.getElementById('itemsPerPage');
     if (itemsPerPage) {
         itemsPerPage.addEventListener('change', function() {
-            appData.pagination.itemsPerPage = parseInt(this.value);
+            // "Contínuo" ativa a tabela virtualizada
+            appData.ui.virtualScroll = this.value === 'virtual';
+            if (!appData.ui.virtualScroll) {
+                appData.pagination.itemsPerPage = parseInt(this.value);
+            }
             appData.pagination.page = 1;
             filterTransactions();
         });
@@ -162,6 +321,173 @@ function setupFilterListeners() {
     debugLog('debug', 'Filter listeners configurados');
 }
 
+/**
+ * Event listeners da seleção múltipla e ações em lote
+ */
+function setupBulkActionListeners() {
+    const tableBody = document.getElementById('transactionsTableBody');
+    if (tableBody) {
+        tableBody.addEventListener('change', function(e) {
+            const checkbox = e.target.closest('.transaction-select');
+            if (checkbox && checkbox.dataset.transactionId) {
+                toggleTransactionSelection(checkbox.dataset.transactionId, checkbox.checked);
+            }
+        });
+    }
+
+    const selectPage = document.getElementById('selectPageTransactions');
+    if (selectPage) {
+        selectPage.addEventListener('change', function() {
+            selectCurrentPage(this.checked);
+        });
+    }
+
+    const handlers = {
+        bulkSelectAllMatching: selectAllMatchingFilter,
+        bulkClearSelection: () => {
+            clearTransactionSelection();
+            if (selectPage) selectPage.checked = false;
+        },
+        bulkDelete: bulkDeleteSelected,
+        bulkApplyReclassify: bulkReclassify,
+        bulkApplyStatus: () => bulkSetStatus(document.getElementById('bulkStatus')?.value)
+    };
+
+    Object.entries(handlers).forEach(([id, handler]) => {
+        const element = document.getElementById(id);
+        if (element) element.addEventListener('click', handler);
+    });
+
+    const bulkLevel1 = document.getElementById('bulkLevel1');
+    if (bulkLevel1) bulkLevel1.addEventListener('change', () => updateBulkClassificationOptions(1));
+
+    const bulkLevel2 = document.getElementById('bulkLevel2');
+    if (bulkLevel2) bulkLevel2.addEventListener('change', () => updateBulkClassificationOptions(2));
+
+    debugLog('debug', 'Bulk action listeners configurados');
+}
+
+/**
+ * Event listeners das regras de classificação (conciliação)
+ */
+function setupClassificationRuleListeners() {
+    const toggle = document.getElementById('autoClassify');
+    const close = document.getElementById('closeClassificationRules');
+    const form = document.getElementById('classificationRuleForm');
+    const reset = document.getElementById('resetClassificationRule');
+    const rulesBody = document.getElementById('classificationRulesBody');
+    const preview = document.getElementById('previewClassificationRules');
+    const apply = document.getElementById('applyClassificationRules');
+
+    if (toggle) {
+        toggle.addEventListener('click', () => toggleClassificationRulesPanel());
+    }
+    if (close) {
+        close.addEventListener('click', () => toggleClassificationRulesPanel(false));
+    }
+    if (form) {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            saveClassificationRuleFromForm();
+        });
+    }
+    if (reset) {
+        reset.addEventListener('click', resetClassificationRuleForm);
+    }
+    if (rulesBody) {
+        rulesBody.addEventListener('click', function(e) {
+            const button = e.target.closest('.rule-action');
+            const row = e.target.closest('tr[data-rule-id]');
+            if (button && row) {
+                handleClassificationRuleAction(row.dataset.ruleId, button.dataset.action);
+            }
+        });
+    }
+    if (preview) {
+        preview.addEventListener('click', previewClassificationRules);
+    }
+    if (apply) {
+        apply.addEventListener('click', applyClassificationRules);
+    }
+
+    debugLog('debug', 'Listeners das regras de classificação configurados');
+}
+
+/**
+ * Event listeners do painel de lançamentos previstos
+ */
+function setupExpectedEntryListeners() {
+    const toggle = document.getElementById('expectedEntries');
+    const close = document.getElementById('closeExpectedEntries');
+    const fileInput = document.getElementById('expectedEntriesFile');
+    const run = document.getElementById('runExpectedMatching');
+    const accept = document.getElementById('acceptExpectedMatches');
+
+    if (toggle) {
+        toggle.addEventListener('click', () => toggleExpectedEntriesPanel());
+    }
+    if (close) {
+        close.addEventListener('click', () => toggleExpectedEntriesPanel(false));
+    }
+    if (fileInput) {
+        fileInput.addEventListener('change', function(e) {
+            const file = e.target.files[0];
+            if (file) importExpectedEntries(file);
+            e.target.value = '';
+        });
+    }
+    if (run) {
+        run.addEventListener('click', runExpectedEntryMatching);
+    }
+    if (accept) {
+        accept.addEventListener('click', acceptExpectedEntryMatches);
+    }
+
+    debugLog('debug', 'Listeners de lançamentos previstos configurados');
+}
+
+/**
+ * Event listeners do painel de transferências entre contas
+ */
+function setupTransferListeners() {
+    const toggle = document.getElementById('detectTransfers');
+    const close = document.getElementById('closeTransfers');
+    const run = document.getElementById('runTransferDetection');
+    const acceptAll = document.getElementById('acceptTransfers');
+    const clear = document.getElementById('clearTransfers');
+    const proposalsBody = document.getElementById('transferProposalsBody');
+
+    if (toggle) {
+        toggle.addEventListener('click', () => toggleTransfersPanel());
+    }
+    if (close) {
+        close.addEventListener('click', () => toggleTransfersPanel(false));
+    }
+    if (run) {
+        run.addEventListener('click', () => {
+            detectTransfers();
+            renderTransferProposals();
+        });
+    }
+    if (acceptAll) {
+        acceptAll.addEventListener('click', acceptConfidentTransfers);
+    }
+    if (clear) {
+        clear.addEventListener('click', clearAcceptedTransfers);
+    }
+    if (proposalsBody) {
+        proposalsBody.addEventListener('click', function(e) {
+            const row = e.target.closest('tr[data-pair-index]');
+            if (e.target.closest('.transfer-accept') && row) {
+                const pair = appState.transfers.proposals[Number(row.dataset.pairIndex)];
+                if (pair) acceptTransferPairs([pair]);
+            }
+        });
+    }
+
+    debugLog('debug', 'Listeners de transferências configurados');
+}
+
 /**
  * Event listeners para chat IA
  */
@@ -345,6 +671,16 @@ function handleGlobalClicks(event) {
             }
         }
 
+        // Botões de rateio de transação
+        const splitBtn = target.closest('.split-transaction-btn');
+        if (splitBtn) {
+            const transactionId = splitBtn.dataset.transactionId;
+            if (transactionId) {
+                splitTransaction(transactionId);
+                return;
+            }
+        }
+
         // Botões de exclusão de transação
         const deleteBtn = target.closest('.delete-transaction-btn');
         if (deleteBtn) {
@@ -495,8 +831,12 @@ async function handleFileUpload(event) {
 
         // Salva dados
         appData.transactions = processedTransactions;
+        rebuildTransactionIndexes();
         await saveAppData();
 
+        // Propostas de transferência entre contas para as linhas importadas
+        const transferProposals = detectTransfers(processedTransactions);
+
         // Atualiza interface
         updateTransactionCount();
         updateLastFileInfo(file.name);
@@ -506,6 +846,12 @@ async function handleFileUpload(event) {
             `${processedTransactions.length} transações importadas com sucesso!`, 
             'success'
         );
+        if (transferProposals.length > 0) {
+            showNotification(
+                `${transferProposals.length} possíveis transferências entre contas encontradas (Conciliação › Transferências)`,
+                'info'
+            );
+        }
 
         debugLog('info', 'Upload concluído com sucesso:', {
             fileName: file.name,
@@ -638,9 +984,9 @@ function parseCSV(csvContent) {
 }
 
 /**
- * Parser de linha CSV com suporte a aspas e vírgulas
+ * Parser de linha CSV com suporte a aspas e vírgulas (ou outro separador)
  */
-function parseCSVLine(line) {
+function parseCSVLine(line, delimiter = ',') {
     const result = [];
     let current = '';
     let inQuotes = false;
@@ -660,7 +1006,7 @@ function parseCSVLine(line) {
                 // Toggle estado de quotes
                 inQuotes = !inQuotes;
             }
-        } else if (char === ',' && !inQuotes) {
+        } else if (char === delimiter && !inQuotes) {
             // Separador encontrado fora de quotes
             result.push(current.trim());
             current = '';
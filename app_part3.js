@@ -10,6 +10,11 @@ function switchTab(tabName) {
     try {
         debugLog('info', 'Mudando para tab:', tabName);
 
+        // Alterações em lote são gravadas ao trocar de aba
+        if (appState.saveQueue.pending > 0) {
+            flushAppDataSave();
+        }
+
         // Atualiza estado
         appData.ui.currentTab = tabName;
 
@@ -115,6 +120,14 @@ function updatePageTitle(tabName) {
  */
 async function loadTabContent(tabName) {
     try {
+        // Aba já renderizada com os mesmos dados e parâmetros: nada a fazer
+        const renderKey = getTabRenderKey(tabName);
+        if (renderKey !== null && appState.tabRenderCache.get(tabName) === renderKey) {
+            debugLog('debug', `Tab ${tabName} reaproveitada do cache de renderização`);
+            scheduleIdleWarmup();
+            return;
+        }
+
         switch (tabName) {
             case 'dashboard':
                 await loadDashboard();
@@ -150,12 +163,57 @@ async function loadTabContent(tabName) {
             lucide.createIcons();
         }
 
+        if (renderKey !== null) {
+            appState.tabRenderCache.set(tabName, renderKey);
+        }
+
+        // Aba estável: aproveita o tempo ocioso para preparar as demais
+        scheduleIdleWarmup();
+
     } catch (error) {
+        appState.tabRenderCache.delete(tabName);
         debugLog('error', `Erro ao carregar conteúdo da tab ${tabName}:`, error);
         showNotification(`Erro ao carregar ${tabName}`, 'error');
     }
 }
 
+/**
+ * Chave de renderização de uma aba: versão dos dados + parâmetros da aba.
+ * Retorna null para abas que sempre devem ser recarregadas.
+ */
+function getTabRenderKey(tabName) {
+    const version = appState.dataVersion;
+    const valueOf = id => document.getElementById(id)?.value || '';
+
+    switch (tabName) {
+        case 'dashboard':
+            return `${version}|${appData.ui.comparisonBasis || 'mom'}`;
+        case 'transactions':
+            return `${version}|${appData.ui.sortColumn}|${appData.ui.sortDirection}`;
+        case 'reconciliation':
+            return `${version}`;
+        case 'reports':
+            return `${version}|${appState.currentReport || 'dre'}|${getReportPeriodKey()}`;
+        case 'audit':
+            return `${version}`;
+        case 'projection':
+            return `${version}|${valueOf('projectionPeriod')}|${valueOf('projectionMethod')}`;
+        default:
+            return null;
+    }
+}
+
+/**
+ * Invalida o cache de renderização (de uma aba ou de todas)
+ */
+function invalidateTabCache(tabName = null) {
+    if (tabName) {
+        appState.tabRenderCache.delete(tabName);
+    } else {
+        appState.tabRenderCache.clear();
+    }
+}
+
 /**
  * Toggle do sidebar em mobile
  */
@@ -181,6 +239,7 @@ async function loadDashboard() {
         updatePendingSummary();
         updatePeriodInfo();
         updatePerformanceMetrics();
+        updateComparisons();
 
         // Carrega gráficos (com delay para garantir renderização do DOM)
         setTimeout(async () => {
@@ -200,27 +259,20 @@ async function loadDashboard() {
  */
 async function updateKPIs() {
     try {
-        // Verifica cache
-        if (appState.cache.kpiCache && 
-            Date.now() - appState.cache.lastCacheUpdate < 10000) { // 10 segundos
+        // Verifica cache (válido enquanto os dados não mudarem)
+        if (appState.cache.kpiCache &&
+            appState.cache.kpiCacheVersion === appState.dataVersion) {
             const cached = appState.cache.kpiCache;
             updateKPIElements(cached);
             return;
         }
 
-        let totalRevenue = 0;
-        let totalExpenses = 0;
-
-        appData.transactions.forEach(transaction => {
-            const entrada = parseValue(transaction['Entrada (R$)']);
-            const saida = parseValue(transaction['Saída (R$)']);
-
-            totalRevenue += entrada;
-            totalExpenses += saida;
-        });
+        const totals = getCubeTotals();
+        const totalRevenue = totals.revenue;
+        const totalExpenses = totals.expenses;
 
         const netResult = totalRevenue - totalExpenses;
-        const transactionCount = appData.transactions.length;
+        const transactionCount = totals.count;
 
         const kpiData = {
             totalRevenue,
@@ -231,6 +283,7 @@ async function updateKPIs() {
 
         // Atualiza cache
         appState.cache.kpiCache = kpiData;
+        appState.cache.kpiCacheVersion = appState.dataVersion;
         appState.cache.lastCacheUpdate = Date.now();
 
         updateKPIElements(kpiData);
@@ -293,28 +346,28 @@ function animateValue(element, finalValue) {
  */
 function updatePendingSummary() {
     try {
-        const pendingTransactions = appData.transactions.filter(t => 
-            (t['Status Conciliação'] || '').toLowerCase() === 'pendente'
-        );
+        const pendingCount = getCubeTotals({
+            status: status => status.toLowerCase() === 'pendente'
+        }).count;
 
-        const unclassifiedTransactions = appData.transactions.filter(t => 
-            !t['Classificação Nível 1'] || t['Classificação Nível 1'].trim() === ''
-        );
+        const unclassifiedCount = getCubeTotals({
+            level1: level1 => level1.trim() === ''
+        }).count;
 
         const pendingCountEl = document.getElementById('pendingCount');
         const unclassifiedCountEl = document.getElementById('unclassifiedCount');
 
         if (pendingCountEl) {
-            pendingCountEl.textContent = pendingTransactions.length;
+            pendingCountEl.textContent = pendingCount;
         }
 
         if (unclassifiedCountEl) {
-            unclassifiedCountEl.textContent = unclassifiedTransactions.length;
+            unclassifiedCountEl.textContent = unclassifiedCount;
         }
 
         debugLog('debug', 'Resumo de pendências atualizado:', {
-            pending: pendingTransactions.length,
-            unclassified: unclassifiedTransactions.length
+            pending: pendingCount,
+            unclassified: unclassifiedCount
         });
 
     } catch (error) {
@@ -360,33 +413,494 @@ function updatePerformanceMetrics() {
     try {
         if (appData.transactions.length === 0) return;
 
-        const revenues = appData.transactions
-            .map(t => parseValue(t['Entrada (R$)']))
-            .filter(v => v > 0);
-
-        const expenses = appData.transactions
-            .map(t => parseValue(t['Saída (R$)']))
-            .filter(v => v > 0);
-
-        const avgRevenue = revenues.length > 0 ? 
-            revenues.reduce((a, b) => a + b, 0) / revenues.length : 0;
-
-        const maxRevenue = revenues.length > 0 ? Math.max(...revenues) : 0;
-        const maxExpense = expenses.length > 0 ? Math.max(...expenses) : 0;
+        const revenueMetrics = getTicketMetrics({ direction: 'in' });
+        const expenseMetrics = getTicketMetrics({ direction: 'out' });
 
         const avgTicketEl = document.getElementById('avgTicket');
+        const medianTicketEl = document.getElementById('medianTicket');
+        const p90TicketEl = document.getElementById('p90Ticket');
+        const p99TicketEl = document.getElementById('p99Ticket');
         const maxRevenueEl = document.getElementById('maxRevenue');
         const maxExpenseEl = document.getElementById('maxExpense');
 
-        if (avgTicketEl) avgTicketEl.textContent = formatCurrency(avgRevenue);
-        if (maxRevenueEl) maxRevenueEl.textContent = formatCurrency(maxRevenue);
-        if (maxExpenseEl) maxExpenseEl.textContent = formatCurrency(maxExpense);
+        if (avgTicketEl) avgTicketEl.textContent = formatCurrency(revenueMetrics.mean);
+        if (medianTicketEl) medianTicketEl.textContent = formatCurrency(revenueMetrics.median);
+        if (p90TicketEl) p90TicketEl.textContent = formatCurrency(revenueMetrics.p90);
+        if (p99TicketEl) p99TicketEl.textContent = formatCurrency(revenueMetrics.p99);
+        if (maxRevenueEl) maxRevenueEl.textContent = formatCurrency(revenueMetrics.max);
+        if (maxExpenseEl) maxExpenseEl.textContent = formatCurrency(expenseMetrics.max);
 
     } catch (error) {
         debugLog('error', 'Erro ao atualizar métricas de performance:', error);
     }
 }
 
+// ==========================================
+// ESBOÇOS DE QUANTIS (MÉTRICAS DE PERFORMANCE)
+// ==========================================
+
+/**
+ * Precisão dos esboços KLL (itens mantidos no nível mais alto)
+ */
+const SKETCH_K = 200;
+
+/**
+ * Cria um esboço de quantis KLL vazio.
+ * Memória limitada (~3k valores) independentemente da quantidade inserida,
+ * com mínimo, máximo, contagem e soma exatos.
+ */
+function createQuantileSketch(k = SKETCH_K) {
+    return {
+        k,
+        n: 0,
+        sum: 0,
+        min: Infinity,
+        max: -Infinity,
+        levels: [[]]
+    };
+}
+
+/**
+ * Capacidade de um nível do esboço (níveis inferiores guardam menos itens)
+ */
+function sketchLevelCapacity(sketch, level) {
+    const depth = sketch.levels.length - level - 1;
+    return Math.max(2, Math.ceil(sketch.k * Math.pow(2 / 3, depth)));
+}
+
+/**
+ * Compacta níveis cheios: ordena, mantém metade dos itens e promove ao nível seguinte
+ */
+function compactSketch(sketch) {
+    for (let level = 0; level < sketch.levels.length; level++) {
+        const items = sketch.levels[level];
+        if (items.length < sketchLevelCapacity(sketch, level)) continue;
+
+        if (level + 1 === sketch.levels.length) {
+            sketch.levels.push([]);
+        }
+
+        items.sort((a, b) => a - b);
+
+        // Com quantidade ímpar, o último item permanece no nível atual
+        const leftover = items.length % 2 === 1 ? items.pop() : null;
+        const offset = Math.random() < 0.5 ? 0 : 1;
+        const promoted = sketch.levels[level + 1];
+
+        for (let i = offset; i < items.length; i += 2) {
+            promoted.push(items[i]);
+        }
+
+        sketch.levels[level] = leftover === null ? [] : [leftover];
+    }
+}
+
+/**
+ * Insere um valor no esboço
+ */
+function sketchInsert(sketch, value) {
+    sketch.n++;
+    sketch.sum += value;
+    if (value < sketch.min) sketch.min = value;
+    if (value > sketch.max) sketch.max = value;
+
+    sketch.levels[0].push(value);
+    if (sketch.levels[0].length >= sketchLevelCapacity(sketch, 0)) {
+        compactSketch(sketch);
+    }
+}
+
+/**
+ * Combina esboços em um novo esboço (os originais não são alterados)
+ */
+function mergeQuantileSketches(sketches) {
+    const merged = createQuantileSketch();
+
+    sketches.forEach(sketch => {
+        merged.n += sketch.n;
+        merged.sum += sketch.sum;
+        merged.min = Math.min(merged.min, sketch.min);
+        merged.max = Math.max(merged.max, sketch.max);
+
+        sketch.levels.forEach((items, level) => {
+            while (merged.levels.length <= level) {
+                merged.levels.push([]);
+            }
+            merged.levels[level].push(...items);
+        });
+    });
+
+    compactSketch(merged);
+    return merged;
+}
+
+/**
+ * Estima o quantil q (0..1) de um esboço
+ */
+function sketchQuantile(sketch, q) {
+    if (sketch.n === 0) return 0;
+    if (q <= 0) return sketch.min;
+    if (q >= 1) return sketch.max;
+
+    const weighted = [];
+    sketch.levels.forEach((items, level) => {
+        const weight = Math.pow(2, level);
+        items.forEach(value => weighted.push([value, weight]));
+    });
+    weighted.sort((a, b) => a[0] - b[0]);
+
+    const totalWeight = weighted.reduce((sum, [, weight]) => sum + weight, 0);
+    const target = q * totalWeight;
+    let cumulative = 0;
+
+    for (const [value, weight] of weighted) {
+        cumulative += weight;
+        if (cumulative >= target) return value;
+    }
+
+    return sketch.max;
+}
+
+/**
+ * Insere os valores de uma transação nos esboços do seu mês e categoria
+ * (transferências entre contas próprias não são ticket de receita/despesa)
+ */
+function addTransactionToSketches(transaction, month = getTransactionMonth(transaction)) {
+    if (isInternalTransfer(transaction)) return;
+
+    const level1 = transaction['Classificação Nível 1'] || '';
+    const income = parseValue(transaction['Entrada (R$)']);
+    const expense = parseValue(transaction['Saída (R$)']);
+
+    let monthSketches = appState.sketches.byMonth.get(month);
+    if (!monthSketches) {
+        monthSketches = new Map();
+        appState.sketches.byMonth.set(month, monthSketches);
+    }
+
+    const insert = (direction, value) => {
+        const key = level1 + '\u001f' + direction;
+        let sketch = monthSketches.get(key);
+        if (!sketch) {
+            sketch = createQuantileSketch();
+            monthSketches.set(key, sketch);
+        }
+        sketchInsert(sketch, value);
+    };
+
+    if (income > 0) insert('in', income);
+    if (expense > 0) insert('out', expense);
+}
+
+/**
+ * Reconstrói os esboços dos meses que tiveram remoções ou alterações
+ */
+function refreshDirtySketches() {
+    const { byMonth, dirtyMonths } = appState.sketches;
+    if (dirtyMonths.size === 0) return;
+
+    dirtyMonths.forEach(month => {
+        byMonth.delete(month);
+        const rows = appState.monthRows.get(month);
+        if (rows) {
+            rows.forEach(transaction => addTransactionToSketches(transaction, month));
+        }
+    });
+
+    debugLog('debug', 'Esboços reconstruídos:', Array.from(dirtyMonths));
+    dirtyMonths.clear();
+}
+
+/**
+ * Métricas de ticket (média, mediana, p90, p99, mínimo e máximo) para um recorte.
+ *
+ * Filtros: direction ('in' | 'out'), months (lista de YYYY-MM ou função) e level1.
+ */
+function getTicketMetrics({ direction = 'in', months = null, level1 = null } = {}) {
+    refreshDirtySketches();
+
+    const selected = [];
+    appState.sketches.byMonth.forEach((monthSketches, month) => {
+        if (Array.isArray(months) && !months.includes(month)) return;
+        if (typeof months === 'function' && !months(month)) return;
+
+        monthSketches.forEach((sketch, key) => {
+            const [sketchLevel1, sketchDirection] = key.split('\u001f');
+            if (sketchDirection !== direction) return;
+            if (level1 !== null && sketchLevel1 !== level1) return;
+            selected.push(sketch);
+        });
+    });
+
+    const merged = mergeQuantileSketches(selected);
+    if (merged.n === 0) {
+        return { count: 0, mean: 0, min: 0, max: 0, median: 0, p90: 0, p99: 0 };
+    }
+
+    return {
+        count: merged.n,
+        mean: merged.sum / merged.n,
+        min: merged.min,
+        max: merged.max,
+        median: sketchQuantile(merged, 0.5),
+        p90: sketchQuantile(merged, 0.9),
+        p99: sketchQuantile(merged, 0.99)
+    };
+}
+
+// ==========================================
+// COMPARATIVOS MENSAIS (MoM / YoY)
+// ==========================================
+
+/**
+ * KPIs exibidos no card de comparativos
+ */
+const COMPARISON_KPIS = [
+    { key: 'revenue', label: 'Receitas', color: '#10B981' },
+    { key: 'expenses', label: 'Despesas', color: '#EF4444' },
+    { key: 'net', label: 'Resultado', color: '#3B82F6' },
+    { key: 'count', label: 'Transações', color: '#6B7280' }
+];
+
+/**
+ * Quantidade de meses exibidos nos sparklines
+ */
+const SPARKLINE_MONTHS = 12;
+
+/**
+ * Série mensal (mês -> totais e totais por nível 1), derivada do cubo
+ * e memoizada pela versão dos dados
+ */
+function getMonthlySeries() {
+    return memoizeByVersion('monthlySeries', () => {
+        const series = new Map();
+        rollupCube(['month']).forEach(row => {
+            series.set(row.month, { revenue: row.revenue, expenses: row.expenses, count: row.count, byLevel1: new Map() });
+        });
+        rollupCube(['month', 'level1']).forEach(row => {
+            series.get(row.month).byLevel1.set(row.level1, { revenue: row.revenue, expenses: row.expenses, count: row.count });
+        });
+        return series;
+    });
+}
+
+/**
+ * Mês anterior (MoM) ou mesmo mês do ano anterior (YoY)
+ */
+function getComparisonMonth(month, basis) {
+    const [year, monthNum] = month.split('-').map(Number);
+    if (basis === 'yoy') {
+        return `${year - 1}-${String(monthNum).padStart(2, '0')}`;
+    }
+    return monthNum === 1 ? `${year - 1}-12` : `${year}-${String(monthNum - 1).padStart(2, '0')}`;
+}
+
+/**
+ * Valor de um KPI em um ponto da série (em reais, exceto contagem)
+ */
+function getSeriesValue(point, key) {
+    if (!point) return 0;
+    switch (key) {
+        case 'revenue': return point.revenue;
+        case 'expenses': return point.expenses;
+        case 'net': return point.revenue - point.expenses;
+        case 'count': return point.count;
+        default: return 0;
+    }
+}
+
+/**
+ * Variação entre dois valores; percentual null quando não há base de comparação
+ */
+function computeDelta(current, previous) {
+    return {
+        current,
+        previous,
+        delta: current - previous,
+        percent: previous !== 0 ? ((current - previous) / Math.abs(previous)) * 100 : null
+    };
+}
+
+/**
+ * Variações MoM/YoY do último mês da série, por KPI e por classificação nível 1.
+ * Consulta apenas dois pontos da série mensal, sem varrer transações.
+ */
+function getComparisonDeltas(basis = 'mom') {
+    const series = getMonthlySeries();
+    const months = Array.from(series.keys()).sort();
+    if (months.length === 0) return null;
+
+    const month = months[months.length - 1];
+    const previousMonth = getComparisonMonth(month, basis);
+    const current = series.get(month);
+    const previous = series.get(previousMonth);
+
+    const kpis = {};
+    COMPARISON_KPIS.forEach(({ key }) => {
+        kpis[key] = computeDelta(getSeriesValue(current, key), getSeriesValue(previous, key));
+    });
+
+    const level1Keys = new Set([
+        ...current.byLevel1.keys(),
+        ...(previous ? previous.byLevel1.keys() : [])
+    ]);
+    const categories = Array.from(level1Keys).map(level1 => {
+        const now = current.byLevel1.get(level1);
+        const before = previous ? previous.byLevel1.get(level1) : null;
+        const value = point => point ? point.revenue - point.expenses : 0;
+        return { level1: level1 || 'Não Classificado', ...computeDelta(value(now), value(before)) };
+    }).filter(category => category.current !== 0 || category.previous !== 0);
+
+    categories.sort((a, b) => Math.abs(b.current) - Math.abs(a.current));
+
+    return { basis, month, previousMonth, kpis, categories };
+}
+
+/**
+ * Formata uma variação percentual para exibição
+ */
+function formatDelta(delta) {
+    if (delta.percent === null) return delta.current === 0 ? '—' : 'novo';
+    const signal = delta.percent > 0 ? '+' : '';
+    return `${signal}${delta.percent.toFixed(1)}%`;
+}
+
+/**
+ * Atualiza o card de comparativos (textos e sparklines)
+ */
+function updateComparisons() {
+    try {
+        const basisSelect = document.getElementById('comparisonBasis');
+        const basis = appData.ui.comparisonBasis || 'mom';
+        if (basisSelect) basisSelect.value = basis;
+
+        const comparison = getComparisonDeltas(basis);
+        if (!comparison) return;
+
+        const periodEl = document.getElementById('comparisonPeriod');
+        if (periodEl) {
+            periodEl.textContent = `${formatMonthLabel(comparison.month)} vs ${formatMonthLabel(comparison.previousMonth)}`;
+        }
+
+        COMPARISON_KPIS.forEach(({ key }) => {
+            const delta = comparison.kpis[key];
+            const valueEl = document.getElementById(`comparison-${key}-value`);
+            const deltaEl = document.getElementById(`comparison-${key}-delta`);
+
+            if (valueEl) {
+                valueEl.textContent = key === 'count' ? delta.current : formatCurrency(delta.current);
+            }
+            if (deltaEl) {
+                // Para despesas, aumento é desfavorável
+                const favorable = key === 'expenses' ? delta.delta <= 0 : delta.delta >= 0;
+                deltaEl.textContent = formatDelta(delta);
+                deltaEl.className = `text-xs font-semibold ${favorable ? 'text-success' : 'text-error'}`;
+            }
+        });
+
+        const categoriesEl = document.getElementById('comparisonCategories');
+        if (categoriesEl) {
+            categoriesEl.innerHTML = comparison.categories.slice(0, 6).map(category => {
+                const favorable = category.delta >= 0;
+                return `
+                    <div class="flex justify-between text-sm">
+                        <span class="truncate mr-2" title="${category.level1}">${category.level1}</span>
+                        <span class="whitespace-nowrap">
+                            ${formatCurrency(category.current)}
+                            <span class="text-xs font-semibold ${favorable ? 'text-success' : 'text-error'}">${formatDelta(category)}</span>
+                        </span>
+                    </div>
+                `;
+            }).join('');
+        }
+
+        updateSparklines();
+
+    } catch (error) {
+        debugLog('error', 'Erro ao atualizar comparativos:', error);
+    }
+}
+
+/**
+ * Troca a base de comparação (MoM/YoY) sem reprocessar transações
+ */
+function changeComparisonBasis(basis) {
+    appData.ui.comparisonBasis = basis === 'yoy' ? 'yoy' : 'mom';
+    updateComparisons();
+    saveAppData();
+}
+
+/**
+ * Rótulo curto de um mês YYYY-MM
+ */
+function formatMonthLabel(month) {
+    const [year, monthNum] = month.split('-');
+    const date = new Date(parseInt(year), parseInt(monthNum) - 1);
+    return date.toLocaleDateString('pt-BR', { month: 'short', year: '2-digit' });
+}
+
+/**
+ * Desenha ou atualiza os sparklines dos KPIs reaproveitando as instâncias do Chart.js
+ */
+function updateSparklines() {
+    if (typeof Chart === 'undefined') return;
+
+    const series = getMonthlySeries();
+    const months = Array.from(series.keys()).sort().slice(-SPARKLINE_MONTHS);
+    if (!appState.charts.sparklines) {
+        appState.charts.sparklines = {};
+    }
+
+    COMPARISON_KPIS.forEach(({ key, color }) => {
+        const canvas = document.getElementById(`comparison-${key}-sparkline`);
+        if (!canvas) return;
+
+        const data = months.map(month => getSeriesValue(series.get(month), key));
+        let chart = appState.charts.sparklines[key];
+
+        // A instância é recriada apenas se o canvas foi substituído
+        if (chart && chart.canvas !== canvas) {
+            chart.destroy();
+            chart = null;
+        }
+
+        if (chart) {
+            chart.data.labels = months;
+            chart.data.datasets[0].data = data;
+            chart.update('none');
+            return;
+        }
+
+        appState.charts.sparklines[key] = new Chart(canvas, {
+            type: 'line',
+            data: {
+                labels: months,
+                datasets: [{
+                    data,
+                    borderColor: color,
+                    borderWidth: 2,
+                    pointRadius: 0,
+                    fill: false,
+                    tension: 0.3
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                animation: false,
+                plugins: {
+                    legend: { display: false },
+                    tooltip: { enabled: false }
+                },
+                scales: {
+                    x: { display: false },
+                    y: { display: false }
+                }
+            }
+        });
+    });
+}
+
 // ==========================================
 // SISTEMA DE GRÁFICOS
 // ==========================================
@@ -410,6 +924,8 @@ async function updateCharts() {
             updateCategoryChart()
         ]);
 
+        updateSparklines();
+
         debugLog('info', 'Gráficos atualizados com sucesso');
 
     } catch (error) {
@@ -433,16 +949,10 @@ async function updateCashflowChart() {
             appState.charts.cashflow.destroy();
         }
 
-        // Agrupa dados por mês
+        // Agrupa dados por mês (roll-up do cubo)
         const monthlyData = {};
-        appData.transactions.forEach(transaction => {
-            const month = transaction['Mes'] || formatMonthYear(new Date(transaction['Data']));
-            if (!monthlyData[month]) {
-                monthlyData[month] = { revenue: 0, expenses: 0 };
-            }
-
-            monthlyData[month].revenue += parseValue(transaction['Entrada (R$)']);
-            monthlyData[month].expenses += parseValue(transaction['Saída (R$)']);
+        rollupCube(['month']).forEach(row => {
+            monthlyData[row.month] = { revenue: row.revenue, expenses: row.expenses };
         });
 
         const months = Object.keys(monthlyData).sort();
@@ -561,14 +1071,11 @@ async function updateCategoryChart() {
             appState.charts.category.destroy();
         }
 
-        // Agrupa despesas por categoria nível 1
+        // Agrupa despesas por categoria nível 1 (roll-up do cubo)
         const categoryData = {};
-        appData.transactions.forEach(transaction => {
-            const category = transaction['Classificação Nível 1'] || 'Não Classificado';
-            const expense = parseValue(transaction['Saída (R$)']);
-
-            if (expense > 0) {
-                categoryData[category] = (categoryData[category] || 0) + expense;
+        rollupCube(['level1']).forEach(row => {
+            if (row.expenses > 0) {
+                categoryData[row.level1 || 'Não Classificado'] = row.expenses;
             }
         });
 
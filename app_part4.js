@@ -10,6 +10,12 @@ async function loadTransactions() {
     try {
         debugLog('info', 'Carregando gestão de transações...');
 
+        // Sincroniza o seletor com o modo de exibição salvo
+        const itemsPerPage = document.getElementById('itemsPerPage');
+        if (itemsPerPage) {
+            itemsPerPage.value = appData.ui.virtualScroll ? 'virtual' : String(appData.pagination.itemsPerPage);
+        }
+
         // Aplica filtros e carrega transações
         await filterTransactions();
 
@@ -26,120 +32,1353 @@ async function loadTransactions() {
  */
 async function filterTransactions() {
     try {
-        let filteredTransactions = [...appData.transactions];
-
-        // Filtro por busca textual
-        const searchTerm = document.getElementById('searchTransactions')?.value.toLowerCase();
-        if (searchTerm) {
-            filteredTransactions = filteredTransactions.filter(transaction => {
-                const description = (transaction['Descrição Original'] || '').toLowerCase();
-                const payee = (transaction['Favorecido / Pagador Padronizado'] || '').toLowerCase();
-                const bank = (transaction['Banco Origem/Destino'] || '').toLowerCase();
-
-                return description.includes(searchTerm) || 
-                       payee.includes(searchTerm) || 
-                       bank.includes(searchTerm);
+        const filteredTransactions = runFilterPipeline(getFilterParams());
+
+        // Atualiza cache
+        appState.cache.filteredTransactions = filteredTransactions;
+
+        updateBulkActionsBar();
+        renderSavedViewOptions();
+        updateTransactionFacets(filteredTransactions);
+
+        // Modo de rolagem contínua: renderiza apenas a janela visível
+        if (appData.ui.virtualScroll) {
+            appData.pagination.total = filteredTransactions.length;
+            renderVirtualTransactionsTable(filteredTransactions);
+            return;
+        }
+
+        destroyVirtualTable();
+
+        renderTransactionsPage();
+
+    } catch (error) {
+        debugLog('error', 'Erro ao filtrar transações:', error);
+        showNotification('Erro ao aplicar filtros', 'error');
+    }
+}
+
+// ==========================================
+// ÍNDICE DE BUSCA TEXTUAL (TRIGRAMAS)
+// ==========================================
+
+/**
+ * Campos pesquisáveis pela busca de transações
+ */
+const SEARCH_FIELDS = [
+    'Descrição Original',
+    'Favorecido / Pagador Padronizado',
+    'Banco Origem/Destino',
+    'Notas',
+    'Classificação Nível 1',
+    'Classificação Nível 2',
+    'Classificação Nível 3'
+];
+
+/**
+ * Cria um índice de busca vazio.
+ * Cada valor distinto recebe um id crescente; as listas de trigramas guardam
+ * ids em Int32Array ordenados, o que permite interseção por busca binária.
+ */
+function createSearchIndex() {
+    return {
+        valueIds: new Map(),
+        valueText: [],
+        valueDocs: [],
+        postings: new Map(),
+        deadValues: 0
+    };
+}
+
+/**
+ * Valores normalizados (minúsculos, sem repetição) dos campos pesquisáveis
+ */
+function getSearchValues(transaction) {
+    const values = new Set();
+    SEARCH_FIELDS.forEach(field => {
+        const value = (transaction[field] || '').toString().toLowerCase();
+        if (value) values.add(value);
+    });
+    return values;
+}
+
+/**
+ * Chave do trigrama que começa na posição i.
+ * Caracteres comuns (código < 1024) viram um inteiro pequeno, bem mais
+ * barato como chave de Map do que uma substring.
+ */
+function trigramKey(text, i) {
+    const a = text.charCodeAt(i);
+    const b = text.charCodeAt(i + 1);
+    const c = text.charCodeAt(i + 2);
+    if (a < 1024 && b < 1024 && c < 1024) {
+        return (a << 20) | (b << 10) | c;
+    }
+    return text.substr(i, 3);
+}
+
+/**
+ * Acrescenta um id ao final de uma lista de trigramas
+ */
+function appendPosting(postings, trigram, id) {
+    let posting = postings.get(trigram);
+    if (!posting) {
+        posting = { ids: new Int32Array(4), length: 0 };
+        postings.set(trigram, posting);
+    }
+
+    // Trigrama repetido no mesmo valor: o id já é o último da lista
+    if (posting.length > 0 && posting.ids[posting.length - 1] === id) return;
+
+    if (posting.length === posting.ids.length) {
+        const grown = new Int32Array(posting.ids.length * 2);
+        grown.set(posting.ids);
+        posting.ids = grown;
+    }
+    posting.ids[posting.length++] = id;
+}
+
+/**
+ * Adiciona uma transação ao índice.
+ * Campos repetidos (banco, classificações, favorecidos) são indexados uma
+ * única vez por valor distinto e apontam para suas transações.
+ */
+function addToSearchIndex(transaction, index = appState.searchIndex) {
+    // Índice ainda não construído: será montado por completo sob demanda
+    if (!index) return;
+
+    getSearchValues(transaction).forEach(value => {
+        let id = index.valueIds.get(value);
+
+        if (id === undefined) {
+            id = index.valueText.length;
+            index.valueIds.set(value, id);
+            index.valueText.push(value);
+            index.valueDocs.push(transaction);
+
+            for (let i = 0; i + 3 <= value.length; i++) {
+                appendPosting(index.postings, trigramKey(value, i), id);
+            }
+            return;
+        }
+
+        // Um único documento fica direto no slot; a partir do segundo, usa Set
+        const docs = index.valueDocs[id];
+        if (docs instanceof Set) {
+            docs.add(transaction);
+        } else {
+            index.valueDocs[id] = new Set([docs, transaction]);
+        }
+    });
+}
+
+/**
+ * Remove uma transação do índice (usa os valores atuais dos campos).
+ * Valores sem transações viram lápides; o índice é compactado quando
+ * as lápides passam a ser maioria.
+ */
+function removeFromSearchIndex(transaction) {
+    const index = appState.searchIndex;
+    if (!index) return;
+
+    getSearchValues(transaction).forEach(value => {
+        const id = index.valueIds.get(value);
+        if (id === undefined) return;
+
+        const docs = index.valueDocs[id];
+        if (docs instanceof Set) {
+            docs.delete(transaction);
+            if (docs.size > 0) return;
+        } else if (docs !== transaction) {
+            return;
+        }
+
+        index.valueIds.delete(value);
+        index.valueText[id] = null;
+        index.valueDocs[id] = null;
+        index.deadValues++;
+    });
+
+    // Lápides em maioria: descarta o índice, que será reconstruído sob demanda
+    if (index.deadValues > 1000 && index.deadValues > index.valueIds.size) {
+        invalidateSearchIndex();
+    }
+}
+
+/**
+ * Descarta o índice de busca (reconstruído na próxima busca ou em tempo ocioso)
+ */
+function invalidateSearchIndex() {
+    appState.searchIndex = null;
+    appState.searchIndexBuild = null;
+}
+
+/**
+ * Constrói o índice de busca completo a partir das transações
+ */
+function rebuildSearchIndex() {
+    const index = createSearchIndex();
+    appData.transactions.forEach(transaction => addToSearchIndex(transaction, index));
+    appState.searchIndex = index;
+    appState.searchIndexBuild = null;
+
+    debugLog('debug', 'Índice de busca construído:', {
+        values: index.valueIds.size,
+        trigrams: index.postings.size
+    });
+
+    return index;
+}
+
+/**
+ * Avança a construção do índice em tempo ocioso, um bloco de transações por vez.
+ * Retorna false enquanto houver trabalho pendente.
+ */
+function buildSearchIndexSlice(chunkSize = 4000) {
+    if (appState.searchIndex) return true;
+
+    let build = appState.searchIndexBuild;
+    if (!build || build.version !== appState.dataVersion) {
+        build = { index: createSearchIndex(), position: 0, version: appState.dataVersion };
+        appState.searchIndexBuild = build;
+    }
+
+    const transactions = appData.transactions;
+    const end = Math.min(transactions.length, build.position + chunkSize);
+    for (let i = build.position; i < end; i++) {
+        addToSearchIndex(transactions[i], build.index);
+    }
+    build.position = end;
+
+    if (end < transactions.length) return false;
+
+    appState.searchIndex = build.index;
+    appState.searchIndexBuild = null;
+    return true;
+}
+
+/**
+ * Interseção de uma lista ordenada de ids com uma lista de trigramas
+ */
+function intersectPosting(candidates, posting) {
+    const { ids, length } = posting;
+    const result = [];
+    let low = 0;
+
+    for (const id of candidates) {
+        // Busca exponencial a partir da última posição encontrada
+        let step = 1;
+        while (low + step < length && ids[low + step] < id) {
+            step *= 2;
+        }
+        let high = Math.min(length, low + step + 1);
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (ids[mid] < id) low = mid + 1;
+            else high = mid;
+        }
+        if (low === length) break;
+        if (ids[low] === id) result.push(id);
+    }
+
+    return result;
+}
+
+/**
+ * Ids dos valores distintos que contêm o termo.
+ * Intersecta as listas de trigramas (da menor para a maior) e confirma cada
+ * candidato com includes; termos com menos de 3 caracteres varrem os valores distintos.
+ * Quando o termo apenas cresceu, basta refinar os ids da busca anterior (previousIds).
+ */
+function matchSearchValues(index, query, previousIds = null) {
+    let candidates;
+
+    if (previousIds) {
+        candidates = previousIds;
+    } else if (query.length < 3) {
+        candidates = index.valueIds.values();
+    } else {
+        const uniqueLists = new Set();
+        for (let i = 0; i + 3 <= query.length; i++) {
+            const posting = index.postings.get(trigramKey(query, i));
+            if (!posting) return [];
+            uniqueLists.add(posting);
+        }
+        const lists = Array.from(uniqueLists).sort((a, b) => a.length - b.length);
+
+        candidates = lists[0].ids.subarray(0, lists[0].length);
+        for (let i = 1; i < lists.length && candidates.length > 0; i++) {
+            candidates = intersectPosting(candidates, lists[i]);
+        }
+    }
+
+    const matched = [];
+    for (const id of candidates) {
+        const text = index.valueText[id];
+        if (text !== null && text.includes(query)) matched.push(id);
+    }
+    return matched;
+}
+
+/**
+ * Transações (sem repetição) que possuem algum dos valores informados
+ */
+function expandSearchValues(index, ids) {
+    const result = new Set();
+    ids.forEach(id => {
+        const docs = index.valueDocs[id];
+        if (docs instanceof Set) {
+            docs.forEach(transaction => result.add(transaction));
+        } else if (docs) {
+            result.add(docs);
+        }
+    });
+    return result;
+}
+
+/**
+ * Busca transações cujo texto contém o termo
+ */
+function searchTransactionIndex(term) {
+    const index = appState.searchIndex || rebuildSearchIndex();
+    return expandSearchValues(index, matchSearchValues(index, term.toLowerCase()));
+}
+
+// ==========================================
+// PIPELINE DE FILTROS (ETAPAS EM CACHE)
+// ==========================================
+
+/**
+ * Lê os parâmetros de filtro e ordenação atuais
+ */
+function getFilterParams() {
+    return {
+        searchTerm: (document.getElementById('searchTransactions')?.value || '').toLowerCase(),
+        status: document.getElementById('statusFilter')?.value || 'all',
+        dateFrom: document.getElementById('dateFromFilter')?.value || '',
+        dateTo: document.getElementById('dateToFilter')?.value || '',
+        query: (document.getElementById('transactionQuery')?.value || '').trim(),
+        sortColumn: appData.ui.sortColumn,
+        sortDirection: appData.ui.sortDirection
+    };
+}
+
+/**
+ * Executa o pipeline busca → consulta → status → período → ordenação.
+ * Cada etapa guarda sua saída junto com a entrada e os parâmetros usados;
+ * se nada mudou, a saída é reaproveitada, e parâmetros que apenas restringem
+ * o resultado (termo que cresce, período menor) refinam a saída anterior.
+ */
+function runFilterPipeline(params) {
+    let pipeline = appState.filterPipeline;
+    if (!pipeline || pipeline.version !== appState.dataVersion) {
+        pipeline = { version: appState.dataVersion, search: null, query: null, status: null, dates: null, sort: null };
+        appState.filterPipeline = pipeline;
+    }
+
+    const searched = runSearchStage(pipeline, params.searchTerm);
+    const queried = runQueryStage(pipeline, searched, params.query || '');
+    const byStatus = runStatusStage(pipeline, queried, params.status);
+    const byDate = runDateStage(pipeline, byStatus, params.dateFrom, params.dateTo);
+    return runSortStage(pipeline, byDate, params.sortColumn, params.sortDirection);
+}
+
+/**
+ * Etapa de busca textual
+ */
+function runSearchStage(pipeline, term) {
+    const previous = pipeline.search;
+    if (previous && previous.term === term) return previous.output;
+
+    if (!term) {
+        pipeline.search = { term, index: null, ids: null, output: appData.transactions };
+        return appData.transactions;
+    }
+
+    const index = appState.searchIndex || rebuildSearchIndex();
+
+    // Termo que só cresceu: os resultados são um subconjunto dos anteriores
+    const narrows = previous && previous.ids && previous.index === index && term.includes(previous.term);
+    const ids = matchSearchValues(index, term, narrows ? previous.ids : null);
+    const output = Array.from(expandSearchValues(index, ids));
+
+    pipeline.search = { term, index, ids, output };
+    return output;
+}
+
+/**
+ * Etapa da linguagem de consulta.
+ * Sobre o conjunto completo, usa o plano de índices da consulta; sobre uma
+ * entrada já filtrada, apenas aplica o predicado compilado.
+ */
+function runQueryStage(pipeline, input, queryText) {
+    const previous = pipeline.query;
+    if (previous && previous.input === input && previous.queryText === queryText) return previous.output;
+
+    let output = input;
+    let error = null;
+    if (queryText) {
+        try {
+            const compiled = compileTransactionQuery(queryText);
+            output = input === appData.transactions
+                ? executeTransactionQuery(compiled)
+                : input.filter(compiled.predicate);
+        } catch (queryError) {
+            // Consulta incompleta ou inválida: mantém a entrada e mostra o erro
+            error = queryError.message;
+        }
+    }
+    showQueryError(error);
+
+    pipeline.query = { input, queryText, output };
+    return output;
+}
+
+/**
+ * Etapa de status de conciliação
+ */
+function runStatusStage(pipeline, input, status) {
+    const previous = pipeline.status;
+    if (previous && previous.input === input && previous.status === status) return previous.output;
+
+    const output = status === 'all' ? input : input.filter(transaction =>
+        (transaction['Status Conciliação'] || 'Pendente') === status
+    );
+
+    pipeline.status = { input, status, output };
+    return output;
+}
+
+/**
+ * Etapa de período (datas inclusivas, em dias epoch)
+ */
+function runDateStage(pipeline, input, dateFrom, dateTo) {
+    const previous = pipeline.dates;
+    if (previous && previous.input === input && previous.dateFrom === dateFrom && previous.dateTo === dateTo) {
+        return previous.output;
+    }
+
+    let output = input;
+    if (dateFrom || dateTo) {
+        const range = getDateRangeSlice(dateFrom, dateTo);
+
+        if (input === appData.transactions) {
+            // Sem outros filtros: o período é uma fatia contígua do índice por data
+            const all = appData.transactions;
+            output = Array.from(range.permutation.subarray(range.start, range.end), position => all[position]);
+        } else {
+            // Intersecta com os demais filtros consultando a chave de cada linha
+            const keys = getSortKeys('Data');
+            output = input.filter(transaction => {
+                const day = keys[getTransactionPosition(transaction.id)];
+                return day >= range.fromDay && day <= range.toDay;
             });
         }
+    }
+
+    pipeline.dates = { input, dateFrom, dateTo, output };
+    return output;
+}
+
+/**
+ * Primeira posição da permutação por data cuja chave é >= day
+ */
+function lowerBoundByDay(permutation, keys, day) {
+    let low = 0;
+    let high = permutation.length;
+    while (low < high) {
+        const mid = (low + high) >>> 1;
+        if (keys[permutation[mid]] < day) low = mid + 1;
+        else high = mid;
+    }
+    return low;
+}
+
+/**
+ * Intervalo [start, end) da permutação por data (crescente) para um período.
+ * Datas inválidas ficam sempre de fora quando há filtro de período.
+ */
+function getDateRangeSlice(dateFrom, dateTo) {
+    return getDayRangeSlice(
+        dateFrom ? toEpochDay(dateFrom) : -Number.MAX_VALUE,
+        dateTo ? toEpochDay(dateTo) : Number.MAX_VALUE
+    );
+}
+
+/**
+ * Intervalo [start, end) da permutação por data para dias epoch inclusivos
+ */
+function getDayRangeSlice(fromDay, toDay) {
+    const permutation = getSortPermutation('Data', 'asc');
+    const keys = getSortKeys('Data');
+
+    return {
+        permutation,
+        fromDay,
+        toDay,
+        start: lowerBoundByDay(permutation, keys, fromDay),
+        end: toDay < Number.MAX_VALUE ? lowerBoundByDay(permutation, keys, toDay + 1) : permutation.length
+    };
+}
+
+/**
+ * Etapa de ordenação (nunca altera a entrada)
+ */
+function runSortStage(pipeline, input, sortColumn, sortDirection) {
+    const previous = pipeline.sort;
+    if (previous && previous.input === input &&
+        previous.sortColumn === sortColumn && previous.sortDirection === sortDirection) {
+        return previous.output;
+    }
+
+    // Mesma entrada e coluna, só a direção mudou: inverte a saída anterior
+    const output = previous && previous.input === input && previous.sortColumn === sortColumn
+        ? previous.output.slice().reverse()
+        : sortTransactionsArray(input, sortColumn, sortDirection);
+    pipeline.sort = { input, sortColumn, sortDirection, output };
+    return output;
+}
+
+/**
+ * Renderiza a página atual a partir do conjunto filtrado e ordenado em cache
+ */
+function renderTransactionsPage() {
+    const filteredTransactions = appState.cache.filteredTransactions || [];
+
+    // Paginação
+    const { page, itemsPerPage } = appData.pagination;
+    const totalItems = filteredTransactions.length;
+    const startIndex = (page - 1) * itemsPerPage;
+    const endIndex = startIndex + itemsPerPage;
+    const paginatedTransactions = filteredTransactions.slice(startIndex, endIndex);
+
+    // Atualiza total para paginação
+    appData.pagination.total = totalItems;
+
+    // Renderiza transações
+    renderTransactionsTable(paginatedTransactions);
+
+    // Atualiza controles de paginação
+    updatePaginationControls();
+
+    debugLog('debug', 'Filtros aplicados:', {
+        total: appData.transactions.length,
+        filtered: filteredTransactions.length,
+        paginated: paginatedTransactions.length,
+        page: page
+    });
+}
+
+// ==========================================
+// LINGUAGEM DE CONSULTA
+// ==========================================
+
+/**
+ * Campos aceitos na consulta.
+ * kind: 'number', 'date', 'month', 'type', 'text' (":" contém, "=" igual)
+ * ou 'code' (classificação: ":" começa com, "=" igual).
+ * dimension liga o campo à dimensão correspondente do cubo.
+ */
+const QUERY_FIELDS = {
+    valor: { kind: 'number' },
+    data: { kind: 'date' },
+    mes: { kind: 'month' },
+    tipo: { kind: 'type' },
+    banco: { kind: 'text', field: 'Banco Origem/Destino', dimension: 'bank' },
+    nivel1: { kind: 'code', field: 'Classificação Nível 1', dimension: 'level1' },
+    nivel2: { kind: 'code', field: 'Classificação Nível 2', dimension: 'level2' },
+    nivel3: { kind: 'code', field: 'Classificação Nível 3', dimension: 'level3' },
+    centro: { kind: 'text', field: 'Centro de Custo', dimension: 'costCenter' },
+    status: { kind: 'text', field: 'Status Conciliação', dimension: 'status', fallback: 'Pendente' },
+    descricao: { kind: 'text', field: 'Descrição Original' },
+    favorecido: { kind: 'text', field: 'Favorecido / Pagador Padronizado' },
+    notas: { kind: 'text', field: 'Notas' }
+};
+
+/**
+ * Nomes alternativos dos campos
+ */
+const QUERY_FIELD_ALIASES = {
+    classificacao: 'nivel1',
+    categoria: 'nivel1',
+    subcategoria: 'nivel2',
+    conta: 'nivel3',
+    desc: 'descricao',
+    pagador: 'favorecido',
+    nota: 'notas'
+};
+
+/**
+ * Quantidade máxima de consultas compiladas mantidas em cache
+ */
+const QUERY_CACHE_LIMIT = 50;
+
+/**
+ * Minúsculas e sem acentos ("Itaú" → "itau")
+ */
+function normalizeQueryText(value) {
+    return String(value).normalize('NFD').replace(/[̀-ͯ]/g, '').toLowerCase().trim();
+}
+
+/**
+ * Resolve o nome de um campo (com aliases); lança erro se desconhecido
+ */
+function resolveQueryField(name) {
+    const normalized = normalizeQueryText(name);
+    const resolved = QUERY_FIELD_ALIASES[normalized] || normalized;
+    if (!QUERY_FIELDS[resolved]) {
+        throw new Error(`Campo desconhecido: ${name}`);
+    }
+    return resolved;
+}
+
+/**
+ * Quebra a consulta em tokens: parênteses, operadores lógicos,
+ * termos campo:valor (com "-" opcional para negar) e texto livre.
+ */
+function tokenizeQuery(text) {
+    const pattern = /\s*(?:([()])|(-?)([\p{L}\d_]+)(>=|<=|!=|:|=|>|<)("[^"]*"?|[^\s()]*)|(-?)("[^"]*"?|[^\s()]+))/uy;
+    const tokens = [];
+    const unquote = value => value.startsWith('"') ? value.replace(/^"|"$/g, '') : value;
+
+    pattern.lastIndex = 0;
+    while (pattern.lastIndex < text.length) {
+        const start = pattern.lastIndex;
+        const match = pattern.exec(text);
+        if (!match) {
+            if (!text.slice(start).trim()) break;
+            throw new Error(`Consulta inválida perto de "${text.slice(start).trim()}"`);
+        }
+
+        if (match[1]) {
+            tokens.push({ type: match[1] });
+        } else if (match[3]) {
+            tokens.push({ type: 'term', negated: match[2] === '-', field: match[3], op: match[4], value: unquote(match[5]) });
+        } else if (match[7] !== undefined) {
+            const word = match[7];
+            const keyword = { OU: 'or', OR: 'or', E: 'and', AND: 'and', 'NÃO': 'not', NAO: 'not', NOT: 'not' }[word];
+            if (keyword && !match[6]) {
+                tokens.push({ type: keyword });
+            } else {
+                tokens.push({ type: 'text', negated: match[6] === '-', value: unquote(word) });
+            }
+        }
+    }
+
+    return tokens;
+}
+
+/**
+ * Converte a consulta em uma árvore sintática.
+ * Gramática: ou := e ("OU" e)* ; e := unário ("E"? unário)* ;
+ * unário := "NÃO" unário | "(" ou ")" | termo
+ */
+function parseTransactionQuery(text) {
+    const tokens = tokenizeQuery(text);
+    let position = 0;
+
+    const peek = () => tokens[position];
+    const next = () => tokens[position++];
+
+    function parseOr() {
+        const children = [parseAnd()];
+        while (peek() && peek().type === 'or') {
+            next();
+            children.push(parseAnd());
+        }
+        return children.length === 1 ? children[0] : { type: 'or', children };
+    }
+
+    function parseAnd() {
+        const children = [parseUnary()];
+        while (peek() && peek().type !== 'or' && peek().type !== ')') {
+            if (peek().type === 'and') next();
+            children.push(parseUnary());
+        }
+        return children.length === 1 ? children[0] : { type: 'and', children };
+    }
+
+    function parseUnary() {
+        const token = next();
+        if (!token) throw new Error('Consulta incompleta');
+
+        if (token.type === 'not') return { type: 'not', child: parseUnary() };
+        if (token.type === '(') {
+            const node = parseOr();
+            if (!next() || tokens[position - 1].type !== ')') throw new Error('Parêntese não fechado');
+            return node;
+        }
+        if (token.type === 'text') {
+            const node = { type: 'text', value: token.value.toLowerCase() };
+            return token.negated ? { type: 'not', child: node } : node;
+        }
+        if (token.type === 'term') {
+            const node = parseQueryTerm(token);
+            return token.negated ? { type: 'not', child: node } : node;
+        }
+        throw new Error('Operador fora de lugar');
+    }
+
+    if (tokens.length === 0) throw new Error('Consulta vazia');
+    const ast = parseOr();
+    if (position < tokens.length) throw new Error('Parêntese sem abertura');
+    return ast;
+}
+
+/**
+ * Converte um termo campo:valor em nó da árvore, validando valor e operador
+ */
+function parseQueryTerm(token) {
+    const name = normalizeQueryText(token.field);
+
+    // sem:campo / com:campo
+    if (name === 'sem' || name === 'com') {
+        return { type: 'missing', field: resolveQueryField(token.value), present: name === 'com' };
+    }
+
+    const field = resolveQueryField(token.field);
+    const kind = QUERY_FIELDS[field].kind;
+    const op = token.op === '=' ? ':' : token.op;
+    if (token.value === '') throw new Error(`Valor ausente para ${token.field}`);
+
+    const parseBound = raw => {
+        if (kind === 'number') {
+            const number = parseValue(raw);
+            if (!/\d/.test(raw)) throw new Error(`Valor inválido: ${raw}`);
+            return number;
+        }
+        if (kind === 'date') {
+            const isoDate = /^(\d{2})\/(\d{2})\/(\d{4})$/.test(raw) ? raw.split('/').reverse().join('-') : raw;
+            const day = toEpochDay(isoDate);
+            if (isNaN(day)) throw new Error(`Data inválida: ${raw}`);
+            return day;
+        }
+        if (kind === 'month') {
+            if (!/^\d{4}-\d{2}$/.test(raw)) throw new Error(`Mês inválido (use AAAA-MM): ${raw}`);
+            return raw;
+        }
+        return raw;
+    };
+
+    // Intervalo inclusivo: valor:100..500, data:2025-01-01..2025-03-31, mes:2025-01..2025-03
+    if (op === ':' && token.value.includes('..') && (kind === 'number' || kind === 'date' || kind === 'month')) {
+        const [from, to] = token.value.split('..');
+        return {
+            type: 'range',
+            field,
+            from: from ? parseBound(from) : null,
+            to: to ? parseBound(to) : null
+        };
+    }
+
+    if (kind === 'type') {
+        const value = normalizeQueryText(token.value);
+        if (op !== ':' && op !== '!=') throw new Error(`Operador ${token.op} não se aplica a ${token.field}`);
+        if (!['receita', 'entrada', 'despesa', 'saida'].includes(value)) {
+            throw new Error('Use tipo:receita ou tipo:despesa');
+        }
+        return { type: 'compare', field, op, value: value === 'receita' || value === 'entrada' ? 'receita' : 'despesa' };
+    }
+
+    if ((kind === 'text' || kind === 'code') && op !== ':' && op !== '!=') {
+        throw new Error(`Operador ${token.op} não se aplica a ${token.field}`);
+    }
+
+    // Em campos de texto ":" é "contém"/"começa com" e "=" é igualdade exata
+    const exact = token.op === '=' || token.op === '!=';
+    const value = kind === 'text' || kind === 'code' ? normalizeQueryText(token.value) : parseBound(token.value);
+    return { type: 'compare', field, op, exact, value };
+}
+
+/**
+ * Função que lê o valor comparável de um campo em uma transação
+ */
+function getQueryFieldGetter(field) {
+    const definition = QUERY_FIELDS[field];
+    switch (definition.kind) {
+        case 'number':
+            return transaction => Math.abs(parseValue(transaction['Entrada (R$)']) - parseValue(transaction['Saída (R$)']));
+        case 'date':
+            return transaction => toEpochDay(transaction['Data']);
+        case 'month':
+            return transaction => getTransactionMonth(transaction);
+        case 'type':
+            return transaction => parseValue(transaction['Entrada (R$)']) > 0 ? 'receita' : 'despesa';
+        default: {
+            // Valores de texto se repetem muito: normaliza cada valor distinto uma vez
+            const normalized = new Map();
+            return transaction => {
+                const raw = transaction[definition.field] || definition.fallback || '';
+                let value = normalized.get(raw);
+                if (value === undefined) {
+                    if (normalized.size > 50000) normalized.clear();
+                    value = normalizeQueryText(raw);
+                    normalized.set(raw, value);
+                }
+                return value;
+            };
+        }
+    }
+}
 
-        // Filtro por status
-        const statusFilter = document.getElementById('statusFilter')?.value;
-        if (statusFilter && statusFilter !== 'all') {
-            filteredTransactions = filteredTransactions.filter(transaction => 
-                (transaction['Status Conciliação'] || 'Pendente') === statusFilter
+/**
+ * Teste de um valor (já normalizado) contra um nó compare/range/missing
+ */
+function compileQueryValueTest(node) {
+    const kind = QUERY_FIELDS[node.field].kind;
+
+    if (node.type === 'missing') {
+        return value => (value !== '' && value !== null && value !== undefined) === node.present;
+    }
+    if (node.type === 'range') {
+        return value => (node.from === null || value >= node.from) && (node.to === null || value <= node.to);
+    }
+
+    const target = node.value;
+    if (kind === 'text' || kind === 'code') {
+        if (node.exact) {
+            return node.op === '!=' ? value => value !== target : value => value === target;
+        }
+        return kind === 'code' ? value => value.startsWith(target) : value => value.includes(target);
+    }
+
+    switch (node.op) {
+        case '>': return value => value > target;
+        case '>=': return value => value >= target;
+        case '<': return value => value < target;
+        case '<=': return value => value <= target;
+        case '!=': return value => value !== target;
+        default: return value => value === target;
+    }
+}
+
+/**
+ * Compila um nó da árvore em um predicado (transação) => boolean
+ */
+function compileQueryPredicate(node) {
+    switch (node.type) {
+        case 'and': {
+            const children = node.children.map(compileQueryPredicate);
+            return transaction => children.every(child => child(transaction));
+        }
+        case 'or': {
+            const children = node.children.map(compileQueryPredicate);
+            return transaction => children.some(child => child(transaction));
+        }
+        case 'not': {
+            const child = compileQueryPredicate(node.child);
+            return transaction => !child(transaction);
+        }
+        case 'text': {
+            // Texto livre: mesma semântica da caixa de busca
+            const term = node.value;
+            return transaction => SEARCH_FIELDS.some(field =>
+                (transaction[field] || '').toString().toLowerCase().includes(term)
             );
         }
+        default: {
+            const getValue = getQueryFieldGetter(node.field);
+            const test = compileQueryValueTest(node);
+            return transaction => test(getValue(transaction));
+        }
+    }
+}
+
+/**
+ * Caminho de acesso por índice para um termo da conjunção principal.
+ * estimate() devolve quantas linhas serão examinadas; rows() as devolve.
+ * Retorna null para termos que só podem ser avaliados linha a linha.
+ */
+function compileQueryAccessPath(node) {
+    if (node.type === 'text') {
+        return {
+            name: 'busca',
+            estimate: () => {
+                const index = appState.searchIndex || rebuildSearchIndex();
+                return expandSearchValues(index, matchSearchValues(index, node.value)).size;
+            },
+            rows: () => {
+                const index = appState.searchIndex || rebuildSearchIndex();
+                return Array.from(expandSearchValues(index, matchSearchValues(index, node.value)));
+            }
+        };
+    }
+
+    if (node.type !== 'compare' && node.type !== 'range' && node.type !== 'missing') return null;
+    if (node.op === '!=') return null;
+
+    const definition = QUERY_FIELDS[node.field];
+    const test = compileQueryValueTest(node);
+
+    // Período: fatia contígua da permutação por data
+    if (definition.kind === 'date' && node.type !== 'missing') {
+        const bounds = () => {
+            if (node.type === 'range') {
+                return [node.from === null ? -Number.MAX_VALUE : node.from, node.to === null ? Number.MAX_VALUE : node.to];
+            }
+            switch (node.op) {
+                case '>': return [node.value + 1, Number.MAX_VALUE];
+                case '>=': return [node.value, Number.MAX_VALUE];
+                case '<': return [-Number.MAX_VALUE, node.value - 1];
+                case '<=': return [-Number.MAX_VALUE, node.value];
+                default: return [node.value, node.value];
+            }
+        };
+        return {
+            name: 'data',
+            estimate: () => {
+                const range = getDayRangeSlice(...bounds());
+                return range.end - range.start;
+            },
+            rows: () => {
+                const range = getDayRangeSlice(...bounds());
+                const all = appData.transactions;
+                return Array.from(range.permutation.subarray(range.start, range.end), position => all[position]);
+            }
+        };
+    }
 
-        // Filtro por data
-        const dateFrom = document.getElementById('dateFromFilter')?.value;
-        const dateTo = document.getElementById('dateToFilter')?.value;
+    // Mês: linhas agrupadas por mês
+    if (definition.kind === 'month' && node.type !== 'missing') {
+        const months = () => Array.from(appState.monthRows.keys()).filter(test);
+        return {
+            name: 'mes',
+            estimate: () => months().reduce((total, month) => total + appState.monthRows.get(month).size, 0),
+            rows: () => months().flatMap(month => Array.from(appState.monthRows.get(month)))
+        };
+    }
 
-        if (dateFrom) {
-            const fromDate = new Date(dateFrom);
-            filteredTransactions = filteredTransactions.filter(transaction => {
-                const transactionDate = new Date(transaction['Data']);
-                return transactionDate >= fromDate;
+    // Dimensões do cubo: as células dizem quais valores e meses atendem ao termo
+    if (definition.dimension) {
+        const cellTest = cell => test(normalizeQueryText(cell[definition.dimension] || definition.fallback || ''));
+        const lookup = () => {
+            const values = new Set();
+            const months = new Set();
+            let count = 0;
+            appState.cube.partitions.forEach((partition, month) => {
+                partition.forEach(cell => {
+                    if (!cellTest(cell)) return;
+                    values.add(cell[definition.dimension]);
+                    months.add(month);
+                    count += cell.count;
+                });
             });
+            return { values, months, count };
+        };
+
+        // Com o índice de busca pronto, cada valor distinto aponta direto para suas linhas
+        const useValueDocs = matches => appState.searchIndex && SEARCH_FIELDS.includes(definition.field) &&
+            !matches.values.has('');
+
+        return {
+            name: node.field,
+            estimate: () => {
+                const matches = lookup();
+                if (useValueDocs(matches)) return matches.count;
+                let rows = 0;
+                matches.months.forEach(month => {
+                    rows += appState.monthRows.get(month)?.size || 0;
+                });
+                return rows;
+            },
+            rows: () => {
+                const matches = lookup();
+                if (useValueDocs(matches)) {
+                    const index = appState.searchIndex;
+                    const ids = [];
+                    matches.values.forEach(value => {
+                        const id = index.valueIds.get(value.toLowerCase());
+                        if (id !== undefined) ids.push(id);
+                    });
+                    return Array.from(expandSearchValues(index, ids));
+                }
+                return Array.from(matches.months).flatMap(month => Array.from(appState.monthRows.get(month) || []));
+            }
+        };
+    }
+
+    return null;
+}
+
+/**
+ * Compila a consulta (com cache por texto): árvore, predicado e caminhos de acesso
+ */
+function compileTransactionQuery(text) {
+    const cached = appState.queryCache.get(text);
+    if (cached) return cached;
+
+    const ast = parseTransactionQuery(text);
+    const conjuncts = ast.type === 'and' ? ast.children : [ast];
+    const compiled = {
+        text,
+        ast,
+        predicate: compileQueryPredicate(ast),
+        accessPaths: conjuncts.map(compileQueryAccessPath).filter(Boolean)
+    };
+
+    if (appState.queryCache.size >= QUERY_CACHE_LIMIT) {
+        appState.queryCache.clear();
+    }
+    appState.queryCache.set(text, compiled);
+    return compiled;
+}
+
+/**
+ * Executa uma consulta compilada sobre todas as transações
+ */
+function executeTransactionQuery(compiled) {
+    // Visões salvas ficam materializadas e são mantidas a cada alteração
+    const saved = getSavedViewResults(compiled.text);
+    if (saved) return Array.from(saved);
+
+    return executeTransactionQueryPlan(compiled);
+}
+
+/**
+ * Escolhe o caminho de acesso que examina menos linhas e só então aplica
+ * o predicado; sem caminho útil, varre todas as linhas.
+ */
+function executeTransactionQueryPlan(compiled) {
+    let best = null;
+    let bestCost = appData.transactions.length;
+    compiled.accessPaths.forEach(path => {
+        const cost = path.estimate();
+        if (cost < bestCost) {
+            best = path;
+            bestCost = cost;
         }
+    });
 
-        if (dateTo) {
-            const toDate = new Date(dateTo);
-            toDate.setHours(23, 59, 59, 999); // Fim do dia
-            filteredTransactions = filteredTransactions.filter(transaction => {
-                const transactionDate = new Date(transaction['Data']);
-                return transactionDate <= toDate;
-            });
+    const candidates = best ? best.rows() : appData.transactions;
+    const output = candidates.filter(compiled.predicate);
+
+    debugLog('debug', 'Consulta executada:', {
+        query: compiled.text,
+        plan: best ? best.name : 'varredura',
+        examined: candidates.length,
+        matched: output.length
+    });
+
+    return output;
+}
+
+/**
+ * Mostra (ou esconde, com null) o erro de sintaxe da consulta
+ */
+function showQueryError(message) {
+    const element = document.getElementById('transactionQueryError');
+    if (!element) return;
+    element.textContent = message || '';
+    element.classList.toggle('hidden', !message);
+}
+
+// ==========================================
+// VISÕES SALVAS
+// ==========================================
+
+/**
+ * Visões salvas ({ name, query }) persistidas nas configurações
+ */
+function getSavedViews() {
+    if (!Array.isArray(appData.settings.savedViews)) {
+        appData.settings.savedViews = [];
+    }
+    return appData.settings.savedViews;
+}
+
+/**
+ * Resultado materializado de uma visão salva (Set de transações).
+ * Materializa na primeira consulta; depois é mantido por applyTransactionToSavedViews.
+ * Retorna null se a consulta não pertence a uma visão salva.
+ */
+function getSavedViewResults(queryText) {
+    const materialized = appState.savedViewResults.get(queryText);
+    if (materialized) return materialized.rows;
+    if (!getSavedViews().some(view => view.query === queryText)) return null;
+
+    const compiled = compileTransactionQuery(queryText);
+    const results = {
+        predicate: compiled.predicate,
+        rows: new Set(executeTransactionQueryPlan(compiled))
+    };
+    appState.savedViewResults.set(queryText, results);
+    return results.rows;
+}
+
+/**
+ * Mantém as visões materializadas ao incluir (sign = 1) ou remover (sign = -1) uma transação
+ */
+function applyTransactionToSavedViews(transaction, sign) {
+    appState.savedViewResults.forEach(results => {
+        if (sign < 0) {
+            results.rows.delete(transaction);
+        } else if (results.predicate(transaction)) {
+            results.rows.add(transaction);
         }
+    });
+}
 
-        // Ordenação
-        filteredTransactions = sortTransactionsArray(filteredTransactions);
+/**
+ * Descarta as visões materializadas (recalculadas sob demanda)
+ */
+function invalidateSavedViewResults() {
+    appState.savedViewResults.clear();
+}
 
-        // Atualiza cache
-        appState.cache.filteredTransactions = filteredTransactions;
+/**
+ * Preenche o seletor de visões salvas com a contagem de cada uma
+ */
+function renderSavedViewOptions() {
+    const select = document.getElementById('savedViewSelect');
+    if (!select) return;
+
+    const currentQuery = (document.getElementById('transactionQuery')?.value || '').trim();
+    select.innerHTML = '<option value="">Visões salvas</option>';
+
+    getSavedViews().forEach(view => {
+        const option = document.createElement('option');
+        option.value = view.name;
+        try {
+            option.textContent = `${view.name} (${getSavedViewResults(view.query).size})`;
+        } catch (error) {
+            option.textContent = `${view.name} (consulta inválida)`;
+        }
+        option.selected = view.query === currentQuery;
+        select.appendChild(option);
+    });
+}
 
-        // Paginação
-        const { page, itemsPerPage } = appData.pagination;
-        const totalItems = filteredTransactions.length;
-        const startIndex = (page - 1) * itemsPerPage;
-        const endIndex = startIndex + itemsPerPage;
-        const paginatedTransactions = filteredTransactions.slice(startIndex, endIndex);
+/**
+ * Aplica uma visão salva (preenche a consulta e filtra)
+ */
+function applySavedView(name) {
+    const view = getSavedViews().find(item => item.name === name);
+    const queryInput = document.getElementById('transactionQuery');
+    if (!view || !queryInput) return;
+
+    queryInput.value = view.query;
+    appData.pagination.page = 1;
+    filterTransactions();
+}
 
-        // Atualiza total para paginação
-        appData.pagination.total = totalItems;
+/**
+ * Salva a consulta atual como visão nomeada (substitui se o nome já existir)
+ */
+async function saveCurrentView() {
+    try {
+        const query = (document.getElementById('transactionQuery')?.value || '').trim();
+        if (!query) {
+            showNotification('Digite uma consulta antes de salvar a visão', 'warning');
+            return;
+        }
+        compileTransactionQuery(query);
 
-        // Renderiza transações
-        renderTransactionsTable(paginatedTransactions);
+        const name = (prompt('Nome da visão:') || '').trim();
+        if (!name) return;
 
-        // Atualiza controles de paginação
-        updatePaginationControls();
+        const views = getSavedViews();
+        const existing = views.find(view => view.name === name);
+        if (existing) {
+            existing.query = query;
+        } else {
+            views.push({ name, query });
+        }
 
-        debugLog('debug', 'Filtros aplicados:', {
-            total: appData.transactions.length,
-            filtered: filteredTransactions.length,
-            paginated: paginatedTransactions.length,
-            page: page
-        });
+        await saveAppData();
+        renderSavedViewOptions();
+        showNotification(`Visão "${name}" salva`, 'success');
 
     } catch (error) {
-        debugLog('error', 'Erro ao filtrar transações:', error);
-        showNotification('Erro ao aplicar filtros', 'error');
+        debugLog('error', 'Erro ao salvar visão:', error);
+        showNotification(`Erro ao salvar visão: ${error.message}`, 'error');
     }
 }
 
 /**
- * Ordena array de transações
+ * Exclui a visão selecionada
  */
-function sortTransactionsArray(transactions) {
-    const { sortColumn, sortDirection } = appData.ui;
+async function deleteSelectedView() {
+    try {
+        const select = document.getElementById('savedViewSelect');
+        const name = select?.value;
+        if (!name) {
+            showNotification('Selecione uma visão para excluir', 'warning');
+            return;
+        }
+        if (!confirm(`Excluir a visão "${name}"?`)) return;
 
-    return transactions.sort((a, b) => {
-        let valueA, valueB;
+        const views = getSavedViews();
+        const index = views.findIndex(view => view.name === name);
+        if (index === -1) return;
+        const [removed] = views.splice(index, 1);
 
-        switch (sortColumn) {
-            case 'Data':
-                valueA = new Date(a['Data']);
-                valueB = new Date(b['Data']);
-                break;
-            case 'value':
-                const entradaA = parseValue(a['Entrada (R$)']);
-                const saidaA = parseValue(a['Saída (R$)']);
-                const entradaB = parseValue(b['Entrada (R$)']);
-                const saidaB = parseValue(b['Saída (R$)']);
+        // Outra visão pode usar a mesma consulta
+        if (!views.some(view => view.query === removed.query)) {
+            appState.savedViewResults.delete(removed.query);
+        }
+
+        await saveAppData();
+        renderSavedViewOptions();
+        showNotification(`Visão "${name}" excluída`, 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro ao excluir visão:', error);
+        showNotification('Erro ao excluir visão', 'error');
+    }
+}
+
+// ==========================================
+// ÍNDICE DE ORDENAÇÃO
+// ==========================================
+
+/**
+ * Comparador de textos para as colunas alfabéticas
+ */
+const SORT_COLLATOR = new Intl.Collator('pt-BR', { sensitivity: 'base', numeric: true });
 
-                valueA = entradaA > 0 ? entradaA : -saidaA;
-                valueB = entradaB > 0 ? entradaB : -saidaB;
-                break;
-            default:
-                valueA = (a[sortColumn] || '').toString().toLowerCase();
-                valueB = (b[sortColumn] || '').toString().toLowerCase();
+/**
+ * Índice de ordenação da versão atual dos dados
+ */
+function getSortIndex() {
+    let index = appState.sortIndex;
+    if (!index || index.version !== appState.dataVersion) {
+        index = {
+            version: appState.dataVersion,
+            keys: new Map(),
+            permutations: new Map(),
+            ranks: new Map()
+        };
+        appState.sortIndex = index;
+    }
+    return index;
+}
+
+/**
+ * Chaves numéricas normalizadas de uma coluna, por posição da transação:
+ * dia epoch para datas, centavos com sinal para valores e posição na
+ * ordem do Intl.Collator para textos.
+ */
+function getSortKeys(column) {
+    const index = getSortIndex();
+    let keys = index.keys.get(column);
+    if (keys) return keys;
+
+    const transactions = appData.transactions;
+    keys = new Float64Array(transactions.length);
+
+    switch (column) {
+        case 'Data':
+            transactions.forEach((transaction, i) => {
+                const day = toEpochDay(transaction['Data']);
+                keys[i] = isNaN(day) ? -Infinity : day;
+            });
+            break;
+        case 'value':
+            transactions.forEach((transaction, i) => {
+                const income = toCents(transaction['Entrada (R$)']);
+                keys[i] = income > 0 ? income : -toCents(transaction['Saída (R$)']);
+            });
+            break;
+        default: {
+            // Ordena apenas os valores distintos; cada linha recebe o rank do seu valor
+            const ranks = new Map();
+            transactions.forEach(transaction => {
+                ranks.set((transaction[column] || '').toString(), 0);
+            });
+            Array.from(ranks.keys())
+                .sort(SORT_COLLATOR.compare)
+                .forEach((value, rank) => ranks.set(value, rank));
+
+            transactions.forEach((transaction, i) => {
+                keys[i] = ranks.get((transaction[column] || '').toString());
+            });
         }
+    }
 
-        let comparison = 0;
-        if (valueA > valueB) comparison = 1;
-        if (valueA < valueB) comparison = -1;
+    index.keys.set(column, keys);
+    return keys;
+}
 
-        return sortDirection === 'desc' ? -comparison : comparison;
+/**
+ * Permutação (posições em appData.transactions) ordenada por coluna e direção.
+ * A direção oposta, se já calculada, é apenas invertida.
+ */
+function getSortPermutation(column, direction) {
+    const index = getSortIndex();
+    const cacheKey = `${column}|${direction}`;
+    let permutation = index.permutations.get(cacheKey);
+    if (permutation) return permutation;
+
+    const opposite = index.permutations.get(`${column}|${direction === 'asc' ? 'desc' : 'asc'}`);
+    if (opposite) {
+        permutation = opposite.slice().reverse();
+    } else {
+        const keys = getSortKeys(column);
+        permutation = new Int32Array(keys.length);
+        for (let i = 0; i < permutation.length; i++) {
+            permutation[i] = i;
+        }
+        // Empates pela posição original mantêm a ordem determinística
+        permutation.sort((a, b) => (keys[a] - keys[b]) || (a - b));
+        if (direction === 'desc') permutation.reverse();
+    }
+
+    index.permutations.set(cacheKey, permutation);
+    return permutation;
+}
+
+/**
+ * Posição de cada transação na permutação (rank), para ordenar subconjuntos pequenos
+ */
+function getSortRanks(column, direction) {
+    const index = getSortIndex();
+    const cacheKey = `${column}|${direction}`;
+    let ranks = index.ranks.get(cacheKey);
+    if (ranks) return ranks;
+
+    const permutation = getSortPermutation(column, direction);
+    ranks = new Int32Array(permutation.length);
+    permutation.forEach((position, rank) => {
+        ranks[position] = rank;
+    });
+
+    index.ranks.set(cacheKey, ranks);
+    return ranks;
+}
+
+/**
+ * Ordena transações usando o índice de ordenação (retorna um novo array)
+ */
+function sortTransactionsArray(transactions, sortColumn = appData.ui.sortColumn, sortDirection = appData.ui.sortDirection) {
+    const all = appData.transactions;
+    const permutation = getSortPermutation(sortColumn, sortDirection);
+
+    if (transactions === all) {
+        return Array.from(permutation, position => all[position]);
+    }
+
+    const count = transactions.length;
+
+    // Subconjunto pequeno: ordena pelos ranks pré-calculados
+    if (count * Math.log2(count + 1) < all.length) {
+        const ranks = getSortRanks(sortColumn, sortDirection);
+        return transactions
+            .map(transaction => [ranks[getTransactionPosition(transaction.id)], transaction])
+            .sort((a, b) => a[0] - b[0])
+            .map(entry => entry[1]);
+    }
+
+    // Subconjunto grande: percorre a permutação selecionando os membros
+    const selected = new Uint8Array(all.length);
+    transactions.forEach(transaction => {
+        selected[getTransactionPosition(transaction.id)] = 1;
     });
+
+    const result = [];
+    for (const position of permutation) {
+        if (selected[position]) result.push(all[position]);
+    }
+    return result;
 }
 
 /**
@@ -157,7 +1396,7 @@ function renderTransactionsTable(transactions) {
     if (transactions.length === 0) {
         const row = document.createElement('tr');
         row.innerHTML = `
-            <td colspan="7" class="text-center py-12">
+            <td colspan="8" class="text-center py-12">
                 <div class="text-text-secondary">
                     <i data-lucide="inbox" class="w-8 h-8 mx-auto mb-2"></i>
                     <p>Nenhuma transação encontrada</p>
@@ -197,7 +1436,12 @@ function renderTransactionsTable(transactions) {
         const statusClass = status.toLowerCase() === 'conciliado' ? 
             'status-conciliado' : 'status-pendente';
 
+        const isSelected = appState.selection.has(transaction.id) ? 'checked' : '';
+
         row.innerHTML = `
+            <td class="py-3 px-4 text-center">
+                <input type="checkbox" class="transaction-select" data-transaction-id="${transaction.id}" ${isSelected}>
+            </td>
             <td class="py-3 px-4 font-mono text-sm">${date}</td>
             <td class="py-3 px-4">
                 <div class="max-w-xs">
@@ -217,8 +1461,8 @@ function renderTransactionsTable(transactions) {
             <td class="py-3 px-4">
                 <div class="max-w-xs">
                     <p class="text-sm truncate" title="${classification}">${classification}</p>
-                    ${transaction['Classificação Nível 2'] ? 
-                        `<p class="text-xs text-text-secondary truncate">${transaction['Classificação Nível 2']}</p>` : 
+                    ${getClassificationSubtitle(transaction) ? 
+                        `<p class="text-xs text-text-secondary truncate">${getClassificationSubtitle(transaction)}</p>` : 
                         ''}
                 </div>
             </td>
@@ -229,6 +1473,11 @@ function renderTransactionsTable(transactions) {
                             title="Editar transação">
                         <i data-lucide="edit-2" class="w-3 h-3"></i>
                     </button>
+                    <button class="btn btn--sm btn--ghost split-transaction-btn" 
+                            data-transaction-id="${transaction.id}" 
+                            title="Ratear transação">
+                        <i data-lucide="split" class="w-3 h-3"></i>
+                    </button>
                     <button class="btn btn--sm btn--ghost delete-transaction-btn" 
                             data-transaction-id="${transaction.id}" 
                             title="Excluir transação">
@@ -238,15 +1487,322 @@ function renderTransactionsTable(transactions) {
             </td>
         `;
 
-        tbody.appendChild(row);
+        tbody.appendChild(row);
+    });
+
+    // Atualiza ícones
+    if (typeof lucide !== 'undefined') {
+        lucide.createIcons();
+    }
+
+    debugLog('debug', `Tabela renderizada com ${transactions.length} transações`);
+}
+
+// ==========================================
+// TABELA VIRTUALIZADA (ROLAGEM CONTÍNUA)
+// ==========================================
+
+/**
+ * Altura padrão de uma linha virtualizada (px); medida na criação do pool
+ */
+const VIRTUAL_ROW_HEIGHT = 64;
+
+/**
+ * Linhas extras mantidas acima e abaixo da área visível
+ */
+const VIRTUAL_BUFFER_ROWS = 8;
+
+/**
+ * Renderiza a lista filtrada mantendo no DOM apenas as linhas visíveis
+ */
+function renderVirtualTransactionsTable(transactions) {
+    const tbody = document.getElementById('transactionsTableBody');
+    const container = document.getElementById('transactionsScroll');
+    if (!tbody || !container) {
+        debugLog('warn', 'Container da tabela virtualizada não encontrado');
+        return;
+    }
+
+    if (transactions.length === 0) {
+        destroyVirtualTable();
+        renderTransactionsTable([]);
+        updateVirtualPaginationInfo(0, 0, 0);
+        return;
+    }
+
+    let state = appState.virtualTable;
+    if (!state || state.tbody !== tbody || !tbody.contains(state.topSpacer)) {
+        state = createVirtualTable(tbody, container);
+    }
+
+    state.transactions = transactions;
+
+    // Limpa os controles de paginação, que não se aplicam a este modo
+    const controlsElement = document.getElementById('paginationControls');
+    if (controlsElement) controlsElement.innerHTML = '';
+
+    updateVirtualWindow(true);
+}
+
+/**
+ * Prepara o tbody para o modo virtualizado (espaçadores + pool vazio)
+ */
+function createVirtualTable(tbody, container) {
+    tbody.innerHTML = '';
+
+    const topSpacer = createVirtualSpacer();
+    const bottomSpacer = createVirtualSpacer();
+    tbody.appendChild(topSpacer);
+    tbody.appendChild(bottomSpacer);
+
+    container.classList.add('virtual-scroll');
+    if (!container.dataset.virtualScrollBound) {
+        container.addEventListener('scroll', scheduleVirtualWindowUpdate, { passive: true });
+        container.dataset.virtualScrollBound = 'true';
+    }
+
+    appState.virtualTable = {
+        tbody,
+        container,
+        topSpacer,
+        bottomSpacer,
+        rows: [],
+        spare: [],
+        transactions: [],
+        first: -1,
+        rowHeight: VIRTUAL_ROW_HEIGHT,
+        frame: null
+    };
+
+    return appState.virtualTable;
+}
+
+/**
+ * Sai do modo virtualizado
+ */
+function destroyVirtualTable() {
+    const state = appState.virtualTable;
+    if (!state) return;
+
+    if (state.frame) cancelAnimationFrame(state.frame);
+    state.container.classList.remove('virtual-scroll');
+    appState.virtualTable = null;
+}
+
+/**
+ * Linha espaçadora que ocupa a altura das linhas fora da janela
+ */
+function createVirtualSpacer() {
+    const row = document.createElement('tr');
+    row.className = 'virtual-spacer';
+    row.innerHTML = '<td colspan="8"></td>';
+    return row;
+}
+
+/**
+ * Cria uma linha reutilizável com referências diretas às células
+ */
+function createVirtualRow() {
+    const row = document.createElement('tr');
+    row.className = 'hover:bg-secondary virtual-row';
+    row.innerHTML = `
+        <td class="py-3 px-4 text-center">
+            <input type="checkbox" class="transaction-select">
+        </td>
+        <td class="py-3 px-4 font-mono text-sm" data-field="date"></td>
+        <td class="py-3 px-4">
+            <div class="max-w-xs">
+                <p class="font-medium truncate" data-field="description"></p>
+                <p class="text-xs text-text-secondary truncate" data-field="notes"></p>
+            </div>
+        </td>
+        <td class="py-3 px-4 text-sm text-text-secondary" data-field="bank"></td>
+        <td class="py-3 px-4 text-right">
+            <span class="font-semibold" data-field="amount"></span>
+        </td>
+        <td class="py-3 px-4 text-center">
+            <span class="status" data-field="status"></span>
+        </td>
+        <td class="py-3 px-4">
+            <div class="max-w-xs">
+                <p class="text-sm truncate" data-field="classification"></p>
+                <p class="text-xs text-text-secondary truncate" data-field="classification2"></p>
+            </div>
+        </td>
+        <td class="py-3 px-4 text-center">
+            <div class="flex items-center justify-center gap-1">
+                <button class="btn btn--sm btn--ghost edit-transaction-btn" title="Editar transação">
+                    <i data-lucide="edit-2" class="w-3 h-3"></i>
+                </button>
+                <button class="btn btn--sm btn--ghost split-transaction-btn" title="Ratear transação">
+                    <i data-lucide="split" class="w-3 h-3"></i>
+                </button>
+                <button class="btn btn--sm btn--ghost delete-transaction-btn" title="Excluir transação">
+                    <i data-lucide="trash-2" class="w-3 h-3"></i>
+                </button>
+            </div>
+        </td>
+    `;
+
+    row._fields = {};
+    row.querySelectorAll('[data-field]').forEach(element => {
+        row._fields[element.dataset.field] = element;
+    });
+    row._checkbox = row.querySelector('.transaction-select');
+    row._editBtn = row.querySelector('.edit-transaction-btn');
+    row._splitBtn = row.querySelector('.split-transaction-btn');
+    row._deleteBtn = row.querySelector('.delete-transaction-btn');
+    row._transaction = null;
+
+    return row;
+}
+
+/**
+ * Atualiza o conteúdo de uma linha reciclada (apenas textos e classes)
+ */
+function patchVirtualRow(row, transaction, index) {
+    row.classList.toggle('virtual-row--even', index % 2 === 1);
+    row._checkbox.checked = appState.selection.has(transaction.id);
+    if (row._transaction === transaction && row._version === appState.dataVersion) return;
+
+    const fields = row._fields;
+    const description = transaction['Descrição Original'] ||
+                      transaction['Favorecido / Pagador Padronizado'] ||
+                      'Descrição não informada';
+    const income = parseValue(transaction['Entrada (R$)']);
+    const expense = parseValue(transaction['Saída (R$)']);
+    const status = transaction['Status Conciliação'] || 'Pendente';
+    const classification = transaction['Classificação Nível 1'] || 'Não classificado';
+    const isIncome = income > 0;
+
+    fields.date.textContent = formatDate(transaction['Data']);
+    fields.description.textContent = description;
+    fields.description.title = description;
+    fields.notes.textContent = transaction['Notas'] || '';
+    fields.bank.textContent = transaction['Banco Origem/Destino'] || 'N/A';
+    fields.amount.textContent = `${isIncome ? '+' : '-'} ${formatCurrency(isIncome ? income : expense)}`;
+    fields.amount.className = `font-semibold ${isIncome ? 'money-positive' : 'money-negative'}`;
+    fields.status.textContent = status;
+    fields.status.className = `status ${status.toLowerCase() === 'conciliado' ? 'status-conciliado' : 'status-pendente'}`;
+    fields.classification.textContent = classification;
+    fields.classification.title = classification;
+    fields.classification2.textContent = getClassificationSubtitle(transaction);
+
+    row._checkbox.dataset.transactionId = transaction.id;
+    row._editBtn.dataset.transactionId = transaction.id;
+    row._splitBtn.dataset.transactionId = transaction.id;
+    row._deleteBtn.dataset.transactionId = transaction.id;
+    row._transaction = transaction;
+    row._version = appState.dataVersion;
+}
+
+/**
+ * Ajusta o pool de linhas ao tamanho necessário, reaproveitando elementos
+ */
+function resizeVirtualPool(state, size) {
+    const created = [];
+
+    while (state.rows.length < size) {
+        const row = state.spare.pop() || createVirtualRow();
+        if (!row._iconsReady) created.push(row);
+        row._transaction = null;
+        state.tbody.insertBefore(row, state.bottomSpacer);
+        state.rows.push(row);
+    }
+
+    while (state.rows.length > size) {
+        const row = state.rows.pop();
+        row.remove();
+        state.spare.push(row);
+    }
+
+    if (created.length > 0) {
+        // Ícones são criados apenas quando novas linhas entram no pool
+        if (typeof lucide !== 'undefined') {
+            lucide.createIcons();
+        }
+        created.forEach(row => { row._iconsReady = true; });
+
+        const measured = state.rows[0].getBoundingClientRect().height;
+        if (measured > 0) state.rowHeight = measured;
+    }
+}
+
+/**
+ * Agenda a atualização da janela para o próximo quadro
+ */
+function scheduleVirtualWindowUpdate() {
+    const state = appState.virtualTable;
+    if (!state || state.frame) return;
+
+    state.frame = requestAnimationFrame(() => {
+        state.frame = null;
+        updateVirtualWindow(false);
     });
+}
 
-    // Atualiza ícones
-    if (typeof lucide !== 'undefined') {
-        lucide.createIcons();
+/**
+ * Posiciona a janela de linhas de acordo com a rolagem atual
+ */
+function updateVirtualWindow(force) {
+    const state = appState.virtualTable;
+    if (!state) return;
+
+    const { container, transactions } = state;
+    const total = transactions.length;
+    const viewport = container.clientHeight || 600;
+    const poolSize = Math.min(total, Math.ceil(viewport / state.rowHeight) + VIRTUAL_BUFFER_ROWS * 2);
+
+    if (poolSize !== state.rows.length) {
+        resizeVirtualPool(state, poolSize);
+        force = true;
     }
 
-    debugLog('debug', `Tabela renderizada com ${transactions.length} transações`);
+    const maxFirst = Math.max(0, total - poolSize);
+    const first = Math.min(maxFirst, Math.max(0, Math.floor(container.scrollTop / state.rowHeight) - VIRTUAL_BUFFER_ROWS));
+    const delta = first - state.first;
+
+    if (force || state.first < 0 || Math.abs(delta) >= poolSize) {
+        state.rows.forEach((row, i) => patchVirtualRow(row, transactions[first + i], first + i));
+    } else if (delta > 0) {
+        // Rolagem para baixo: linhas do topo vão para o fim
+        for (let i = 0; i < delta; i++) {
+            const row = state.rows.shift();
+            state.tbody.insertBefore(row, state.bottomSpacer);
+            state.rows.push(row);
+        }
+        for (let i = poolSize - delta; i < poolSize; i++) {
+            patchVirtualRow(state.rows[i], transactions[first + i], first + i);
+        }
+    } else if (delta < 0) {
+        // Rolagem para cima: linhas do fim vão para o topo
+        for (let i = 0; i < -delta; i++) {
+            const row = state.rows.pop();
+            state.tbody.insertBefore(row, state.topSpacer.nextSibling);
+            state.rows.unshift(row);
+        }
+        for (let i = 0; i < -delta; i++) {
+            patchVirtualRow(state.rows[i], transactions[first + i], first + i);
+        }
+    }
+
+    state.topSpacer.firstChild.style.height = `${first * state.rowHeight}px`;
+    state.bottomSpacer.firstChild.style.height = `${(total - first - poolSize) * state.rowHeight}px`;
+    state.first = first;
+
+    const visibleFirst = Math.min(total, Math.floor(container.scrollTop / state.rowHeight) + 1);
+    const visibleLast = Math.min(total, visibleFirst + Math.floor(viewport / state.rowHeight));
+    updateVirtualPaginationInfo(visibleFirst, visibleLast, total);
+}
+
+/**
+ * Informa o intervalo visível no rodapé da tabela
+ */
+function updateVirtualPaginationInfo(start, end, total) {
+    const infoElement = document.getElementById('paginationInfo');
+    if (infoElement) {
+        infoElement.textContent = `${start}-${end} de ${total} transações`;
+    }
 }
 
 /**
@@ -346,7 +1902,14 @@ function changePage(page) {
     if (page > totalPages) return;
 
     appData.pagination.page = page;
-    filterTransactions();
+
+    // Troca de página é só um recorte do conjunto já filtrado e ordenado
+    if (appState.cache.filteredTransactions && appState.filterPipeline &&
+        appState.filterPipeline.version === appState.dataVersion) {
+        renderTransactionsPage();
+    } else {
+        filterTransactions();
+    }
 }
 
 /**
@@ -406,8 +1969,10 @@ function clearAllFilters() {
     const statusFilter = document.getElementById('statusFilter');
     const dateFromFilter = document.getElementById('dateFromFilter');
     const dateToFilter = document.getElementById('dateToFilter');
+    const queryInput = document.getElementById('transactionQuery');
 
     if (searchInput) searchInput.value = '';
+    if (queryInput) queryInput.value = '';
     if (statusFilter) statusFilter.value = 'all';
     if (dateFromFilter) dateFromFilter.value = '';
     if (dateToFilter) dateToFilter.value = '';
@@ -421,11 +1986,480 @@ function clearAllFilters() {
     showNotification('Filtros limpos', 'success');
 }
 
+// ==========================================
+// CONTAGENS POR FACETA (BITMAPS)
+// ==========================================
+
+/**
+ * Facetas exibidas ao lado dos filtros
+ */
+const FACET_DIMENSIONS = [
+    { key: 'status', label: 'Status' },
+    { key: 'bank', label: 'Banco' },
+    { key: 'level1', label: 'Classificação N1' },
+    { key: 'month', label: 'Mês' }
+];
+
+/**
+ * Folga de capacidade dos bitmaps para inclusões sem reconstrução
+ */
+const FACET_CAPACITY_SLACK = 1024;
+
+/**
+ * Posição da transação gravada no próprio objeto. Chaves Symbol não são
+ * serializadas por JSON.stringify, e ler a posição assim é bem mais barato
+ * que consultar o Map de ids ao montar o bitmap do resultado.
+ */
+const FACET_POSITION = Symbol('facetPosition');
+
+/**
+ * Valores de uma transação em cada faceta
+ */
+function getFacetValues(transaction) {
+    const coordinates = getCubeCoordinates(transaction);
+    return {
+        status: coordinates.status || 'Pendente',
+        bank: coordinates.bank,
+        level1: coordinates.level1,
+        month: coordinates.month
+    };
+}
+
+/**
+ * Quantidade de bits ligados em um inteiro de 32 bits
+ */
+function popcount32(word) {
+    word -= (word >>> 1) & 0x55555555;
+    word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+    return (((word + (word >>> 4)) & 0x0F0F0F0F) * 0x01010101) >>> 24;
+}
+
+/**
+ * Índice de bitmaps por valor de faceta (bit = posição da transação no array).
+ * Construído sob demanda e mantido por applyTransactionToFacets.
+ */
+function getFacetIndex() {
+    if (appState.facetIndex) return appState.facetIndex;
+
+    const transactions = appData.transactions;
+    const words = Math.ceil((transactions.length + FACET_CAPACITY_SLACK) / 32);
+    const index = { words, facets: new Map() };
+    FACET_DIMENSIONS.forEach(dimension => index.facets.set(dimension.key, new Map()));
+
+    for (let position = 0; position < transactions.length; position++) {
+        transactions[position][FACET_POSITION] = position;
+        setFacetBits(index, getFacetValues(transactions[position]), position, true);
+    }
+
+    appState.facetIndex = index;
+    return index;
+}
+
+/**
+ * Liga ou desliga o bit de uma posição no bitmap de cada valor
+ */
+function setFacetBits(index, values, position, on) {
+    const word = position >>> 5;
+    const mask = 1 << (position & 31);
+
+    index.facets.forEach((bitmaps, key) => {
+        let bits = bitmaps.get(values[key]);
+        if (!bits) {
+            if (!on) return;
+            bits = new Uint32Array(index.words);
+            bitmaps.set(values[key], bits);
+        }
+        if (on) bits[word] |= mask;
+        else bits[word] &= ~mask;
+    });
+}
+
+/**
+ * Mantém os bitmaps ao incluir (sign = 1) ou remover (sign = -1) uma transação.
+ * Se as posições mudaram ou a capacidade acabou, o índice é descartado.
+ */
+function applyTransactionToFacets(transaction, sign) {
+    const index = appState.facetIndex;
+    if (!index) return;
+
+    if (appState.idIndex.positionsDirty) {
+        invalidateFacetIndex();
+        return;
+    }
+
+    const position = getTransactionPosition(transaction.id);
+    if (position < 0 || position >= index.words * 32) {
+        invalidateFacetIndex();
+        return;
+    }
+
+    transaction[FACET_POSITION] = position;
+    setFacetBits(index, getFacetValues(transaction), position, sign > 0);
+}
+
+/**
+ * Descarta os bitmaps de facetas (reconstruídos sob demanda)
+ */
+function invalidateFacetIndex() {
+    appState.facetIndex = null;
+    appState.facetResult = null;
+}
+
+/**
+ * Bitmap do resultado filtrado atual (em cache pelo array e pela versão dos dados)
+ */
+function getFacetResultBits(index, transactions) {
+    const cached = appState.facetResult;
+    if (cached && cached.index === index && cached.transactions === transactions &&
+        cached.version === appState.dataVersion) {
+        return cached.bits;
+    }
+
+    const bits = new Uint32Array(index.words);
+    if (transactions === appData.transactions) {
+        bits.fill(0xFFFFFFFF, 0, transactions.length >>> 5);
+        for (let position = transactions.length & ~31; position < transactions.length; position++) {
+            bits[position >>> 5] |= 1 << (position & 31);
+        }
+    } else {
+        const all = appData.transactions;
+        for (const transaction of transactions) {
+            // Posição gravada pode estar obsoleta (cópias, compactação): confirma no array
+            let position = transaction[FACET_POSITION];
+            if (all[position] !== transaction) position = getTransactionPosition(transaction.id);
+            if (position >= 0) bits[position >>> 5] |= 1 << (position & 31);
+        }
+    }
+
+    appState.facetResult = { index, transactions, version: appState.dataVersion, bits };
+    return bits;
+}
+
+/**
+ * Contagem de cada valor de faceta dentro do resultado (AND + popcount)
+ */
+function computeFacetCounts(transactions) {
+    const index = getFacetIndex();
+    const resultBits = getFacetResultBits(index, transactions);
+    const counts = {};
+
+    index.facets.forEach((bitmaps, key) => {
+        const values = [];
+        bitmaps.forEach((bits, value) => {
+            let count = 0;
+            for (let word = 0; word < bits.length; word++) {
+                const both = bits[word] & resultBits[word];
+                if (both !== 0) count += popcount32(both);
+            }
+            if (count > 0) values.push({ value, count });
+        });
+
+        // Meses em ordem cronológica decrescente; demais facetas por contagem
+        values.sort(key === 'month'
+            ? (a, b) => b.value.localeCompare(a.value)
+            : (a, b) => b.count - a.count || a.value.localeCompare(b.value));
+        counts[key] = values;
+    });
+
+    return counts;
+}
+
+/**
+ * Atualiza o painel de facetas para o resultado filtrado atual
+ */
+function updateTransactionFacets(transactions) {
+    const container = document.getElementById('transactionFacets');
+    if (!container) return;
+
+    const start = performance.now();
+    const counts = computeFacetCounts(transactions);
+    const fragment = document.createDocumentFragment();
+
+    FACET_DIMENSIONS.forEach(dimension => {
+        const group = document.createElement('div');
+        group.className = 'facet-group';
+
+        const title = document.createElement('h4');
+        title.className = 'facet-group__title';
+        title.textContent = dimension.label;
+        group.appendChild(title);
+
+        counts[dimension.key].forEach(({ value, count }) => {
+            const item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'facet-item';
+            item.dataset.facet = dimension.key;
+            item.dataset.value = value;
+
+            const label = document.createElement('span');
+            label.textContent = dimension.key === 'month' && value ? formatMonthLabel(value) : (value || 'Não informado');
+            const badge = document.createElement('span');
+            badge.className = 'facet-item__count';
+            badge.textContent = count.toLocaleString('pt-BR');
+
+            item.append(label, badge);
+            group.appendChild(item);
+        });
+
+        fragment.appendChild(group);
+    });
+
+    container.replaceChildren(fragment);
+
+    debugLog('debug', 'Facetas atualizadas:', {
+        rows: transactions.length,
+        ms: Math.round((performance.now() - start) * 100) / 100
+    });
+}
+
+/**
+ * Aplica o valor de faceta clicado: status vai para o seletor,
+ * as demais facetas viram termos da consulta
+ */
+function applyFacetFilter(facet, value) {
+    if (facet === 'status') {
+        const statusFilter = document.getElementById('statusFilter');
+        if (statusFilter) statusFilter.value = value;
+    } else {
+        const queryInput = document.getElementById('transactionQuery');
+        if (!queryInput) return;
+
+        const field = { bank: 'banco', level1: 'nivel1', month: 'mes' }[facet];
+        const term = !value ? `sem:${field}` : facet === 'month' ? `mes:${value}` : `${field}="${value.replace(/"/g, '')}"`;
+        queryInput.value = queryInput.value.trim() ? `${queryInput.value.trim()} ${term}` : term;
+    }
+
+    appData.pagination.page = 1;
+    filterTransactions();
+}
+
+// ==========================================
+// SELEÇÃO MÚLTIPLA E AÇÕES EM LOTE
+// ==========================================
+
+/**
+ * Marca ou desmarca uma transação
+ */
+function toggleTransactionSelection(transactionId, selected) {
+    if (selected) {
+        appState.selection.add(transactionId);
+    } else {
+        appState.selection.delete(transactionId);
+    }
+    updateBulkActionsBar();
+}
+
+/**
+ * Marca ou desmarca todas as transações da página atual
+ */
+function selectCurrentPage(selected) {
+    document.querySelectorAll('#transactionsTableBody .transaction-select').forEach(checkbox => {
+        const transactionId = checkbox.dataset.transactionId;
+        if (!transactionId) return;
+        checkbox.checked = selected;
+        if (selected) {
+            appState.selection.add(transactionId);
+        } else {
+            appState.selection.delete(transactionId);
+        }
+    });
+    updateBulkActionsBar();
+}
+
+/**
+ * Seleciona todas as transações que atendem aos filtros atuais
+ */
+function selectAllMatchingFilter() {
+    const filtered = appState.cache.filteredTransactions || [];
+    filtered.forEach(transaction => appState.selection.add(transaction.id));
+    syncSelectionCheckboxes();
+    updateBulkActionsBar();
+}
+
+/**
+ * Limpa a seleção
+ */
+function clearTransactionSelection() {
+    appState.selection.clear();
+    syncSelectionCheckboxes();
+    updateBulkActionsBar();
+}
+
+/**
+ * Atualiza as caixas de seleção visíveis sem re-renderizar a tabela
+ */
+function syncSelectionCheckboxes() {
+    document.querySelectorAll('#transactionsTableBody .transaction-select').forEach(checkbox => {
+        checkbox.checked = appState.selection.has(checkbox.dataset.transactionId);
+    });
+}
+
+/**
+ * Transações selecionadas que ainda existem (descarta ids removidos)
+ */
+function getSelectedTransactions() {
+    const selected = [];
+    appState.selection.forEach(transactionId => {
+        const transaction = getTransactionById(transactionId);
+        if (transaction) {
+            selected.push(transaction);
+        } else {
+            appState.selection.delete(transactionId);
+        }
+    });
+    return selected;
+}
+
+/**
+ * Mostra a barra de ações em lote com a contagem atual
+ */
+function updateBulkActionsBar() {
+    const bar = document.getElementById('bulkTransactionActions');
+    if (!bar) return;
+
+    const count = getSelectedTransactions().length;
+    const filteredCount = (appState.cache.filteredTransactions || []).length;
+
+    bar.classList.toggle('hidden', count === 0);
+
+    const countEl = document.getElementById('bulkSelectedCount');
+    if (countEl) countEl.textContent = `${count} selecionada(s)`;
+
+    const selectAllBtn = document.getElementById('bulkSelectAllMatching');
+    if (selectAllBtn) {
+        selectAllBtn.textContent = `Selecionar todas do filtro (${filteredCount})`;
+        selectAllBtn.classList.toggle('hidden', count >= filteredCount);
+    }
+
+    // Opções de classificação preenchidas na primeira exibição (ou se o plano de contas mudou)
+    const level1Select = document.getElementById('bulkLevel1');
+    if (count > 0 && level1Select && level1Select._chartVersion !== appState.chartOfAccountsVersion) {
+        fillClassificationLevel1(level1Select, 'Classificação nível 1...');
+    }
+}
+
+/**
+ * Cascata dos selects de reclassificação em lote
+ */
+function updateBulkClassificationOptions(level) {
+    const level1Select = document.getElementById('bulkLevel1');
+    const level2Select = document.getElementById('bulkLevel2');
+    const level3Select = document.getElementById('bulkLevel3');
+    if (!level1Select || !level2Select || !level3Select) return;
+
+    if (level === 1) {
+        level2Select.innerHTML = '<option value="">Nível 2...</option>';
+        level2Select.disabled = true;
+        if (level1Select.value) updateLevel2Options(level1Select.value, level2Select);
+    }
+
+    level3Select.innerHTML = '<option value="">Nível 3...</option>';
+    level3Select.disabled = true;
+    if (level1Select.value && level2Select.value) {
+        updateLevel3Options(level1Select.value, level2Select.value, level3Select);
+    }
+}
+
+/**
+ * Atualiza telas após uma operação em lote (uma única renderização)
+ */
+function refreshAfterBulkChange() {
+    updateTransactionCount();
+    filterTransactions();
+    updateBulkActionsBar();
+
+    if (appData.ui.currentTab === 'dashboard') {
+        updateKPIs();
+        updateCharts();
+    }
+}
+
+/**
+ * Exclui todas as transações selecionadas
+ */
+async function bulkDeleteSelected() {
+    try {
+        const selected = getSelectedTransactions();
+        if (selected.length === 0) return;
+
+        if (!confirm(`Excluir ${selected.length} transação(ões)? Esta ação não pode ser desfeita.`)) return;
+
+        const removed = removeTransactions(selected.map(transaction => transaction.id));
+        appState.selection.clear();
+
+        await saveAppData();
+        refreshAfterBulkChange();
+
+        showNotification(`${removed} transação(ões) excluída(s)`, 'success');
+        debugLog('info', 'Exclusão em lote:', removed);
+
+    } catch (error) {
+        debugLog('error', 'Erro na exclusão em lote:', error);
+        showNotification('Erro ao excluir transações', 'error');
+    }
+}
+
+/**
+ * Altera o status de conciliação das transações selecionadas
+ */
+async function bulkSetStatus(status) {
+    try {
+        const selected = getSelectedTransactions();
+        if (selected.length === 0 || !status) return;
+
+        const updated = updateTransactionsBatch(selected, { 'Status Conciliação': status });
+
+        await saveAppData();
+        refreshAfterBulkChange();
+
+        showNotification(`${updated} transação(ões) marcada(s) como ${status}`, 'success');
+        debugLog('info', 'Status alterado em lote:', { status, updated });
+
+    } catch (error) {
+        debugLog('error', 'Erro ao alterar status em lote:', error);
+        showNotification('Erro ao alterar status', 'error');
+    }
+}
+
+/**
+ * Reclassifica as transações selecionadas
+ */
+async function bulkReclassify() {
+    try {
+        const selected = getSelectedTransactions();
+        const level1 = document.getElementById('bulkLevel1')?.value || '';
+        const level2 = document.getElementById('bulkLevel2')?.value || '';
+        const level3 = document.getElementById('bulkLevel3')?.value || '';
+
+        if (selected.length === 0) return;
+        if (!level1) {
+            showNotification('Selecione pelo menos a classificação de nível 1', 'warning');
+            return;
+        }
+
+        const updated = updateTransactionsBatch(selected, {
+            'Classificação Nível 1': level1,
+            'Classificação Nível 2': level2,
+            'Classificação Nível 3': level3
+        });
+
+        await saveAppData();
+        refreshAfterBulkChange();
+
+        showNotification(`${updated} transação(ões) reclassificada(s)`, 'success');
+        debugLog('info', 'Reclassificação em lote:', { level1, level2, level3, updated });
+
+    } catch (error) {
+        debugLog('error', 'Erro na reclassificação em lote:', error);
+        showNotification('Erro ao reclassificar transações', 'error');
+    }
+}
+
 /**
  * Edita uma transação
  */
 function editTransaction(transactionId) {
-    const transaction = appData.transactions.find(t => t.id === transactionId);
+    const transaction = getTransactionById(transactionId);
     if (!transaction) {
         showNotification('Transação não encontrada', 'error');
         return;
@@ -436,13 +2470,70 @@ function editTransaction(transactionId) {
     // Por enquanto, mostra um modal simples (implementação básica)
     const description = prompt('Descrição:', transaction['Descrição Original'] || '');
     if (description !== null && description.trim() !== '') {
-        transaction['Descrição Original'] = description.trim();
+        updateTransactionFields(transaction, { 'Descrição Original': description.trim() });
         saveAppData();
         filterTransactions(); // Recarrega tabela
         showNotification('Transação atualizada com sucesso', 'success');
     }
 }
 
+/**
+ * Segunda linha da coluna de classificação (nível 2 ou resumo do rateio)
+ */
+function getClassificationSubtitle(transaction) {
+    if (Array.isArray(transaction.allocations) && transaction.allocations.length > 0) {
+        return `Rateada em ${transaction.allocations.length} partes`;
+    }
+    return transaction['Classificação Nível 2'] || '';
+}
+
+/**
+ * Rateia uma transação entre várias classificações e centros de custo.
+ * Cada parte é "código | centro de custo | valor"; a soma deve fechar com o valor da linha.
+ */
+function splitTransaction(transactionId) {
+    const transaction = getTransactionById(transactionId);
+    if (!transaction) {
+        showNotification('Transação não encontrada', 'error');
+        return;
+    }
+
+    // Sem rateio ainda: sugere a classificação atual com o valor inteiro
+    const account = transaction['Classificação Nível 3'] || transaction['Classificação Nível 2'] ||
+        transaction['Classificação Nível 1'];
+    const current = formatAllocations(transaction.allocations) || (account
+        ? formatAllocations([[getAccountCode(account), transaction['Centro de Custo'] || '', getTransactionAmountCents(transaction)]])
+        : '');
+
+    const text = prompt('Rateio (código | centro de custo | valor; ...). Deixe vazio para desfazer:', current);
+    if (text === null) return;
+
+    try {
+        const allocations = parseAllocationsText(text);
+
+        if (allocations.length === 0) {
+            if (!transaction.allocations) return;
+            updateTransactionFields(transaction, { allocations: null });
+            showNotification('Rateio removido', 'success');
+        } else {
+            const errors = validateAllocations(transaction, allocations);
+            if (errors.length > 0) {
+                showNotification(errors[0], 'error');
+                return;
+            }
+            updateTransactionFields(transaction, { allocations });
+            showNotification(`Transação rateada em ${allocations.length} partes`, 'success');
+        }
+
+        saveAppData();
+        filterTransactions(); // Recarrega tabela
+
+    } catch (error) {
+        debugLog('error', 'Erro ao ratear transação:', error);
+        showNotification(error.message, 'error');
+    }
+}
+
 /**
  * Confirma exclusão de transação
  */
@@ -457,13 +2548,11 @@ function confirmDeleteTransaction(transactionId) {
  */
 function deleteTransaction(transactionId) {
     try {
-        const index = appData.transactions.findIndex(t => t.id === transactionId);
-        if (index === -1) {
+        if (removeTransactions([transactionId]) === 0) {
             showNotification('Transação não encontrada', 'error');
             return;
         }
 
-        appData.transactions.splice(index, 1);
         saveAppData();
 
         // Atualiza interfaces
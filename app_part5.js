@@ -1,8 +1,17 @@
-
 // ==========================================
 // SISTEMA DE CONCILIAÇÃO
 // ==========================================
 
+/**
+ * Altura padrão de um card da fila (px, incluindo o espaçamento); medida na criação do pool
+ */
+const RECONCILIATION_CARD_HEIGHT = 420;
+
+/**
+ * Cards extras mantidos acima e abaixo da área visível
+ */
+const RECONCILIATION_BUFFER_CARDS = 2;
+
 /**
  * Carrega a tela de conciliação
  */
@@ -10,11 +19,14 @@ async function loadReconciliation() {
     try {
         debugLog('info', 'Carregando sistema de conciliação...');
 
-        const pendingTransactions = appData.transactions.filter(t => 
-            (t['Status Conciliação'] || '').toLowerCase() === 'pendente'
-        );
+        const pendingTransactions = getPendingTransactions();
 
         renderReconciliationList(pendingTransactions);
+        updateReconciliationProgress();
+        updateClassifierStatus();
+
+        // Sugestões do classificador chegam de forma assíncrona
+        refreshClassifierSuggestions();
 
         debugLog('info', `Conciliação carregada: ${pendingTransactions.length} pendentes`);
 
@@ -25,41 +37,71 @@ async function loadReconciliation() {
 }
 
 /**
- * Renderiza lista de transações para conciliação
+ * Renderiza a fila de conciliação.
+ * Só os cards visíveis existem no DOM; ao rolar, os mesmos cards
+ * (com seus selects e campos) são reaproveitados para outras transações.
  */
 function renderReconciliationList(transactions) {
     const container = document.getElementById('reconciliationList');
     if (!container) return;
 
+    destroyReconciliationQueue();
     container.innerHTML = '';
 
     if (transactions.length === 0) {
-        container.innerHTML = `
-            <div class="card text-center py-12">
-                <div class="card__body">
-                    <i data-lucide="check-circle" class="w-16 h-16 text-success mx-auto mb-4"></i>
-                    <h3 class="text-xl font-semibold mb-3">Parabéns! Tudo conciliado</h3>
-                    <p class="text-text-secondary mb-6">
-                        Não há transações pendentes para classificar no momento.
-                    </p>
-                    <button class="btn btn--primary" data-tab="transactions">
-                        <i data-lucide="list" class="w-4 h-4"></i>
-                        Ver Todas as Transações
-                    </button>
-                </div>
-            </div>
-        `;
-
-        if (typeof lucide !== 'undefined') {
-            lucide.createIcons();
-        }
+        renderReconciliationEmptyState(container);
         return;
     }
 
-    transactions.forEach((transaction, index) => {
-        const card = createReconciliationCard(transaction, index);
-        container.appendChild(card);
-    });
+    const topSpacer = document.createElement('div');
+    const bottomSpacer = document.createElement('div');
+    container.appendChild(topSpacer);
+    container.appendChild(bottomSpacer);
+
+    container.classList.add('reconciliation-queue');
+    if (!container.dataset.queueBound) {
+        container.addEventListener('scroll', scheduleReconciliationWindowUpdate, { passive: true });
+        container.addEventListener('input', captureReconciliationDraft);
+        container.addEventListener('change', captureReconciliationDraft);
+        container.addEventListener('keydown', handleReconciliationKeydown);
+        container.dataset.queueBound = 'true';
+    }
+
+    appState.reconciliationQueue = {
+        container,
+        topSpacer,
+        bottomSpacer,
+        items: transactions.slice(),
+        drafts: new Map(),
+        cards: [],
+        spare: [],
+        first: -1,
+        cardHeight: RECONCILIATION_CARD_HEIGHT,
+        frame: null
+    };
+
+    updateReconciliationWindow(true);
+}
+
+/**
+ * Mensagem de fila vazia
+ */
+function renderReconciliationEmptyState(container) {
+    container.innerHTML = `
+        <div class="card text-center py-12">
+            <div class="card__body">
+                <i data-lucide="check-circle" class="w-16 h-16 text-success mx-auto mb-4"></i>
+                <h3 class="text-xl font-semibold mb-3">Parabéns! Tudo conciliado</h3>
+                <p class="text-text-secondary mb-6">
+                    Não há transações pendentes para classificar no momento.
+                </p>
+                <button class="btn btn--primary" data-tab="transactions">
+                    <i data-lucide="list" class="w-4 h-4"></i>
+                    Ver Todas as Transações
+                </button>
+            </div>
+        </div>
+    `;
 
     if (typeof lucide !== 'undefined') {
         lucide.createIcons();
@@ -67,52 +109,58 @@ function renderReconciliationList(transactions) {
 }
 
 /**
- * Cria card de conciliação para uma transação
+ * Descarta o estado da fila virtualizada
+ */
+function destroyReconciliationQueue() {
+    const queue = appState.reconciliationQueue;
+    if (!queue) return;
+
+    if (queue.frame) cancelAnimationFrame(queue.frame);
+    queue.container.classList.remove('reconciliation-queue');
+    appState.reconciliationQueue = null;
+}
+
+/**
+ * Cria um card reutilizável com referências diretas aos campos.
+ * A cascata de classificação é ligada uma única vez, na criação.
  */
-function createReconciliationCard(transaction, index) {
+function createReconciliationCard() {
     const card = document.createElement('div');
     card.className = 'card reconciliation-card';
-    card.dataset.transactionId = transaction.id;
-
-    const date = formatDate(transaction['Data']);
-    const description = transaction['Descrição Original'] || 
-                       transaction['Favorecido / Pagador Padronizado'] || 
-                       'Descrição não informada';
-    const income = parseValue(transaction['Entrada (R$)']);
-    const expense = parseValue(transaction['Saída (R$)']);
-    const amount = income > 0 ? income : expense;
-    const amountClass = income > 0 ? 'money-positive' : 'money-negative';
-    const bank = transaction['Banco Origem/Destino'] || 'Não informado';
+    card.tabIndex = 0;
+    card.dataset.classificationCascade = '';
 
     card.innerHTML = `
         <div class="card__body">
             <!-- Header da transação -->
             <div class="flex items-start justify-between mb-6">
-                <div class="flex-1">
+                <div class="flex-1 min-w-0">
                     <div class="flex items-center gap-2 mb-2">
-                        <span class="text-sm font-medium text-text-secondary">#${index + 1}</span>
+                        <span class="text-sm font-medium text-text-secondary" data-field="position"></span>
                         <span class="text-xs bg-warning/20 text-warning px-2 py-1 rounded">Pendente</span>
+                        <span class="text-xs bg-success/20 text-success px-2 py-1 rounded" data-field="memo" hidden>Memorizado · Enter concilia</span>
                     </div>
-                    <h3 class="text-lg font-semibold mb-2">${description}</h3>
+                    <h3 class="text-lg font-semibold mb-2 truncate" data-field="description"></h3>
                     <div class="grid grid-cols-1 md:grid-cols-3 gap-4 text-sm text-text-secondary">
                         <div>
-                            <strong>Data:</strong> ${date}
+                            <strong>Data:</strong> <span data-field="date"></span>
                         </div>
                         <div>
-                            <strong>Banco:</strong> ${bank}
+                            <strong>Banco:</strong> <span data-field="bank"></span>
                         </div>
                         <div>
-                            <strong>Tipo:</strong> ${income > 0 ? 'Entrada' : 'Saída'}
+                            <strong>Tipo:</strong> <span data-field="type"></span>
                         </div>
                     </div>
                 </div>
                 <div class="text-right ml-4">
-                    <p class="text-2xl font-bold ${amountClass}">
-                        ${formatCurrency(amount)}
-                    </p>
+                    <p class="text-2xl font-bold" data-field="amount"></p>
                 </div>
             </div>
 
+            <!-- Sugestões do classificador -->
+            <div class="flex flex-wrap items-center gap-2 mb-4" data-field="suggestions" hidden></div>
+
             <!-- Formulário de classificação -->
             <div class="space-y-4">
                 <div class="grid grid-cols-1 md:grid-cols-3 gap-4">
@@ -120,25 +168,17 @@ function createReconciliationCard(transaction, index) {
                         <label class="form-label">
                             Classificação Nível 1 <span class="text-error">*</span>
                         </label>
-                        <select class="form-control classification-level-1" 
-                                data-transaction-id="${transaction.id}">
-                            <option value="">Selecione...</option>
-                            ${generateClassificationOptions(1, transaction['Classificação Nível 1'])}
-                        </select>
+                        <select class="form-control classification-level-1"></select>
                     </div>
                     <div>
                         <label class="form-label">Classificação Nível 2</label>
-                        <select class="form-control classification-level-2" 
-                                data-transaction-id="${transaction.id}" 
-                                disabled>
+                        <select class="form-control classification-level-2" disabled>
                             <option value="">Selecione nível 1 primeiro</option>
                         </select>
                     </div>
                     <div>
                         <label class="form-label">Classificação Nível 3</label>
-                        <select class="form-control classification-level-3" 
-                                data-transaction-id="${transaction.id}" 
-                                disabled>
+                        <select class="form-control classification-level-3" disabled>
                             <option value="">Selecione nível 2 primeiro</option>
                         </select>
                     </div>
@@ -148,15 +188,11 @@ function createReconciliationCard(transaction, index) {
                     <div>
                         <label class="form-label">Centro de Custo</label>
                         <input type="text" class="form-control cost-center" 
-                               data-transaction-id="${transaction.id}"
-                               value="${transaction['Centro de Custo'] || ''}" 
                                placeholder="Ex: COMERCIAL, ADMINISTRATIVO">
                     </div>
                     <div>
                         <label class="form-label">Contrato/Nota</label>
                         <input type="text" class="form-control contract-note" 
-                               data-transaction-id="${transaction.id}"
-                               value="${transaction['Contrato/Nota?'] || ''}" 
                                placeholder="Ex: NF 12345, Contrato 001">
                     </div>
                 </div>
@@ -164,34 +200,29 @@ function createReconciliationCard(transaction, index) {
                 <div>
                     <label class="form-label">Notas/Observações</label>
                     <textarea class="form-control transaction-notes" 
-                              data-transaction-id="${transaction.id}"
                               rows="2" 
-                              placeholder="Observações adicionais sobre esta transação">${transaction['Notas'] || ''}</textarea>
+                              placeholder="Observações adicionais sobre esta transação"></textarea>
                 </div>
             </div>
 
             <!-- Ações -->
             <div class="flex items-center justify-between mt-6 pt-4 border-t border-border">
                 <div class="flex items-center gap-3">
-                    <button class="btn btn--outline btn--sm auto-classify-btn" 
-                            data-transaction-id="${transaction.id}">
+                    <button class="btn btn--outline btn--sm auto-classify-btn">
                         <i data-lucide="zap" class="w-4 h-4"></i>
                         Auto Classificar
                     </button>
-                    <button class="btn btn--ghost btn--sm skip-transaction-btn" 
-                            data-transaction-id="${transaction.id}">
+                    <button class="btn btn--ghost btn--sm skip-transaction-btn">
                         <i data-lucide="skip-forward" class="w-4 h-4"></i>
                         Pular
                     </button>
                 </div>
                 <div class="flex items-center gap-3">
-                    <button class="btn btn--outline duplicate-classification-btn" 
-                            data-transaction-id="${transaction.id}">
+                    <button class="btn btn--outline duplicate-classification-btn">
                         <i data-lucide="copy" class="w-4 h-4"></i>
                         Usar Última Classificação
                     </button>
-                    <button class="btn btn--primary reconcile-btn" 
-                            data-transaction-id="${transaction.id}">
+                    <button class="btn btn--primary reconcile-btn">
                         <i data-lucide="check" class="w-4 h-4"></i>
                         Conciliar
                     </button>
@@ -200,112 +231,387 @@ function createReconciliationCard(transaction, index) {
         </div>
     `;
 
-    // Configura cascata de classificação
-    setupClassificationCascade(card, transaction);
+    card._fields = {};
+    card.querySelectorAll('[data-field]').forEach(element => {
+        card._fields[element.dataset.field] = element;
+    });
+    card._form = {
+        level1: card.querySelector('.classification-level-1'),
+        level2: card.querySelector('.classification-level-2'),
+        level3: card.querySelector('.classification-level-3'),
+        costCenter: card.querySelector('.cost-center'),
+        contractNote: card.querySelector('.contract-note'),
+        notes: card.querySelector('.transaction-notes')
+    };
+    card._idElements = card.querySelectorAll('select, input, textarea, button');
+    card._transaction = null;
+
+    // Opções vêm do cache de fragmentos; a cascata é tratada por delegação
+    fillClassificationLevel1(card._form.level1);
 
     return card;
 }
 
 /**
- * Gera opções de classificação para select
+ * Preenche um card reciclado com uma transação (ou com o rascunho já digitado para ela)
  */
-function generateClassificationOptions(level, selectedValue = '') {
-    let html = '';
+function patchReconciliationCard(card, transaction, index) {
+    const fields = card._fields;
+    fields.position.textContent = `#${index + 1}`;
+    if (card._transaction === transaction) return;
 
-    if (level === 1) {
-        Object.keys(appData.chartOfAccounts).forEach(account => {
-            const isSelected = account === selectedValue ? 'selected' : '';
-            html += `<option value="${account}" ${isSelected}>${account}</option>`;
-        });
-    }
+    const description = transaction['Descrição Original'] || 
+                       transaction['Favorecido / Pagador Padronizado'] || 
+                       'Descrição não informada';
+    const income = parseValue(transaction['Entrada (R$)']);
+    const expense = parseValue(transaction['Saída (R$)']);
+    const amount = income > 0 ? income : expense;
+
+    fields.description.textContent = description;
+    fields.description.title = description;
+    fields.date.textContent = formatDate(transaction['Data']);
+    fields.bank.textContent = transaction['Banco Origem/Destino'] || 'Não informado';
+    fields.type.textContent = income > 0 ? 'Entrada' : 'Saída';
+    fields.amount.textContent = formatCurrency(amount);
+    fields.amount.className = `text-2xl font-bold ${income > 0 ? 'money-positive' : 'money-negative'}`;
+
+    card.dataset.transactionId = transaction.id;
+    card._idElements.forEach(element => {
+        element.dataset.transactionId = transaction.id;
+    });
 
-    return html;
+    // Favorecido recorrente: a classificação memorizada já vem preenchida
+    const memo = transaction['Classificação Nível 1'] ? null : getPayeeMemoEntry(transaction);
+    fields.memo.hidden = !memo;
+
+    const draft = appState.reconciliationQueue?.drafts.get(transaction.id);
+    const values = draft || {
+        level1: transaction['Classificação Nível 1'] || memo?.level1 || '',
+        level2: transaction['Classificação Nível 2'] || memo?.level2 || '',
+        level3: transaction['Classificação Nível 3'] || memo?.level3 || '',
+        costCenter: transaction['Centro de Custo'] || memo?.costCenter || '',
+        contractNote: transaction['Contrato/Nota?'] || '',
+        notes: transaction['Notas'] || ''
+    };
+
+    const form = card._form;
+    setCardClassification(card, values.level1, values.level2, values.level3);
+    form.costCenter.value = values.costCenter;
+    form.contractNote.value = values.contractNote;
+    form.notes.value = values.notes;
+
+    card._transaction = transaction;
+    renderCardSuggestions(card);
 }
 
 /**
- * Configura sistema de cascata para classificação
+ * Guarda o que foi digitado em um card, para sobreviver à reciclagem
  */
-function setupClassificationCascade(card, transaction) {
-    const level1Select = card.querySelector('.classification-level-1');
-    const level2Select = card.querySelector('.classification-level-2');
-    const level3Select = card.querySelector('.classification-level-3');
+function captureReconciliationDraft(event) {
+    const queue = appState.reconciliationQueue;
+    const card = event.target.closest('.reconciliation-card');
+    if (!queue || !card || !card._transaction) return;
+
+    const form = card._form;
+    queue.drafts.set(card._transaction.id, {
+        level1: form.level1.value,
+        level2: form.level2.value,
+        level3: form.level3.value,
+        costCenter: form.costCenter.value,
+        contractNote: form.contractNote.value,
+        notes: form.notes.value
+    });
+}
 
-    if (!level1Select) return;
+/**
+ * Ajusta o pool de cards ao tamanho necessário, reaproveitando elementos
+ */
+function resizeReconciliationPool(queue, size) {
+    const created = [];
+
+    while (queue.cards.length < size) {
+        const card = queue.spare.pop() || createReconciliationCard();
+        if (!card._iconsReady) created.push(card);
+        card._transaction = null;
+        queue.container.insertBefore(card, queue.bottomSpacer);
+        queue.cards.push(card);
+    }
 
-    // Configura valores iniciais se existirem
-    if (transaction['Classificação Nível 1']) {
-        level1Select.value = transaction['Classificação Nível 1'];
-        updateLevel2Options(level1Select.value, level2Select, transaction['Classificação Nível 2']);
+    while (queue.cards.length > size) {
+        const card = queue.cards.pop();
+        card.remove();
+        queue.spare.push(card);
     }
 
-    if (transaction['Classificação Nível 2']) {
-        setTimeout(() => {
-            level2Select.value = transaction['Classificação Nível 2'];
-            updateLevel3Options(level1Select.value, level2Select.value, level3Select, transaction['Classificação Nível 3']);
-        }, 100);
+    if (created.length > 0) {
+        // Ícones são criados apenas quando novos cards entram no pool
+        if (typeof lucide !== 'undefined') {
+            lucide.createIcons();
+        }
+        created.forEach(card => { card._iconsReady = true; });
+
+        const measured = queue.cards[0].getBoundingClientRect().height;
+        if (measured > 0) {
+            const gap = parseFloat(getComputedStyle(queue.cards[0]).marginBottom) || 0;
+            queue.cardHeight = measured + gap;
+        }
     }
+}
 
-    // Event listeners para cascata
-    level1Select.addEventListener('change', function() {
-        const selectedLevel1 = this.value;
+/**
+ * Agenda a atualização da janela para o próximo quadro
+ */
+function scheduleReconciliationWindowUpdate() {
+    const queue = appState.reconciliationQueue;
+    if (!queue || queue.frame) return;
+
+    queue.frame = requestAnimationFrame(() => {
+        queue.frame = null;
+        updateReconciliationWindow(false);
+    });
+}
 
-        // Reset níveis inferiores
-        level2Select.innerHTML = '<option value="">Selecione...</option>';
-        level3Select.innerHTML = '<option value="">Selecione nível 2 primeiro</option>';
-        level2Select.disabled = !selectedLevel1;
-        level3Select.disabled = true;
+/**
+ * Posiciona a janela de cards de acordo com a rolagem atual
+ */
+function updateReconciliationWindow(force) {
+    const queue = appState.reconciliationQueue;
+    if (!queue) return;
+
+    const { container, items } = queue;
+    const total = items.length;
+    const viewport = container.clientHeight || 800;
+    const poolSize = Math.min(total, Math.ceil(viewport / queue.cardHeight) + RECONCILIATION_BUFFER_CARDS * 2);
+
+    if (poolSize !== queue.cards.length) {
+        resizeReconciliationPool(queue, poolSize);
+        force = true;
+    }
 
-        if (selectedLevel1) {
-            updateLevel2Options(selectedLevel1, level2Select);
+    const maxFirst = Math.max(0, total - poolSize);
+    const first = Math.min(maxFirst, Math.max(0, Math.floor(container.scrollTop / queue.cardHeight) - RECONCILIATION_BUFFER_CARDS));
+    const delta = first - queue.first;
+
+    if (force || queue.first < 0 || Math.abs(delta) >= poolSize) {
+        queue.cards.forEach((card, i) => patchReconciliationCard(card, items[first + i], first + i));
+    } else if (delta > 0) {
+        // Rolagem para baixo: cards do topo vão para o fim
+        for (let i = 0; i < delta; i++) {
+            const card = queue.cards.shift();
+            container.insertBefore(card, queue.bottomSpacer);
+            queue.cards.push(card);
         }
-    });
+        for (let i = poolSize - delta; i < poolSize; i++) {
+            patchReconciliationCard(queue.cards[i], items[first + i], first + i);
+        }
+    } else if (delta < 0) {
+        // Rolagem para cima: cards do fim vão para o topo
+        for (let i = 0; i < -delta; i++) {
+            const card = queue.cards.pop();
+            container.insertBefore(card, queue.topSpacer.nextSibling);
+            queue.cards.unshift(card);
+        }
+        for (let i = 0; i < -delta; i++) {
+            patchReconciliationCard(queue.cards[i], items[first + i], first + i);
+        }
+    }
+
+    queue.topSpacer.style.height = `${first * queue.cardHeight}px`;
+    queue.bottomSpacer.style.height = `${(total - first - poolSize) * queue.cardHeight}px`;
+    queue.first = first;
+}
+
+/**
+ * Tira uma transação da fila (após conciliar) e reposiciona a janela
+ */
+function removeFromReconciliationQueue(transactionId) {
+    const queue = appState.reconciliationQueue;
+    if (!queue) return;
 
-    level2Select.addEventListener('change', function() {
-        const selectedLevel1 = level1Select.value;
-        const selectedLevel2 = this.value;
+    const index = queue.items.findIndex(transaction => transaction.id === transactionId);
+    if (index === -1) return;
 
-        level3Select.innerHTML = '<option value="">Selecione...</option>';
-        level3Select.disabled = !selectedLevel2;
+    queue.items.splice(index, 1);
+    queue.drafts.delete(transactionId);
 
-        if (selectedLevel1 && selectedLevel2) {
-            updateLevel3Options(selectedLevel1, selectedLevel2, level3Select);
-        }
+    if (queue.items.length === 0) {
+        destroyReconciliationQueue();
+        queue.container.innerHTML = '';
+        renderReconciliationEmptyState(queue.container);
+        return;
+    }
+
+    // Cards a partir da posição removida mudam de transação
+    queue.cards.forEach(card => { card._transaction = null; });
+    updateReconciliationWindow(true);
+}
+
+/**
+ * Contagens de conciliação lidas do cubo (sem percorrer transações nem o DOM)
+ */
+function getReconciliationCounts() {
+    const counts = { pending: 0, reconciled: 0, total: 0 };
+    rollupCube(['status']).forEach(row => {
+        const status = (row.status || '').toLowerCase();
+        counts.total += row.count;
+        if (status === 'pendente') counts.pending += row.count;
+        else if (status === 'conciliado') counts.reconciled += row.count;
     });
+    return counts;
+}
+
+/**
+ * Atualiza o progresso geral da conciliação
+ */
+function updateReconciliationProgress() {
+    const text = document.getElementById('reconciliationProgressText');
+    const bar = document.getElementById('reconciliationProgressBar');
+    const counts = getReconciliationCounts();
+    const percent = counts.total > 0 ? Math.round(counts.reconciled / counts.total * 100) : 100;
+
+    if (text) {
+        text.textContent = `${counts.reconciled.toLocaleString('pt-BR')} de ${counts.total.toLocaleString('pt-BR')} conciliadas ` +
+            `(${percent}%) · ${counts.pending.toLocaleString('pt-BR')} pendentes`;
+    }
+    if (bar) {
+        bar.style.width = `${percent}%`;
+    }
+}
+
+/**
+ * Opções de um nível do plano de contas (level1/level2 informam o pai), como
+ * DocumentFragment pronto para ser clonado. O cache é descartado quando a versão
+ * do plano de contas muda. Retorna null se o pai não existir.
+ */
+function getClassificationOptions(level1 = null, level2 = null) {
+    const cache = appState.classificationOptions;
+    if (cache.version !== appState.chartOfAccountsVersion || cache.chart !== appData.chartOfAccounts) {
+        cache.version = appState.chartOfAccountsVersion;
+        cache.chart = appData.chartOfAccounts;
+        cache.entries = new Map();
+    }
+
+    const key = level1 === null ? '1' : level2 === null ? `2\u001f${level1}` : `3\u001f${level1}\u001f${level2}`;
+    let entry = cache.entries.get(key);
+    if (entry !== undefined) return entry;
+
+    const chart = appData.chartOfAccounts;
+    let accounts = null;
+    if (level1 === null) accounts = Object.keys(chart);
+    else if (level2 === null) accounts = chart[level1] ? Object.keys(chart[level1]) : null;
+    else accounts = (chart[level1] && chart[level1][level2]) || null;
+
+    entry = null;
+    if (accounts) {
+        const fragment = document.createDocumentFragment();
+        accounts.forEach(account => {
+            const option = document.createElement('option');
+            option.value = account;
+            option.textContent = account;
+            fragment.appendChild(option);
+        });
+        entry = { fragment, values: new Set(accounts) };
+    }
+
+    cache.entries.set(key, entry);
+    return entry;
+}
+
+/**
+ * Anexa a um select as opções em cache e seleciona o valor, se existir
+ */
+function appendClassificationOptions(select, entry, selectedValue = '') {
+    if (!entry) return false;
+    select.appendChild(entry.fragment.cloneNode(true));
+    if (selectedValue && entry.values.has(selectedValue)) {
+        select.value = selectedValue;
+    }
+    select.disabled = false;
+    return true;
+}
+
+/**
+ * Preenche um select de nível 1 (placeholder + contas) e registra a versão usada
+ */
+function fillClassificationLevel1(select, placeholder = 'Selecione...') {
+    select.textContent = '';
+    const option = document.createElement('option');
+    option.value = '';
+    option.textContent = placeholder;
+    select.appendChild(option);
+    appendClassificationOptions(select, getClassificationOptions());
+    select._chartVersion = appState.chartOfAccountsVersion;
+}
+
+/**
+ * Cascata de todos os formulários de classificação, por delegação:
+ * qualquer container com data-classification-cascade e os três selects
+ */
+function handleClassificationCascadeChange(event) {
+    const select = event.target;
+    if (!select.classList || !(select.classList.contains('classification-level-1') ||
+        select.classList.contains('classification-level-2'))) return;
+
+    const container = select.closest('[data-classification-cascade]');
+    if (!container) return;
+
+    const level1 = container.querySelector('.classification-level-1').value;
+    if (select.classList.contains('classification-level-1')) {
+        setCardClassification(container, level1, '', '');
+    } else {
+        const level3Select = container.querySelector('.classification-level-3');
+        resetClassificationSelect(level3Select, select.value ? 'Selecione...' : 'Selecione nível 2 primeiro');
+        if (level1 && select.value) updateLevel3Options(level1, select.value, level3Select);
+    }
+}
+
+/**
+ * Deixa um select só com o placeholder, desabilitado
+ */
+function resetClassificationSelect(select, placeholder) {
+    select.textContent = '';
+    const option = document.createElement('option');
+    option.value = '';
+    option.textContent = placeholder;
+    select.appendChild(option);
+    select.disabled = true;
+}
+
+/**
+ * Define os três níveis de classificação de um card de uma vez,
+ * reconstruindo as opções dos níveis inferiores de forma síncrona
+ */
+function setCardClassification(card, level1 = '', level2 = '', level3 = '') {
+    const level1Select = card.querySelector('.classification-level-1');
+    const level2Select = card.querySelector('.classification-level-2');
+    const level3Select = card.querySelector('.classification-level-3');
+    if (!level1Select || !level2Select || !level3Select) return;
+
+    // Plano de contas mudou desde o preenchimento deste select
+    if (level1Select._chartVersion !== appState.chartOfAccountsVersion) {
+        fillClassificationLevel1(level1Select);
+    }
+    level1Select.value = level1;
+
+    resetClassificationSelect(level2Select, level1 ? 'Selecione...' : 'Selecione nível 1 primeiro');
+    if (level1) updateLevel2Options(level1, level2Select, level2);
+
+    resetClassificationSelect(level3Select, level2 ? 'Selecione...' : 'Selecione nível 2 primeiro');
+    if (level1 && level2) updateLevel3Options(level1, level2, level3Select, level3);
 }
 
 /**
  * Atualiza opções do nível 2
  */
 function updateLevel2Options(level1Value, level2Select, selectedValue = '') {
-    if (!appData.chartOfAccounts[level1Value]) return;
-
-    Object.keys(appData.chartOfAccounts[level1Value]).forEach(account => {
-        const option = document.createElement('option');
-        option.value = account;
-        option.textContent = account;
-        option.selected = account === selectedValue;
-        level2Select.appendChild(option);
-    });
-
-    level2Select.disabled = false;
+    appendClassificationOptions(level2Select, getClassificationOptions(level1Value), selectedValue);
 }
 
 /**
  * Atualiza opções do nível 3
  */
 function updateLevel3Options(level1Value, level2Value, level3Select, selectedValue = '') {
-    if (!appData.chartOfAccounts[level1Value] || 
-        !appData.chartOfAccounts[level1Value][level2Value]) return;
-
-    appData.chartOfAccounts[level1Value][level2Value].forEach(account => {
-        const option = document.createElement('option');
-        option.value = account;
-        option.textContent = account;
-        option.selected = account === selectedValue;
-        level3Select.appendChild(option);
-    });
-
-    level3Select.disabled = false;
+    appendClassificationOptions(level3Select, getClassificationOptions(level1Value, level2Value), selectedValue);
 }
 
 /**
@@ -313,7 +619,7 @@ function updateLevel3Options(level1Value, level2Value, level3Select, selectedVal
  */
 async function reconcileTransaction(transactionId) {
     try {
-        const transaction = appData.transactions.find(t => t.id === transactionId);
+        const transaction = getTransactionById(transactionId);
         if (!transaction) {
             showNotification('Transação não encontrada', 'error');
             return;
@@ -341,37 +647,27 @@ async function reconcileTransaction(transactionId) {
         }
 
         // Atualiza transação
-        transaction['Classificação Nível 1'] = level1;
-        transaction['Classificação Nível 2'] = level2;
-        transaction['Classificação Nível 3'] = level3;
-        transaction['Centro de Custo'] = costCenter;
-        transaction['Contrato/Nota?'] = contractNote;
-        transaction['Notas'] = notes;
-        transaction['Status Conciliação'] = 'Conciliado';
-
-        // Salva dados
-        await saveAppData();
-
-        // Remove card com animação
-        card.style.transform = 'translateX(100%)';
-        card.style.opacity = '0';
-        card.style.transition = 'all 0.3s ease';
+        updateTransactionFields(transaction, {
+            'Classificação Nível 1': level1,
+            'Classificação Nível 2': level2,
+            'Classificação Nível 3': level3,
+            'Centro de Custo': costCenter,
+            'Contrato/Nota?': contractNote,
+            'Notas': notes,
+            'Status Conciliação': 'Conciliado'
+        });
+        rememberPayeeClassification(transaction);
 
-        setTimeout(() => {
-            card.remove();
+        // Gravação em lote; os agregados já foram atualizados por delta
+        queueAppDataSave();
 
-            // Verifica se ainda há transações pendentes
-            const remainingCards = document.querySelectorAll('.reconciliation-card');
-            if (remainingCards.length === 0) {
-                loadReconciliation(); // Recarrega para mostrar mensagem de sucesso
-            }
-        }, 300);
+        // Tira da fila; o card é reaproveitado para a próxima transação
+        removeFromReconciliationQueue(transactionId);
+        updateReconciliationProgress();
 
-        // Atualiza KPIs se dashboard estiver ativo
-        if (appData.ui.currentTab === 'dashboard') {
-            updateKPIs();
-            updateCharts();
-        }
+        // O classificador aprende com a nova conciliação
+        appState.classifier.suggestions.delete(transactionId);
+        scheduleClassifierTraining();
 
         showNotification('Transação conciliada com sucesso!', 'success');
         debugLog('info', 'Transação conciliada:', transactionId);
@@ -383,103 +679,37 @@ async function reconcileTransaction(transactionId) {
 }
 
 /**
- * Auto classificação inteligente (básica)
+ * Auto classificação de um card pelas regras de classificação
  */
 function autoClassifyTransaction(transactionId) {
     try {
-        const transaction = appData.transactions.find(t => t.id === transactionId);
+        const transaction = getTransactionById(transactionId);
         if (!transaction) return;
 
-        const description = (transaction['Descrição Original'] || '').toLowerCase();
-        const income = parseValue(transaction['Entrada (R$)']);
-
-        let suggestedClassification = null;
-
-        // Regras básicas de auto classificação
-        if (income > 0) {
-            // Receitas
-            if (description.includes('serviço') || description.includes('consultoria') || description.includes('projeto')) {
-                suggestedClassification = {
-                    level1: '1.0 RECEITAS OPERACIONAIS',
-                    level2: '1.1 Receita de Vendas/Serviços',
-                    level3: '1.1.2 Prestação de Serviços'
-                };
-            } else if (description.includes('venda') || description.includes('produto')) {
-                suggestedClassification = {
-                    level1: '1.0 RECEITAS OPERACIONAIS',
-                    level2: '1.1 Receita de Vendas/Serviços',
-                    level3: '1.1.1 Venda de Produtos'
-                };
-            } else if (description.includes('juros') || description.includes('rendimento')) {
-                suggestedClassification = {
-                    level1: '3.0 RESULTADO FINANCEIRO',
-                    level2: '3.1 Receitas Financeiras',
-                    level3: '3.1.1 Rendimentos de Aplicações'
-                };
-            }
-        } else {
-            // Despesas
-            if (description.includes('aluguel') || description.includes('condomínio')) {
-                suggestedClassification = {
-                    level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS',
-                    level2: '2.3 Despesas Administrativas',
-                    level3: '2.3.1 Aluguel e Condomínio'
-                };
-            } else if (description.includes('salário') || description.includes('pagamento funcionário')) {
-                suggestedClassification = {
-                    level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS',
-                    level2: '2.2 Despesas com Pessoal',
-                    level3: '2.2.1 Salários e Ordenados'
-                };
-            } else if (description.includes('material') || description.includes('papelaria') || description.includes('escritório')) {
-                suggestedClassification = {
-                    level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS',
-                    level2: '2.3 Despesas Administrativas',
-                    level3: '2.3.3 Materiais de Escritório'
-                };
-            } else if (description.includes('internet') || description.includes('telefone') || description.includes('comunicação')) {
-                suggestedClassification = {
-                    level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS',
-                    level2: '2.3 Despesas Administrativas',
-                    level3: '2.3.4 Comunicação e Internet'
-                };
-            } else if (description.includes('marketing') || description.includes('publicidade') || description.includes('propaganda')) {
-                suggestedClassification = {
-                    level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS',
-                    level2: '2.4 Despesas Comerciais',
-                    level3: '2.4.1 Marketing e Publicidade'
-                };
-            }
-        }
+        // Memória de favorecidos primeiro; regras só quando o favorecido é novo
+        const memo = getPayeeMemoEntry(transaction);
+        const ruleset = memo ? null : getCompiledClassificationRules();
+        const ruleIndex = memo ? -1 : matchClassificationRule(ruleset, transaction);
+        const suggestedClassification = memo || (ruleIndex === -1 ? null : ruleset.rules[ruleIndex].rule.target);
 
         if (suggestedClassification) {
             const card = document.querySelector(`.reconciliation-card[data-transaction-id="${transactionId}"]`);
             if (card) {
-                const level1Select = card.querySelector('.classification-level-1');
-                const level2Select = card.querySelector('.classification-level-2');
-                const level3Select = card.querySelector('.classification-level-3');
-
-                if (level1Select) {
-                    level1Select.value = suggestedClassification.level1;
-                    level1Select.dispatchEvent(new Event('change'));
-
-                    setTimeout(() => {
-                        if (level2Select) {
-                            level2Select.value = suggestedClassification.level2;
-                            level2Select.dispatchEvent(new Event('change'));
-
-                            setTimeout(() => {
-                                if (level3Select) {
-                                    level3Select.value = suggestedClassification.level3;
-                                }
-                            }, 100);
-                        }
-                    }, 100);
-                }
+                setCardClassification(
+                    card,
+                    suggestedClassification.level1,
+                    suggestedClassification.level2,
+                    suggestedClassification.level3
+                );
+                // Registra como rascunho do card
+                card.querySelector('.classification-level-1').dispatchEvent(new Event('input', { bubbles: true }));
             }
 
             showNotification('Classificação automática aplicada', 'success');
-            debugLog('info', 'Auto classificação aplicada:', { transactionId, classification: suggestedClassification });
+            debugLog('info', 'Auto classificação aplicada:', {
+                transactionId,
+                source: memo ? 'memória de favorecidos' : ruleset.rules[ruleIndex].rule.name
+            });
         } else {
             showNotification('Não foi possível sugerir uma classificação automática', 'warning');
         }
@@ -490,81 +720,2014 @@ function autoClassifyTransaction(transactionId) {
     }
 }
 
-// Event delegation para botões de conciliação
-document.addEventListener('click', function(event) {
-    const target = event.target.closest('button');
-    if (!target) return;
+// ==========================================
+// MOTOR DE REGRAS DE CLASSIFICAÇÃO
+// ==========================================
 
-    const transactionId = target.dataset.transactionId;
-    if (!transactionId) return;
+/**
+ * Regras iniciais (equivalentes às verificações fixas da versão anterior)
+ */
+const DEFAULT_CLASSIFICATION_RULES = [
+    {
+        name: 'Prestação de serviços',
+        keywords: ['serviço', 'consultoria', 'projeto'],
+        direction: 'entrada',
+        target: { level1: '1.0 RECEITAS OPERACIONAIS', level2: '1.1 Receita de Vendas/Serviços', level3: '1.1.2 Prestação de Serviços' }
+    },
+    {
+        name: 'Venda de produtos',
+        keywords: ['venda', 'produto'],
+        direction: 'entrada',
+        target: { level1: '1.0 RECEITAS OPERACIONAIS', level2: '1.1 Receita de Vendas/Serviços', level3: '1.1.1 Venda de Produtos' }
+    },
+    {
+        name: 'Rendimentos',
+        keywords: ['juros', 'rendimento'],
+        direction: 'entrada',
+        target: { level1: '3.0 RESULTADO FINANCEIRO', level2: '3.1 Receitas Financeiras', level3: '3.1.1 Rendimentos de Aplicações' }
+    },
+    {
+        name: 'Aluguel e condomínio',
+        keywords: ['aluguel', 'condomínio'],
+        direction: 'saida',
+        target: { level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS', level2: '2.3 Despesas Administrativas', level3: '2.3.1 Aluguel e Condomínio' }
+    },
+    {
+        name: 'Salários',
+        keywords: ['salário', 'pagamento funcionário'],
+        direction: 'saida',
+        target: { level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS', level2: '2.2 Despesas com Pessoal', level3: '2.2.1 Salários e Ordenados' }
+    },
+    {
+        name: 'Materiais de escritório',
+        keywords: ['material', 'papelaria', 'escritório'],
+        direction: 'saida',
+        target: { level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS', level2: '2.3 Despesas Administrativas', level3: '2.3.3 Materiais de Escritório' }
+    },
+    {
+        name: 'Comunicação e internet',
+        keywords: ['internet', 'telefone', 'comunicação'],
+        direction: 'saida',
+        target: { level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS', level2: '2.3 Despesas Administrativas', level3: '2.3.4 Comunicação e Internet' }
+    },
+    {
+        name: 'Marketing',
+        keywords: ['marketing', 'publicidade', 'propaganda'],
+        direction: 'saida',
+        target: { level1: '2.0 CUSTOS E DESPESAS OPERACIONAIS', level2: '2.4 Despesas Comerciais', level3: '2.4.1 Marketing e Publicidade' }
+    }
+];
 
-    if (target.classList.contains('auto-classify-btn')) {
-        autoClassifyTransaction(transactionId);
-    } else if (target.classList.contains('skip-transaction-btn')) {
-        skipTransaction(transactionId);
-    } else if (target.classList.contains('duplicate-classification-btn')) {
-        duplicateLastClassification(transactionId);
+/**
+ * Regras do usuário (a ordem define a prioridade: vale a primeira que casar)
+ */
+function getClassificationRules() {
+    if (!Array.isArray(appData.settings.classificationRules)) {
+        appData.settings.classificationRules = DEFAULT_CLASSIFICATION_RULES.map(rule => ({
+            id: generateId(),
+            regex: '',
+            minAmount: null,
+            maxAmount: null,
+            bank: '',
+            enabled: true,
+            ...rule,
+            keywords: rule.keywords.slice(),
+            target: { ...rule.target }
+        }));
     }
-});
+    return appData.settings.classificationRules;
+}
 
 /**
- * Pula uma transação (move para o final da lista)
+ * Texto normalizado usado pelas regras (descrição + favorecido)
  */
-function skipTransaction(transactionId) {
-    const card = document.querySelector(`.reconciliation-card[data-transaction-id="${transactionId}"]`);
-    if (card) {
-        const container = document.getElementById('reconciliationList');
-        container.appendChild(card);
+function getRuleMatchText(transaction) {
+    return normalizeQueryText(
+        `${transaction['Descrição Original'] || ''} ${transaction['Favorecido / Pagador Padronizado'] || ''}`
+    );
+}
+
+/**
+ * Autômato de Aho-Corasick para um conjunto de palavras-chave.
+ * patterns: [{ text, rule }]; cada nó guarda as regras cujas palavras terminam nele
+ * (incluindo as herdadas pelo link de falha).
+ */
+function buildKeywordAutomaton(patterns) {
+    const createNode = () => ({ next: new Map(), fail: null, outputs: [] });
+    const root = createNode();
+
+    patterns.forEach(({ text, rule }) => {
+        let node = root;
+        for (let i = 0; i < text.length; i++) {
+            const code = text.charCodeAt(i);
+            let child = node.next.get(code);
+            if (!child) {
+                child = createNode();
+                node.next.set(code, child);
+            }
+            node = child;
+        }
+        if (!node.outputs.includes(rule)) node.outputs.push(rule);
+    });
+
+    // Links de falha em largura
+    const queue = [];
+    root.next.forEach(child => {
+        child.fail = root;
+        queue.push(child);
+    });
 
-        showNotification('Transação movida para o final da lista', 'info');
+    for (let head = 0; head < queue.length; head++) {
+        const node = queue[head];
+        node.next.forEach((child, code) => {
+            let fail = node.fail;
+            while (fail && !fail.next.has(code)) {
+                fail = fail.fail;
+            }
+            child.fail = fail ? fail.next.get(code) : root;
+            if (child.fail.outputs.length > 0) {
+                child.outputs = child.outputs.concat(child.fail.outputs.filter(rule => !child.outputs.includes(rule)));
+            }
+            queue.push(child);
+        });
     }
+
+    return root;
 }
 
 /**
- * Duplica a última classificação usada
+ * Compila as regras: um único autômato para todas as palavras-chave
+ * e as demais condições pré-processadas. Regex inválida desativa a regra.
  */
-function duplicateLastClassification(transactionId) {
-    try {
-        // Encontra a última transação conciliada
-        const reconciled = appData.transactions.filter(t => t['Status Conciliação'] === 'Conciliado');
-        if (reconciled.length === 0) {
-            showNotification('Não há transações conciliadas para duplicar', 'warning');
-            return;
+function compileClassificationRules(rules) {
+    const patterns = [];
+    const compiled = [];
+    const errors = new Map();
+
+    rules.forEach(rule => {
+        if (rule.enabled === false || !rule.target || !rule.target.level1) return;
+
+        let regex = null;
+        if (rule.regex) {
+            try {
+                regex = new RegExp(rule.regex, 'i');
+            } catch (error) {
+                errors.set(rule.id, `Regex inválida: ${error.message}`);
+                return;
+            }
         }
 
-        // Pega a mais recente
-        const lastReconciled = reconciled[reconciled.length - 1];
-
-        const card = document.querySelector(`.reconciliation-card[data-transaction-id="${transactionId}"]`);
-        if (!card) return;
+        const index = compiled.length;
+        const keywords = (rule.keywords || []).map(normalizeQueryText).filter(Boolean);
+        keywords.forEach(text => patterns.push({ text, rule: index }));
+
+        compiled.push({
+            rule,
+            hasKeywords: keywords.length > 0,
+            regex,
+            minAmount: rule.minAmount === null || rule.minAmount === '' || rule.minAmount === undefined ? null : Number(rule.minAmount),
+            maxAmount: rule.maxAmount === null || rule.maxAmount === '' || rule.maxAmount === undefined ? null : Number(rule.maxAmount),
+            bank: normalizeQueryText(rule.bank || ''),
+            direction: rule.direction || 'any'
+        });
+    });
 
-        // Aplica classificação
-        const level1Select = card.querySelector('.classification-level-1');
-        const level2Select = card.querySelector('.classification-level-2');
-        const level3Select = card.querySelector('.classification-level-3');
-        const costCenterInput = card.querySelector('.cost-center');
+    return {
+        rules: compiled,
+        automaton: buildKeywordAutomaton(patterns),
+        hits: new Int32Array(compiled.length),
+        stamp: 0,
+        errors
+    };
+}
 
-        if (level1Select && lastReconciled['Classificação Nível 1']) {
-            level1Select.value = lastReconciled['Classificação Nível 1'];
-            level1Select.dispatchEvent(new Event('change'));
+/**
+ * Regras compiladas em cache (recompiladas quando as regras mudam)
+ */
+function getCompiledClassificationRules() {
+    const rules = getClassificationRules();
+    const source = JSON.stringify(rules);
+    const cached = appState.classificationRuleset;
+    if (cached && cached.source === source) return cached.ruleset;
+
+    const ruleset = compileClassificationRules(rules);
+    appState.classificationRuleset = { source, ruleset };
+    return ruleset;
+}
 
-            setTimeout(() => {
-                if (level2Select && lastReconciled['Classificação Nível 2']) {
-                    level2Select.value = lastReconciled['Classificação Nível 2'];
-                    level2Select.dispatchEvent(new Event('change'));
+/**
+ * Índice (nas regras compiladas) da primeira regra que atende à transação, ou -1.
+ * Uma passada do autômato marca as regras cujas palavras aparecem no texto;
+ * depois as regras são conferidas em ordem de prioridade.
+ */
+function matchClassificationRule(ruleset, transaction) {
+    const { rules, automaton, hits } = ruleset;
+    if (rules.length === 0) return -1;
+
+    const stamp = ++ruleset.stamp;
+    const text = getRuleMatchText(transaction);
+    let node = automaton;
+    for (let i = 0; i < text.length; i++) {
+        const code = text.charCodeAt(i);
+        while (node !== automaton && !node.next.has(code)) {
+            node = node.fail;
+        }
+        node = node.next.get(code) || automaton;
+        const outputs = node.outputs;
+        for (let k = 0; k < outputs.length; k++) {
+            hits[outputs[k]] = stamp;
+        }
+    }
 
-                    setTimeout(() => {
-                        if (level3Select && lastReconciled['Classificação Nível 3']) {
-                            level3Select.value = lastReconciled['Classificação Nível 3'];
-                        }
-                    }, 100);
-                }
-            }, 100);
+    const income = parseValue(transaction['Entrada (R$)']);
+    const expense = parseValue(transaction['Saída (R$)']);
+    const amount = income > 0 ? income : expense;
+    const direction = income > 0 ? 'entrada' : 'saida';
+    let bank = null;
+
+    for (let index = 0; index < rules.length; index++) {
+        const rule = rules[index];
+        if (rule.hasKeywords && hits[index] !== stamp) continue;
+        if (rule.direction !== 'any' && rule.direction !== direction) continue;
+        if (rule.minAmount !== null && amount < rule.minAmount) continue;
+        if (rule.maxAmount !== null && amount > rule.maxAmount) continue;
+        if (rule.bank) {
+            if (bank === null) bank = normalizeQueryText(transaction['Banco Origem/Destino'] || '');
+            if (!bank.includes(rule.bank)) continue;
         }
+        if (rule.regex && !rule.regex.test(transaction['Descrição Original'] || '')) continue;
+        return index;
+    }
 
-        if (costCenterInput && lastReconciled['Centro de Custo']) {
-            costCenterInput.value = lastReconciled['Centro de Custo'];
+    return -1;
+}
+
+/**
+ * Aplica as regras a um conjunto de transações em uma passada.
+ * Retorna as correspondências, a contagem por regra e alguns exemplos de cada uma.
+ */
+function runClassificationRules(transactions, overwrite = false) {
+    const ruleset = getCompiledClassificationRules();
+    const matches = [];
+    const counts = new Array(ruleset.rules.length).fill(0);
+    const samples = ruleset.rules.map(() => []);
+
+    transactions.forEach(transaction => {
+        if (!overwrite && transaction['Classificação Nível 1']) return;
+
+        const index = matchClassificationRule(ruleset, transaction);
+        if (index === -1) return;
+
+        matches.push({ transaction, target: ruleset.rules[index].rule.target });
+        counts[index]++;
+        if (samples[index].length < 5) samples[index].push(transaction);
+    });
+
+    return { ruleset, matches, counts, samples };
+}
+
+/**
+ * Transações pendentes de conciliação
+ */
+function getPendingTransactions() {
+    return appData.transactions.filter(t =>
+        (t['Status Conciliação'] || '').toLowerCase() === 'pendente'
+    );
+}
+
+/**
+ * Mostra/esconde o painel de regras
+ */
+function toggleClassificationRulesPanel(show) {
+    const panel = document.getElementById('classificationRulesPanel');
+    if (!panel) return;
+
+    const visible = show === undefined ? panel.classList.contains('hidden') : show;
+    panel.classList.toggle('hidden', !visible);
+    if (visible) {
+        resetClassificationRuleForm();
+        renderClassificationRules();
+    }
+}
+
+/**
+ * Lista as regras com a contagem da última pré-visualização
+ */
+function renderClassificationRules(preview = null) {
+    const tbody = document.getElementById('classificationRulesBody');
+    if (!tbody) return;
+
+    const rules = getClassificationRules();
+    const ruleset = preview ? preview.ruleset : getCompiledClassificationRules();
+    const countsById = new Map();
+    if (preview) {
+        preview.ruleset.rules.forEach((compiled, index) => countsById.set(compiled.rule.id, index));
+    }
+
+    tbody.innerHTML = '';
+    rules.forEach((rule, position) => {
+        const conditions = [];
+        if (rule.keywords && rule.keywords.length) conditions.push(`contém: ${rule.keywords.join(', ')}`);
+        if (rule.regex) conditions.push(`regex: /${rule.regex}/`);
+        if (rule.minAmount !== null && rule.minAmount !== '') conditions.push(`valor ≥ ${formatCurrency(Number(rule.minAmount))}`);
+        if (rule.maxAmount !== null && rule.maxAmount !== '') conditions.push(`valor ≤ ${formatCurrency(Number(rule.maxAmount))}`);
+        if (rule.bank) conditions.push(`banco: ${rule.bank}`);
+        if (rule.direction && rule.direction !== 'any') conditions.push(rule.direction === 'entrada' ? 'entradas' : 'saídas');
+
+        const error = ruleset.errors.get(rule.id);
+        const index = countsById.get(rule.id);
+        const matchCell = error ? `<span class="text-error">${escapeHtml(error)}</span>`
+            : index !== undefined ? `${preview.counts[index].toLocaleString('pt-BR')}` : '—';
+
+        const row = document.createElement('tr');
+        row.dataset.ruleId = rule.id;
+        row.innerHTML = `
+            <td class="py-2 px-3 text-sm">${position + 1}</td>
+            <td class="py-2 px-3 text-sm font-medium">${escapeHtml(rule.name || '(sem nome)')}${rule.enabled === false ? ' <span class="text-xs text-text-secondary">(desativada)</span>' : ''}</td>
+            <td class="py-2 px-3 text-xs text-text-secondary">${escapeHtml(conditions.join(' · ') || 'qualquer transação')}</td>
+            <td class="py-2 px-3 text-xs">${escapeHtml([rule.target.level1, rule.target.level2, rule.target.level3].filter(Boolean).join(' › '))}</td>
+            <td class="py-2 px-3 text-sm text-right">${matchCell}</td>
+            <td class="py-2 px-3 text-center whitespace-nowrap">
+                <button class="btn btn--sm btn--ghost rule-action" data-action="up" title="Subir prioridade">↑</button>
+                <button class="btn btn--sm btn--ghost rule-action" data-action="down" title="Descer prioridade">↓</button>
+                <button class="btn btn--sm btn--ghost rule-action" data-action="edit" title="Editar">Editar</button>
+                <button class="btn btn--sm btn--ghost rule-action" data-action="delete" title="Excluir">Excluir</button>
+            </td>
+        `;
+        tbody.appendChild(row);
+
+        // Exemplos das correspondências logo abaixo da regra
+        if (index !== undefined && preview.samples[index].length > 0) {
+            const samplesRow = document.createElement('tr');
+            samplesRow.innerHTML = `<td></td><td colspan="5" class="pb-3 px-3 text-xs text-text-secondary">${
+                preview.samples[index].map(t => escapeHtml(t['Descrição Original'] || '')).join(' · ')
+            }</td>`;
+            tbody.appendChild(samplesRow);
         }
+    });
+}
+
+/**
+ * Escapa texto para inserção em HTML
+ */
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+/**
+ * Limpa o formulário de regra (e recarrega as opções do plano de contas)
+ */
+function resetClassificationRuleForm() {
+    const form = document.getElementById('classificationRuleForm');
+    if (!form) return;
+
+    form.reset();
+    form.querySelector('#ruleId').value = '';
+
+    fillClassificationLevel1(form.querySelector('.classification-level-1'));
+    setCardClassification(form, '', '', '');
+}
+
+/**
+ * Carrega uma regra no formulário para edição
+ */
+function editClassificationRule(ruleId) {
+    const rule = getClassificationRules().find(item => item.id === ruleId);
+    const form = document.getElementById('classificationRuleForm');
+    if (!rule || !form) return;
+
+    resetClassificationRuleForm();
+    form.querySelector('#ruleId').value = rule.id;
+    form.querySelector('#ruleName').value = rule.name || '';
+    form.querySelector('#ruleKeywords').value = (rule.keywords || []).join(', ');
+    form.querySelector('#ruleRegex').value = rule.regex || '';
+    form.querySelector('#ruleMinAmount').value = rule.minAmount ?? '';
+    form.querySelector('#ruleMaxAmount').value = rule.maxAmount ?? '';
+    form.querySelector('#ruleBank').value = rule.bank || '';
+    form.querySelector('#ruleDirection').value = rule.direction || 'any';
+    form.querySelector('#ruleEnabled').checked = rule.enabled !== false;
+    setCardClassification(form, rule.target.level1, rule.target.level2, rule.target.level3);
+}
+
+/**
+ * Salva a regra do formulário (nova ou editada)
+ */
+async function saveClassificationRuleFromForm() {
+    try {
+        const form = document.getElementById('classificationRuleForm');
+        if (!form) return;
+
+        const value = selector => form.querySelector(selector).value.trim();
+        const amount = selector => value(selector) === '' ? null : parseValue(value(selector));
+        const level1 = form.querySelector('.classification-level-1').value;
+
+        if (!level1) {
+            showNotification('Selecione a classificação de destino (nível 1)', 'warning');
+            return;
+        }
+        if (value('#ruleRegex')) {
+            new RegExp(value('#ruleRegex'), 'i');
+        }
+
+        const rule = {
+            id: value('#ruleId') || generateId(),
+            name: value('#ruleName') || 'Nova regra',
+            keywords: value('#ruleKeywords').split(',').map(keyword => keyword.trim()).filter(Boolean),
+            regex: value('#ruleRegex'),
+            minAmount: amount('#ruleMinAmount'),
+            maxAmount: amount('#ruleMaxAmount'),
+            bank: value('#ruleBank'),
+            direction: form.querySelector('#ruleDirection').value,
+            enabled: form.querySelector('#ruleEnabled').checked,
+            target: {
+                level1,
+                level2: form.querySelector('.classification-level-2').value,
+                level3: form.querySelector('.classification-level-3').value
+            }
+        };
+
+        const rules = getClassificationRules();
+        const index = rules.findIndex(item => item.id === rule.id);
+        if (index === -1) rules.push(rule);
+        else rules[index] = rule;
+
+        await saveAppData();
+        resetClassificationRuleForm();
+        renderClassificationRules();
+        showNotification(`Regra "${rule.name}" salva`, 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro ao salvar regra:', error);
+        showNotification('Erro ao salvar regra: ' + error.message, 'error');
+    }
+}
+
+/**
+ * Ações da lista de regras: mover, editar, excluir
+ */
+async function handleClassificationRuleAction(ruleId, action) {
+    const rules = getClassificationRules();
+    const index = rules.findIndex(rule => rule.id === ruleId);
+    if (index === -1) return;
+
+    if (action === 'edit') {
+        editClassificationRule(ruleId);
+        return;
+    }
+
+    if (action === 'delete') {
+        if (!confirm(`Excluir a regra "${rules[index].name}"?`)) return;
+        rules.splice(index, 1);
+    } else {
+        const target = action === 'up' ? index - 1 : index + 1;
+        if (target < 0 || target >= rules.length) return;
+        [rules[index], rules[target]] = [rules[target], rules[index]];
+    }
+
+    await saveAppData();
+    renderClassificationRules();
+}
+
+/**
+ * Pré-visualiza quantas pendentes cada regra classificaria
+ */
+function previewClassificationRules() {
+    try {
+        const overwrite = document.getElementById('rulesOverwrite')?.checked || false;
+        const pending = getPendingTransactions();
+
+        const start = performance.now();
+        const preview = runClassificationRules(pending, overwrite);
+        const elapsed = Math.round(performance.now() - start);
+
+        renderClassificationRules(preview);
+
+        const summary = document.getElementById('classificationRulesSummary');
+        if (summary) {
+            summary.textContent = `${preview.matches.length.toLocaleString('pt-BR')} de ${pending.length.toLocaleString('pt-BR')} pendentes seriam classificadas (${elapsed} ms)`;
+        }
+
+        return preview;
+
+    } catch (error) {
+        debugLog('error', 'Erro na pré-visualização das regras:', error);
+        showNotification('Erro na pré-visualização das regras', 'error');
+        return null;
+    }
+}
+
+/**
+ * Aplica as regras a todas as pendentes de uma vez
+ */
+async function applyClassificationRules() {
+    try {
+        const overwrite = document.getElementById('rulesOverwrite')?.checked || false;
+        const markReconciled = document.getElementById('rulesMarkReconciled')?.checked || false;
+
+        const start = performance.now();
+        const { matches } = runClassificationRules(getPendingTransactions(), overwrite);
+        if (matches.length === 0) {
+            showNotification('Nenhuma transação pendente atende às regras', 'info');
+            return;
+        }
+
+        const targets = new Map(matches.map(match => [match.transaction, match.target]));
+        updateTransactionsBatch(Array.from(targets.keys()), transaction => {
+            const target = targets.get(transaction);
+            const changes = {
+                'Classificação Nível 1': target.level1,
+                'Classificação Nível 2': target.level2 || '',
+                'Classificação Nível 3': target.level3 || ''
+            };
+            if (markReconciled) changes['Status Conciliação'] = 'Conciliado';
+            return changes;
+        });
+
+        debugLog('info', 'Regras aplicadas:', {
+            classified: matches.length,
+            ms: Math.round(performance.now() - start)
+        });
+
+        await saveAppData();
+        await loadReconciliation();
+        previewClassificationRules();
+
+        showNotification(`${matches.length.toLocaleString('pt-BR')} transações classificadas pelas regras`, 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro ao aplicar regras:', error);
+        showNotification('Erro ao aplicar regras', 'error');
+    }
+}
+
+// ==========================================
+// MEMÓRIA DE FAVORECIDOS
+// ==========================================
+
+/**
+ * Prefixos de meio de pagamento removidos do início da descrição
+ */
+const PAYEE_PREFIX_PATTERN = /^(?:(?:pix|ted|doc|tef|transf|transferencia|pagto|pgto|pagamento|pag|compra|debito|deb|credito|cred|boleto|cartao|enviado|enviada|recebido|recebida|env|rec|aut|automatico|para|de|do|da|em)\s+)+/;
+
+/**
+ * Termos que só acompanham números de documento
+ */
+const PAYEE_NOISE_WORDS = /\b(?:cpf|cnpj|nf|nfe|nfs|doc|docto|num|nr|no|final|parc|parcela)\b/g;
+
+/**
+ * Normaliza a descrição para identificar o favorecido: remove datas, números de
+ * documento, prefixos PIX/TED e finais de cartão
+ */
+function normalizePayee(transaction) {
+    const payee = normalizeQueryText(transaction['Descrição Original'] || '')
+        .replace(/\b\d{4}-\d{2}-\d{2}\b/g, ' ')
+        .replace(/\b\d{1,2}[/.-]\d{1,2}(?:[/.-]\d{2,4})?\b/g, ' ')
+        .replace(/[*x]{2,}\s*\d+/g, ' ')
+        .replace(/\S*\d\S*/g, ' ')
+        .replace(/[.']/g, '')
+        .replace(/[^a-z\s]/g, ' ')
+        .replace(PAYEE_NOISE_WORDS, ' ')
+        .replace(/\s+/g, ' ')
+        .trim()
+        .replace(PAYEE_PREFIX_PATTERN, '');
+
+    return payee || normalizeQueryText(transaction['Favorecido / Pagador Padronizado'] || '');
+}
+
+/**
+ * Tabela favorecido normalizado → última classificação confirmada.
+ * Na primeira leitura é montada a partir do histórico conciliado.
+ */
+function getPayeeMemo() {
+    if (appData.payeeMemo && typeof appData.payeeMemo === 'object') {
+        return appData.payeeMemo;
+    }
+
+    appData.payeeMemo = {};
+    appData.transactions.forEach(transaction => {
+        if (transaction['Status Conciliação'] !== 'Conciliado') return;
+        const entry = appData.payeeMemo[normalizePayee(transaction)];
+        if (!entry || (transaction['Data'] || '') >= entry.date) {
+            rememberPayeeClassification(transaction);
+        }
+    });
+
+    debugLog('info', 'Memória de favorecidos montada:', { payees: Object.keys(appData.payeeMemo).length });
+    return appData.payeeMemo;
+}
+
+/**
+ * Registra a classificação confirmada de uma transação para o seu favorecido
+ */
+function rememberPayeeClassification(transaction) {
+    const level1 = transaction['Classificação Nível 1'];
+    const payee = normalizePayee(transaction);
+    if (!level1 || !payee) return;
+
+    const memo = getPayeeMemo();
+    const previous = memo[payee];
+    memo[payee] = {
+        level1,
+        level2: transaction['Classificação Nível 2'] || '',
+        level3: transaction['Classificação Nível 3'] || '',
+        costCenter: transaction['Centro de Custo'] || '',
+        date: transaction['Data'] || '',
+        count: (previous ? previous.count : 0) + 1
+    };
+}
+
+/**
+ * Classificação memorizada para o favorecido da transação (ou null)
+ */
+function getPayeeMemoEntry(transaction) {
+    return getPayeeMemo()[normalizePayee(transaction)] || null;
+}
+
+/**
+ * Enter em um card (fora de botões e textos longos) concilia a transação.
+ * O card é reaproveitado para a próxima da fila, então Enter segue conciliando.
+ */
+function handleReconciliationKeydown(event) {
+    if (event.key !== 'Enter' || event.isComposing) return;
+    if (event.target.closest('button, textarea')) return;
+
+    const card = event.target.closest('.reconciliation-card');
+    if (!card || !card._transaction) return;
+
+    event.preventDefault();
+    reconcileTransaction(card._transaction.id);
+}
+
+// ==========================================
+// CLASSIFICADOR APRENDIDO (NAIVE BAYES)
+// ==========================================
+
+/**
+ * Chave do modelo no localStorage (separada de cfoProData para não pesar no salvamento geral)
+ */
+const CLASSIFIER_STORAGE_KEY = 'cfoProClassifierModel';
+
+/**
+ * Separador entre os níveis no rótulo de classe
+ */
+const CLASSIFIER_LABEL_SEPARATOR = '\u001f';
+
+/**
+ * Quantidade de sugestões por transação
+ */
+const CLASSIFIER_TOP_K = 3;
+
+/**
+ * Exemplos descartados (transações excluídas) antes de um retreino completo
+ */
+const CLASSIFIER_STALE_LIMIT = 0.1;
+
+/**
+ * Motor do classificador: naive Bayes multinomial sobre palavras da descrição,
+ * banco, direção e faixa de valor. É autocontido (não usa nada de fora da função)
+ * para que o mesmo código rode no worker, via toString(), ou na thread principal.
+ */
+function createNaiveBayesEngine() {
+    const SMOOTHING = 1;
+    const STOPWORDS = new Set(['das', 'dos', 'para', 'com', 'por', 'pelo', 'pela']);
+    let model = createEmptyModel();
+    let labelIndex = new Map();
+
+    function createEmptyModel() {
+        return { version: 1, labels: [], docs: [], features: [], counts: {}, vocabulary: 0, examples: 0, trained: {}, stale: 0 };
+    }
+
+    function setModel(next) {
+        model = next;
+        labelIndex = new Map(model.labels.map((label, index) => [label, index]));
+    }
+
+    function featurize(row) {
+        const features = new Set();
+        const text = String(row.text || '').normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+        text.split(/[^a-z]+/).forEach(token => {
+            if (token.length >= 3 && !STOPWORDS.has(token)) features.add('w:' + token);
+        });
+        if (row.bank) features.add('b:' + row.bank);
+        features.add('d:' + row.direction);
+        features.add('a:' + (row.amount >= 1 ? Math.floor(Math.log2(row.amount)) : 0));
+        return features;
+    }
+
+    function learn(row, label, sign) {
+        let classIndex = typeof label === 'number' ? label : labelIndex.get(label);
+        if (classIndex === undefined) {
+            if (sign < 0) return;
+            classIndex = model.labels.length;
+            model.labels.push(label);
+            model.docs.push(0);
+            model.features.push(0);
+            labelIndex.set(label, classIndex);
+        }
+
+        model.docs[classIndex] += sign;
+        model.examples += sign;
+
+        featurize(row).forEach(feature => {
+            let entry = model.counts[feature];
+            if (sign < 0) {
+                // A descrição pode ter mudado desde o treino: só desconta o que foi contado
+                if (!entry || !entry[classIndex]) return;
+            } else if (!entry) {
+                entry = model.counts[feature] = {};
+                model.vocabulary++;
+            }
+            const next = (entry[classIndex] || 0) + sign;
+            if (next > 0) entry[classIndex] = next;
+            else delete entry[classIndex];
+            model.features[classIndex] += sign;
+        });
+
+        return classIndex;
+    }
+
+    /**
+     * Aplica um delta de treino: remove (exemplos que mudaram), forget (ids que
+     * sumiram, sem dados para descontar) e add (exemplos novos ou reclassificados).
+     * trained guarda id → índice da classe aprendida.
+     */
+    function train(message) {
+        const start = Date.now();
+        if (message.reset) setModel(createEmptyModel());
+        else if (message.model) setModel(message.model);
+
+        (message.remove || []).forEach(row => {
+            learn(row, model.trained[row.id], -1);
+            delete model.trained[row.id];
+        });
+        (message.forget || []).forEach(id => {
+            delete model.trained[id];
+            model.stale++;
+        });
+        (message.add || []).forEach(row => {
+            model.trained[row.id] = learn(row, row.label, 1);
+        });
+
+        return { model, ms: Date.now() - start };
+    }
+
+    /**
+     * Top-k classes por linha, com confiança normalizada (softmax das log-probabilidades)
+     */
+    function predict(message) {
+        const start = Date.now();
+        const k = message.k || 3;
+        const classCount = model.labels.length;
+        const results = [];
+        if (classCount === 0 || model.examples <= 0) return { results, ms: 0 };
+
+        const logSmoothing = Math.log(SMOOTHING);
+        const vocabulary = Math.max(1, model.vocabulary);
+        const prior = new Float64Array(classCount);
+        const logDenominator = new Float64Array(classCount);
+        for (let c = 0; c < classCount; c++) {
+            prior[c] = model.docs[c] > 0 ? Math.log(model.docs[c] / model.examples) : -Infinity;
+            logDenominator[c] = Math.log(model.features[c] + SMOOTHING * vocabulary);
+        }
+
+        // Pesos esparsos por termo, calculados uma vez por lote
+        const weights = new Map();
+        const getWeights = feature => {
+            let weight = weights.get(feature);
+            if (weight === undefined) {
+                const entry = model.counts[feature];
+                weight = null;
+                if (entry) {
+                    const keys = Object.keys(entry);
+                    weight = { classes: new Int32Array(keys.length), values: new Float64Array(keys.length) };
+                    keys.forEach((key, i) => {
+                        weight.classes[i] = Number(key);
+                        weight.values[i] = Math.log(entry[key] + SMOOTHING) - logSmoothing;
+                    });
+                }
+                weights.set(feature, weight);
+            }
+            return weight;
+        };
+
+        const scores = new Float64Array(classCount);
+        message.rows.forEach(row => {
+            const known = [];
+            featurize(row).forEach(feature => {
+                const weight = getWeights(feature);
+                if (weight) known.push(weight);
+            });
+
+            // Termos ausentes da classe contribuem com log(α); só os presentes são somados
+            for (let c = 0; c < classCount; c++) {
+                scores[c] = prior[c] + known.length * (logSmoothing - logDenominator[c]);
+            }
+            known.forEach(({ classes, values }) => {
+                for (let i = 0; i < classes.length; i++) scores[classes[i]] += values[i];
+            });
+
+            const top = [];
+            for (let c = 0; c < classCount; c++) {
+                if (scores[c] === -Infinity) continue;
+                if (top.length === k && scores[c] <= top[k - 1].score) continue;
+                let position = top.length < k ? top.length : k - 1;
+                while (position > 0 && top[position - 1].score < scores[c]) position--;
+                top.splice(position, 0, { index: c, score: scores[c] });
+                if (top.length > k) top.pop();
+            }
+            if (top.length === 0) return;
+
+            const max = top[0].score;
+            let total = 0;
+            for (let c = 0; c < classCount; c++) total += Math.exp(scores[c] - max);
+
+            results.push({
+                id: row.id,
+                suggestions: top.map(({ index, score }) => ({
+                    label: model.labels[index],
+                    confidence: Math.exp(score - max) / total
+                }))
+            });
+        });
+
+        return { results, ms: Date.now() - start };
+    }
+
+    function load(next) {
+        setModel(next);
+        return { model };
+    }
+
+    return { train, predict, load };
+}
+
+/**
+ * Envia uma operação ao classificador (worker ou thread principal)
+ */
+function callClassifier(type, payload) {
+    return callEngine(appState.classifier, createNaiveBayesEngine, type, payload);
+}
+
+/**
+ * Lê o modelo salvo (null se não houver ou se estiver em formato antigo)
+ */
+function loadClassifierModel() {
+    try {
+        const saved = localStorage.getItem(CLASSIFIER_STORAGE_KEY);
+        const model = saved ? JSON.parse(saved) : null;
+        return model && model.version === 1 ? model : null;
+    } catch (error) {
+        debugLog('warn', 'Modelo do classificador ignorado:', error.message);
+        return null;
+    }
+}
+
+/**
+ * Salva o modelo em chave própria do localStorage
+ */
+function saveClassifierModel(model) {
+    try {
+        localStorage.setItem(CLASSIFIER_STORAGE_KEY, JSON.stringify(model));
+    } catch (error) {
+        debugLog('warn', 'Não foi possível salvar o modelo do classificador:', error.message);
+    }
+}
+
+/**
+ * Rótulo de treino de uma transação ('' se ainda não conciliada/classificada)
+ */
+function getClassifierLabel(transaction) {
+    if (transaction['Status Conciliação'] !== 'Conciliado' || !transaction['Classificação Nível 1']) return '';
+    return [
+        transaction['Classificação Nível 1'],
+        transaction['Classificação Nível 2'] || '',
+        transaction['Classificação Nível 3'] || ''
+    ].join(CLASSIFIER_LABEL_SEPARATOR);
+}
+
+/**
+ * Campos da transação enviados ao motor
+ */
+function getClassifierRow(transaction) {
+    const income = parseValue(transaction['Entrada (R$)']);
+    const expense = parseValue(transaction['Saída (R$)']);
+    return {
+        id: transaction.id,
+        text: `${transaction['Descrição Original'] || ''} ${transaction['Favorecido / Pagador Padronizado'] || ''}`,
+        bank: transaction['Banco Origem/Destino'] || '',
+        direction: income > 0 ? 'entrada' : 'saida',
+        amount: Math.abs(income > 0 ? income : expense)
+    };
+}
+
+/**
+ * Treina o modelo de forma incremental com o histórico conciliado.
+ * As chamadas são enfileiradas para que dois deltas nunca partam do mesmo modelo.
+ */
+function syncClassifierModel() {
+    const classifier = appState.classifier;
+    classifier.chain = classifier.chain.then(runClassifierSync, runClassifierSync);
+    return classifier.chain;
+}
+
+/**
+ * Calcula o delta entre o histórico atual e o que o modelo já aprendeu, e treina
+ */
+async function runClassifierSync() {
+    const classifier = appState.classifier;
+    if (!classifier.loaded && !classifier.model) {
+        classifier.model = loadClassifierModel();
+    }
+
+    const model = classifier.model;
+    const trained = model ? model.trained : {};
+    const add = [];
+    const remove = [];
+    const forget = [];
+
+    appData.transactions.forEach(transaction => {
+        const label = getClassifierLabel(transaction);
+        const previous = trained[transaction.id];
+        if (label === (previous === undefined ? '' : model.labels[previous])) return;
+
+        const row = getClassifierRow(transaction);
+        if (previous !== undefined) remove.push(row);
+        if (label) add.push({ ...row, label });
+    });
+
+    Object.keys(trained).forEach(id => {
+        if (!getTransactionById(id)) forget.push(id);
+    });
+
+    const examples = model ? model.examples : 0;
+    const stale = (model ? model.stale : 0) + forget.length;
+    const reset = stale > Math.max(50, examples * CLASSIFIER_STALE_LIMIT);
+    const payload = reset
+        ? { reset: true, add: appData.transactions.filter(getClassifierLabel).map(transaction => ({ ...getClassifierRow(transaction), label: getClassifierLabel(transaction) })) }
+        : { add, remove, forget };
+
+    if (classifier.loaded && !reset && add.length === 0 && remove.length === 0 && forget.length === 0) {
+        return classifier.model;
+    }
+    if (!classifier.loaded && !reset) payload.model = model;
+
+    const result = await callClassifier('train', payload);
+    classifier.model = result.model;
+    classifier.loaded = true;
+    classifier.stats = {
+        ...classifier.stats,
+        trainMs: result.ms,
+        trained: payload.add.length + (payload.remove ? payload.remove.length : 0),
+        fullRetrain: reset
+    };
+
+    if (reset || add.length > 0 || remove.length > 0 || forget.length > 0) {
+        saveClassifierModel(result.model);
+    }
+
+    debugLog('info', 'Classificador treinado:', {
+        examples: result.model.examples,
+        classes: result.model.labels.length,
+        delta: classifier.stats.trained,
+        fullRetrain: reset,
+        ms: result.ms
+    });
+
+    return classifier.model;
+}
+
+/**
+ * Agenda um treino incremental (após conciliações individuais)
+ */
+function scheduleClassifierTraining() {
+    const classifier = appState.classifier;
+    clearTimeout(classifier.trainTimer);
+    classifier.trainTimer = setTimeout(() => {
+        classifier.trainTimer = null;
+        syncClassifierModel().catch(error => debugLog('warn', 'Erro no treino do classificador:', error));
+    }, 1500);
+}
+
+/**
+ * Treina (se preciso) e calcula as sugestões de todas as pendentes em um único lote
+ */
+async function refreshClassifierSuggestions() {
+    const classifier = appState.classifier;
+    const token = (classifier.refreshToken || 0) + 1;
+    classifier.refreshToken = token;
+
+    try {
+        const model = await syncClassifierModel();
+        const pending = getPendingTransactions();
+
+        if (!model || model.examples <= 0) {
+            classifier.suggestions = new Map();
+            updateClassifierStatus();
+            return;
+        }
+
+        const start = performance.now();
+        const result = await callClassifier('predict', { rows: pending.map(getClassifierRow), k: CLASSIFIER_TOP_K });
+        if (classifier.refreshToken !== token) return;
+
+        classifier.suggestions = new Map(result.results.map(item => [item.id, item.suggestions]));
+        classifier.stats = {
+            ...classifier.stats,
+            predictMs: result.ms,
+            roundTripMs: Math.round(performance.now() - start),
+            predicted: pending.length
+        };
+
+        debugLog('info', 'Sugestões do classificador calculadas:', classifier.stats);
+
+        appState.reconciliationQueue?.cards.forEach(renderCardSuggestions);
+        updateClassifierStatus();
+
+    } catch (error) {
+        debugLog('error', 'Erro ao calcular sugestões do classificador:', error);
+    }
+}
+
+/**
+ * Resumo do modelo e dos tempos de treino/inferência
+ */
+function updateClassifierStatus() {
+    const element = document.getElementById('classifierStatus');
+    if (!element) return;
+
+    const { model, stats, worker } = appState.classifier;
+    if (!model || model.examples <= 0) {
+        element.textContent = 'Classificador: sem histórico conciliado para aprender ainda.';
+        return;
+    }
+
+    const parts = [
+        `Classificador: ${model.examples.toLocaleString('pt-BR')} exemplos, ${model.labels.length} classes`
+    ];
+    if (stats?.trainMs !== undefined) {
+        parts.push(`treino ${stats.trainMs} ms (${stats.fullRetrain ? 'completo' : `${stats.trained.toLocaleString('pt-BR')} novos`})`);
+    }
+    if (stats?.predictMs !== undefined) {
+        parts.push(`inferência ${stats.predictMs} ms para ${stats.predicted.toLocaleString('pt-BR')} pendentes`);
+    }
+    parts.push(worker ? 'em segundo plano' : 'na thread principal');
+
+    element.textContent = parts.join(' · ');
+}
+
+/**
+ * Mostra as sugestões do classificador em um card da fila
+ */
+function renderCardSuggestions(card) {
+    const element = card._fields.suggestions;
+    if (!element) return;
+
+    const transaction = card._transaction;
+    const suggestions = transaction ? appState.classifier.suggestions.get(transaction.id) : null;
+    if (element._suggestions === suggestions) return;
+    element._suggestions = suggestions;
+
+    if (!suggestions || suggestions.length === 0) {
+        element.innerHTML = '';
+        element.hidden = true;
+        return;
+    }
+
+    element.hidden = false;
+    element.innerHTML = '<span class="text-xs text-text-secondary">Sugestões:</span>' +
+        suggestions.map((suggestion, index) => {
+            const levels = suggestion.label.split(CLASSIFIER_LABEL_SEPARATOR).filter(Boolean);
+            return `<button type="button" class="btn btn--outline btn--sm classifier-suggestion" data-suggestion="${index}" title="${escapeHtml(levels.join(' › '))}">
+                ${escapeHtml(levels[levels.length - 1])}
+                <span class="text-xs text-text-secondary">${Math.round(suggestion.confidence * 100)}%</span>
+            </button>`;
+        }).join('');
+}
+
+/**
+ * Aplica no card a sugestão clicada
+ */
+function applyClassifierSuggestion(button) {
+    const card = button.closest('.reconciliation-card');
+    const suggestions = card?._fields.suggestions._suggestions;
+    const suggestion = suggestions?.[Number(button.dataset.suggestion)];
+    if (!suggestion) return;
+
+    const [level1, level2 = '', level3 = ''] = suggestion.label.split(CLASSIFIER_LABEL_SEPARATOR);
+    setCardClassification(card, level1, level2, level3);
+
+    // Registra como rascunho do card
+    card._form.level1.dispatchEvent(new Event('input', { bubbles: true }));
+}
+
+// ==========================================
+// CONCILIAÇÃO COM LANÇAMENTOS PREVISTOS
+// ==========================================
+
+/**
+ * Correspondências exibidas na tabela de resultados
+ */
+const EXPECTED_MATCH_PREVIEW_ROWS = 200;
+
+/**
+ * Motor de correspondência extrato × previstos. Autocontido, roda no worker.
+ * Os previstos são indexados por (faixa de valor em centavos, faixa de data), com
+ * largura das faixas igual à tolerância: cada linha do extrato só consulta as 9
+ * células vizinhas, então o custo cresce com n, não com n × m.
+ * Conflitos são resolvidos de forma gulosa pela pontuação (valor, data e
+ * semelhança de trigramas da descrição), em passadas sucessivas para quem ficou sem par.
+ */
+function createMatchingEngine() {
+    const MAX_PASSES = 4;
+    const CANDIDATES_PER_ROW = 8;
+    const SCAN_LIMIT = 64;
+
+    // Espaço → 0, dígitos → 1..10, letras → 11..36
+    const code = char => char === 32 ? 0 : char <= 57 ? char - 47 : char - 86;
+
+    function trigrams(text) {
+        let normalized = String(text || '');
+        if (/[^\x00-\x7f]/.test(normalized)) {
+            normalized = normalized.normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+        }
+        normalized = ' ' + normalized.toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim() + ' ';
+
+        const hashes = new Int32Array(Math.max(0, normalized.length - 2));
+        for (let i = 0; i < hashes.length; i++) {
+            hashes[i] = code(normalized.charCodeAt(i)) * 1369 +
+                code(normalized.charCodeAt(i + 1)) * 37 +
+                code(normalized.charCodeAt(i + 2));
+        }
+        hashes.sort();
+
+        // Remove repetidos (conjunto ordenado)
+        let size = 0;
+        for (let i = 0; i < hashes.length; i++) {
+            if (size === 0 || hashes[i] !== hashes[size - 1]) hashes[size++] = hashes[i];
+        }
+        return hashes.subarray(0, size);
+    }
+
+    function similarity(a, b) {
+        if (a.length === 0 || b.length === 0) return 0;
+        let i = 0;
+        let j = 0;
+        let shared = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] === b[j]) { shared++; i++; j++; }
+            else if (a[i] < b[j]) i++;
+            else j++;
+        }
+        return shared / (a.length + b.length - shared);
+    }
+
+    function match(message) {
+        const start = Date.now();
+        const { bank, expected } = message;
+        const amountTolerance = Math.max(0, Math.round(message.amountToleranceCents || 0));
+        const dayTolerance = Math.max(0, Math.round(message.dayTolerance || 0));
+        const amountWidth = amountTolerance + 1;
+        const dayWidth = dayTolerance + 1;
+
+        // Índice: faixa de valor → faixa de data → previstos
+        const index = new Map();
+        expected.forEach((entry, e) => {
+            const amountBucket = Math.floor(entry.cents / amountWidth);
+            const dayBucket = Math.floor(entry.day / dayWidth);
+            let days = index.get(amountBucket);
+            if (!days) index.set(amountBucket, days = new Map());
+            let cell = days.get(dayBucket);
+            if (!cell) days.set(dayBucket, cell = []);
+            cell.push(e);
+        });
+
+        const bankGrams = new Array(bank.length);
+        const expectedGrams = new Array(expected.length);
+        const bankTaken = new Uint8Array(bank.length);
+        const expectedTaken = new Uint8Array(expected.length);
+        const matches = [];
+        let evaluated = 0;
+        let passes = 0;
+
+        // Com tolerância zero, as células vizinhas nunca têm candidatos
+        const amountReach = amountTolerance > 0 ? 1 : 0;
+        const dayReach = dayTolerance > 0 ? 1 : 0;
+
+        for (let pass = 0; pass < MAX_PASSES; pass++) {
+            passes++;
+            const candidates = [];
+
+            // Previstos já atribuídos saem das células
+            if (pass > 0) {
+                index.forEach((days, amountBucket) => {
+                    days.forEach((cell, dayBucket) => {
+                        const open = cell.filter(e => !expectedTaken[e]);
+                        if (open.length > 0) days.set(dayBucket, open);
+                        else days.delete(dayBucket);
+                    });
+                    if (days.size === 0) index.delete(amountBucket);
+                });
+            }
+
+            bank.forEach((row, b) => {
+                if (bankTaken[b]) return;
+                const amountBucket = Math.floor(row.cents / amountWidth);
+                const dayBucket = Math.floor(row.day / dayWidth);
+                const best = [];
+
+                for (let da = -amountReach; da <= amountReach; da++) {
+                    const days = index.get(amountBucket + da);
+                    if (!days) continue;
+
+                    for (let dd = -dayReach; dd <= dayReach; dd++) {
+                        const cell = days.get(dayBucket + dd);
+                        if (!cell) continue;
+
+                        // Células muito cheias (valores repetidos) são varridas em rodízio,
+                        // para que linhas diferentes vejam candidatos diferentes
+                        const limit = Math.min(cell.length, SCAN_LIMIT);
+                        const offset = cell.length > SCAN_LIMIT ? (cell.cursor || 0) : 0;
+                        if (cell.length > SCAN_LIMIT) cell.cursor = (offset + CANDIDATES_PER_ROW) % cell.length;
+
+                        for (let k = 0; k < limit; k++) {
+                            const e = cell[(offset + k) % cell.length];
+                            const entry = expected[e];
+                            const amountDiff = Math.abs(entry.cents - row.cents);
+                            const dayDiff = Math.abs(entry.day - row.day);
+                            if (amountDiff > amountTolerance || dayDiff > dayTolerance) continue;
+                            if (entry.direction && entry.direction !== row.direction) continue;
+
+                            evaluated++;
+                            if (!bankGrams[b]) bankGrams[b] = trigrams(row.text);
+                            if (!expectedGrams[e]) expectedGrams[e] = trigrams(entry.text);
+                            const score = 0.5 * (1 - amountDiff / amountWidth) +
+                                0.2 * (1 - dayDiff / dayWidth) +
+                                0.3 * similarity(bankGrams[b], expectedGrams[e]);
+
+                            if (best.length === CANDIDATES_PER_ROW && score <= best[best.length - 1].score) continue;
+                            let position = best.length;
+                            while (position > 0 && best[position - 1].score < score) position--;
+                            best.splice(position, 0, { b, e, score, amountDiff, dayDiff });
+                            if (best.length > CANDIDATES_PER_ROW) best.pop();
+                        }
+                    }
+                }
+
+                for (let i = 0; i < best.length; i++) candidates.push(best[i]);
+            });
+
+            if (candidates.length === 0) break;
+
+            candidates.sort((x, y) => y.score - x.score);
+            let assigned = 0;
+            candidates.forEach(candidate => {
+                if (bankTaken[candidate.b] || expectedTaken[candidate.e]) return;
+                bankTaken[candidate.b] = 1;
+                expectedTaken[candidate.e] = 1;
+                matches.push({
+                    bankId: bank[candidate.b].id,
+                    expectedId: expected[candidate.e].id,
+                    score: candidate.score,
+                    amountDiff: candidate.amountDiff,
+                    dayDiff: candidate.dayDiff
+                });
+                assigned++;
+            });
+            if (assigned === 0) break;
+        }
+
+        return { matches, evaluated, passes, ms: Date.now() - start };
+    }
+
+    return { match };
+}
+
+/**
+ * Lançamentos previstos importados (contas a pagar/receber, faturas)
+ */
+function getExpectedEntries() {
+    if (!Array.isArray(appData.expectedEntries)) {
+        appData.expectedEntries = [];
+    }
+    return appData.expectedEntries;
+}
+
+/**
+ * Direção de um previsto (1 entrada, -1 saída, 0 desconhecida).
+ * Previstos importados antes do campo direction só têm o sinal do valor.
+ */
+function getExpectedEntryDirection(entry) {
+    if (entry.direction !== undefined) return entry.direction;
+    return entry.amount < 0 ? -1 : 0;
+}
+
+/**
+ * Converte o CSV de previstos. Colunas reconhecidas (sem acento/caixa):
+ * data/vencimento, valor (ou entrada/saída), descrição/histórico/favorecido,
+ * documento/nf e tipo (pagar/receber). Aceita vírgula ou ponto e vírgula.
+ * Sem tipo nem colunas de entrada/saída, valores positivos ficam sem direção.
+ */
+function parseExpectedEntriesCSV(content) {
+    const lines = content.replace(/^\uFEFF/, '').split(/\r?\n/).filter(line => line.trim());
+    if (lines.length < 2) {
+        throw new Error('Arquivo de previstos vazio ou apenas com cabeçalho');
+    }
+
+    const delimiter = (lines[0].match(/;/g) || []).length > (lines[0].match(/,/g) || []).length ? ';' : ',';
+    const headers = parseCSVLine(lines[0], delimiter).map(normalizeQueryText);
+    const column = (...names) => headers.findIndex(header => names.some(name => header === name || header.startsWith(name)));
+
+    const columns = {
+        date: column('data', 'vencimento', 'dt'),
+        amount: column('valor', 'montante'),
+        income: column('entrada', 'credito', 'receber'),
+        expense: column('saida', 'debito', 'pagar'),
+        description: column('descricao', 'historico', 'favorecido', 'cliente', 'fornecedor'),
+        document: column('documento', 'doc', 'nf', 'numero'),
+        kind: column('tipo', 'natureza')
+    };
+
+    if (columns.date === -1 || (columns.amount === -1 && columns.income === -1 && columns.expense === -1)) {
+        throw new Error('O CSV de previstos precisa das colunas Data e Valor');
+    }
+
+    const entries = [];
+    for (let i = 1; i < lines.length; i++) {
+        const values = parseCSVLine(lines[i], delimiter);
+        const cell = index => index === -1 ? '' : (values[index] || '');
+
+        let amount = columns.amount !== -1
+            ? parseValue(cell(columns.amount))
+            : parseValue(cell(columns.income)) - parseValue(cell(columns.expense));
+
+        // Direção (1 entrada, -1 saída) só quando o arquivo a informa: coluna Tipo,
+        // colunas separadas de entrada/saída ou valor negativo. Sem ela (0), o valor
+        // positivo pode ser tanto a receber quanto a pagar.
+        let direction = columns.amount === -1 || amount < 0 ? Math.sign(amount) : 0;
+        const kind = normalizeQueryText(cell(columns.kind));
+        if (/^(pagar|saida|debito|despesa)/.test(kind)) direction = -1;
+        else if (/^(receber|entrada|credito|receita)/.test(kind)) direction = 1;
+        if (direction !== 0) amount = direction * Math.abs(amount);
+
+        const date = parseDate(cell(columns.date));
+        if (!amount || !date) continue;
+
+        entries.push({
+            id: generateId(),
+            date,
+            amount,
+            direction,
+            description: cell(columns.description),
+            document: cell(columns.document),
+            transactionId: null,
+            score: null
+        });
+    }
+
+    return entries;
+}
+
+/**
+ * Importa o arquivo de previstos (substitui os ainda não conciliados)
+ */
+async function importExpectedEntries(file) {
+    try {
+        const content = await file.text();
+        const entries = parseExpectedEntriesCSV(content);
+
+        appData.expectedEntries = getExpectedEntries()
+            .filter(entry => entry.transactionId)
+            .concat(entries);
+        appState.matching.result = null;
+        await saveAppData();
+
+        renderExpectedMatches();
+        showNotification(`${entries.length.toLocaleString('pt-BR')} lançamentos previstos importados`, 'success');
+        debugLog('info', 'Previstos importados:', { file: file.name, entries: entries.length });
+
+    } catch (error) {
+        debugLog('error', 'Erro ao importar previstos:', error);
+        showNotification('Erro: ' + error.message, 'error');
+    }
+}
+
+/**
+ * Executa a correspondência entre o extrato e os previstos ainda em aberto
+ */
+async function runExpectedEntryMatching() {
+    const matching = appState.matching;
+    if (matching.running) return;
+
+    try {
+        const dayTolerance = parseInt(document.getElementById('matchDayTolerance')?.value, 10) || 0;
+        const amountTolerance = parseValue(document.getElementById('matchAmountTolerance')?.value || '0');
+
+        const open = getExpectedEntries().filter(entry => !entry.transactionId);
+        if (open.length === 0) {
+            showNotification('Não há lançamentos previstos em aberto', 'warning');
+            return;
+        }
+
+        const linked = new Set(getExpectedEntries().map(entry => entry.transactionId).filter(Boolean));
+        const bank = [];
+        appData.transactions.forEach(transaction => {
+            if (linked.has(transaction.id)) return;
+            const day = toEpochDay(transaction['Data']);
+            if (isNaN(day)) return;
+            const cents = toCents(transaction['Entrada (R$)']) - toCents(transaction['Saída (R$)']);
+            bank.push({
+                id: transaction.id,
+                cents: Math.abs(cents),
+                direction: Math.sign(cents),
+                day,
+                text: `${transaction['Descrição Original'] || ''} ${transaction['Favorecido / Pagador Padronizado'] || ''}`
+            });
+        });
+
+        // Comparação pelo valor absoluto; a direção, quando conhecida, filtra os candidatos
+        const expected = open.map(entry => ({
+            id: entry.id,
+            cents: Math.abs(toCents(entry.amount)),
+            direction: getExpectedEntryDirection(entry),
+            day: toEpochDay(entry.date),
+            text: `${entry.description} ${entry.document}`
+        }));
+
+        matching.running = true;
+        setMatchingSummary('Procurando correspondências...');
+
+        const start = performance.now();
+        const result = await callEngine(matching, createMatchingEngine, 'match', {
+            bank,
+            expected,
+            dayTolerance,
+            amountToleranceCents: toCents(amountTolerance)
+        });
+
+        matching.result = { ...result, bankCount: bank.length, expectedCount: expected.length };
+        debugLog('info', 'Correspondência com previstos:', {
+            bank: bank.length,
+            expected: expected.length,
+            matches: result.matches.length,
+            evaluated: result.evaluated,
+            passes: result.passes,
+            ms: result.ms,
+            roundTripMs: Math.round(performance.now() - start)
+        });
+
+        renderExpectedMatches();
+
+    } catch (error) {
+        debugLog('error', 'Erro na correspondência com previstos:', error);
+        showNotification('Erro na correspondência com previstos', 'error');
+    } finally {
+        matching.running = false;
+    }
+}
+
+/**
+ * Texto de resumo do painel de previstos
+ */
+function setMatchingSummary(text) {
+    const summary = document.getElementById('expectedMatchSummary');
+    if (summary) summary.textContent = text;
+}
+
+/**
+ * Mostra o resultado da última correspondência
+ */
+function renderExpectedMatches() {
+    const tbody = document.getElementById('expectedMatchBody');
+    const acceptButton = document.getElementById('acceptExpectedMatches');
+    const entries = getExpectedEntries();
+    const result = appState.matching.result;
+    const openCount = entries.filter(entry => !entry.transactionId).length;
+
+    if (acceptButton) acceptButton.disabled = !result || result.matches.length === 0;
+    if (!tbody) return;
+
+    tbody.innerHTML = '';
+    if (!result) {
+        setMatchingSummary(`${entries.length.toLocaleString('pt-BR')} previstos (${openCount.toLocaleString('pt-BR')} em aberto)`);
+        return;
+    }
+
+    setMatchingSummary(
+        `${result.matches.length.toLocaleString('pt-BR')} correspondências entre ${result.expectedCount.toLocaleString('pt-BR')} previstos ` +
+        `e ${result.bankCount.toLocaleString('pt-BR')} lançamentos do extrato · ${result.evaluated.toLocaleString('pt-BR')} pares avaliados em ${result.ms} ms`
+    );
+
+    const byId = new Map(entries.map(entry => [entry.id, entry]));
+    const fragment = document.createDocumentFragment();
+    result.matches.slice(0, EXPECTED_MATCH_PREVIEW_ROWS).forEach(match => {
+        const transaction = getTransactionById(match.bankId);
+        const entry = byId.get(match.expectedId);
+        if (!transaction || !entry) return;
+
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td class="py-2 px-3 text-sm">${formatDate(transaction['Data'])}</td>
+            <td class="py-2 px-3 text-sm">${escapeHtml(transaction['Descrição Original'] || '')}</td>
+            <td class="py-2 px-3 text-sm">${formatDate(entry.date)}</td>
+            <td class="py-2 px-3 text-sm">${escapeHtml([entry.description, entry.document].filter(Boolean).join(' · '))}</td>
+            <td class="py-2 px-3 text-sm text-right">${formatCurrency(entry.amount)}</td>
+            <td class="py-2 px-3 text-xs text-right text-text-secondary">${formatCurrency(match.amountDiff / 100)} · ${match.dayDiff} d</td>
+            <td class="py-2 px-3 text-sm text-right">${Math.round(match.score * 100)}%</td>
+        `;
+        fragment.appendChild(row);
+    });
+    tbody.appendChild(fragment);
+}
+
+/**
+ * Grava as correspondências encontradas: o previsto passa a apontar para a
+ * transação e o documento do previsto preenche Contrato/Nota quando vazio
+ */
+async function acceptExpectedEntryMatches() {
+    const result = appState.matching.result;
+    if (!result || result.matches.length === 0) return;
+
+    try {
+        const byId = new Map(getExpectedEntries().map(entry => [entry.id, entry]));
+        const documents = new Map();
+
+        result.matches.forEach(match => {
+            const entry = byId.get(match.expectedId);
+            const transaction = getTransactionById(match.bankId);
+            if (!entry || !transaction || entry.transactionId) return;
+
+            entry.transactionId = transaction.id;
+            entry.score = Math.round(match.score * 100) / 100;
+            if (entry.document && !transaction['Contrato/Nota?']) {
+                documents.set(transaction, entry.document);
+            }
+        });
+
+        if (documents.size > 0) {
+            updateTransactionsBatch(Array.from(documents.keys()), transaction => ({
+                'Contrato/Nota?': documents.get(transaction)
+            }));
+        }
+
+        appState.matching.result = null;
+        await saveAppData();
+        renderExpectedMatches();
+
+        showNotification(`${result.matches.length.toLocaleString('pt-BR')} previstos conciliados com o extrato`, 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro ao gravar correspondências:', error);
+        showNotification('Erro ao gravar correspondências', 'error');
+    }
+}
+
+/**
+ * Mostra/esconde o painel de previstos
+ */
+function toggleExpectedEntriesPanel(show) {
+    const panel = document.getElementById('expectedEntriesPanel');
+    if (!panel) return;
+
+    const visible = show === undefined ? panel.classList.contains('hidden') : show;
+    panel.classList.toggle('hidden', !visible);
+    if (visible) renderExpectedMatches();
+}
+
+// ==========================================
+// TRANSFERÊNCIAS ENTRE CONTAS
+// ==========================================
+
+/**
+ * Termos da descrição que indicam transferência entre contas
+ */
+const TRANSFER_HINT_PATTERN = /\b(?:transf|transferencia|ted|doc|tef|pix|entre contas|mesma titularidade|aplicacao|resgate)\b/;
+
+/**
+ * Candidatos avaliados por linha (limita grupos com muitos valores repetidos)
+ */
+const TRANSFER_SCAN_LIMIT = 256;
+
+/**
+ * Propostas exibidas na tabela
+ */
+const TRANSFER_PREVIEW_ROWS = 200;
+
+/**
+ * Janela de dias configurada no painel (padrão: 3)
+ */
+function getTransferDayWindow() {
+    const input = document.getElementById('transferDayWindow');
+    const value = input ? parseInt(input.value, 10) : NaN;
+    return isNaN(value) ? 3 : Math.max(0, value);
+}
+
+/**
+ * Procura pares saída/entrada de mesmo valor, em bancos diferentes e dentro da
+ * janela de dias. Junção por hash: as linhas são agrupadas por valor em centavos
+ * e, dentro do grupo, ordenadas por dia; cada linha de consulta só visita as do
+ * lado oposto dentro da janela. probeTransactions = null consulta todas as saídas;
+ * no incremental, só as novas linhas são consultadas. excluded: transações já
+ * comprometidas com outra proposta.
+ */
+function findTransferPairs(probeTransactions, dayWindow, excluded = new Set()) {
+    const start = performance.now();
+    const hints = new Map();
+    const hasHint = transaction => {
+        let hint = hints.get(transaction);
+        if (hint === undefined) {
+            hint = TRANSFER_HINT_PATTERN.test(normalizeQueryText(
+                `${transaction['Descrição Original'] || ''} ${transaction['Favorecido / Pagador Padronizado'] || ''}`
+            ));
+            hints.set(transaction, hint);
+        }
+        return hint;
+    };
+    const toRow = transaction => {
+        const income = toCents(transaction['Entrada (R$)']);
+        const expense = toCents(transaction['Saída (R$)']);
+        return {
+            transaction,
+            inflow: income > 0,
+            cents: income > 0 ? income : expense,
+            day: toEpochDay(transaction['Data']),
+            bank: transaction['Banco Origem/Destino'] || ''
+        };
+    };
+
+    // Lado de construção: valor → entradas/saídas ordenadas por dia
+    const groups = new Map();
+    const probes = [];
+    appData.transactions.forEach(transaction => {
+        if (isInternalTransfer(transaction) || excluded.has(transaction)) return;
+        const row = toRow(transaction);
+        if (row.cents <= 0 || isNaN(row.day) || !row.bank) return;
+
+        let group = groups.get(row.cents);
+        if (!group) groups.set(row.cents, group = { inflows: [], outflows: [] });
+        (row.inflow ? group.inflows : group.outflows).push(row);
+        if (!probeTransactions && !row.inflow) probes.push(row);
+    });
+    groups.forEach(group => {
+        group.inflows.sort((a, b) => a.day - b.day);
+        group.outflows.sort((a, b) => a.day - b.day);
+    });
+
+    if (probeTransactions) {
+        probeTransactions.forEach(transaction => {
+            if (isInternalTransfer(transaction) || excluded.has(transaction)) return;
+            const row = toRow(transaction);
+            if (row.cents > 0 && !isNaN(row.day) && row.bank) probes.push(row);
+        });
+    }
+
+    const used = new Set();
+    const pairs = [];
+    let pending = probes;
+
+    // Atribuição gulosa por confiança; quem perdeu o par tenta de novo sem os já usados
+    for (let pass = 0; pass < 3 && pending.length > 0; pass++) {
+        const candidates = [];
+
+        pending.forEach(probe => {
+            if (used.has(probe.transaction)) return;
+            const group = groups.get(probe.cents);
+            if (!group) return;
+
+            const opposite = probe.inflow ? group.outflows : group.inflows;
+            let low = 0;
+            let high = opposite.length;
+            while (low < high) {
+                const mid = (low + high) >> 1;
+                if (opposite[mid].day < probe.day - dayWindow) low = mid + 1;
+                else high = mid;
+            }
+
+            for (let i = low, scanned = 0; i < opposite.length && scanned < TRANSFER_SCAN_LIMIT; i++, scanned++) {
+                const other = opposite[i];
+                if (other.day > probe.day + dayWindow) break;
+                if (other.bank === probe.bank || used.has(other.transaction)) continue;
+
+                const dayDiff = Math.abs(other.day - probe.day);
+                const out = probe.inflow ? other : probe;
+                const inflow = probe.inflow ? probe : other;
+                const confidence = 0.7 * (1 - dayDiff / (dayWindow + 1)) +
+                    (hasHint(out.transaction) ? 0.15 : 0) +
+                    (hasHint(inflow.transaction) ? 0.15 : 0);
+
+                candidates.push({ out: out.transaction, in: inflow.transaction, probe, cents: probe.cents, dayDiff, confidence });
+            }
+        });
+
+        if (candidates.length === 0) break;
+        candidates.sort((a, b) => b.confidence - a.confidence || a.dayDiff - b.dayDiff);
+
+        const matchedProbes = new Set();
+        candidates.forEach(candidate => {
+            if (used.has(candidate.out) || used.has(candidate.in)) return;
+            used.add(candidate.out);
+            used.add(candidate.in);
+            matchedProbes.add(candidate.probe);
+            pairs.push({
+                out: candidate.out,
+                in: candidate.in,
+                amount: candidate.cents / 100,
+                dayDiff: candidate.dayDiff,
+                confidence: Math.round(candidate.confidence * 100) / 100
+            });
+        });
+
+        pending = pending.filter(probe => !matchedProbes.has(probe) && !used.has(probe.transaction));
+    }
+
+    pairs.sort((a, b) => b.confidence - a.confidence || b.amount - a.amount);
+    return { pairs, probes: probes.length, ms: Math.round(performance.now() - start) };
+}
+
+/**
+ * Proposta ainda válida: os dois lados existem e nenhum já está marcado
+ */
+function isTransferPairOpen(pair) {
+    return getTransactionById(pair.out.id) === pair.out && getTransactionById(pair.in.id) === pair.in &&
+        !isInternalTransfer(pair.out) && !isInternalTransfer(pair.in);
+}
+
+/**
+ * Atualiza as propostas de transferência. Sem argumento, recalcula tudo;
+ * com as transações recém-importadas, só elas são consultadas e as propostas
+ * existentes são mantidas.
+ */
+function detectTransfers(newTransactions = null) {
+    const transfers = appState.transfers;
+    const dayWindow = getTransferDayWindow();
+
+    let kept = [];
+    const excluded = new Set();
+    if (newTransactions && transfers.proposals) {
+        kept = transfers.proposals.filter(isTransferPairOpen);
+        kept.forEach(pair => {
+            excluded.add(pair.out);
+            excluded.add(pair.in);
+        });
+    }
+
+    const result = findTransferPairs(newTransactions, dayWindow, excluded);
+    transfers.proposals = kept.concat(result.pairs).sort((a, b) => b.confidence - a.confidence || b.amount - a.amount);
+    transfers.version = appState.dataVersion;
+    transfers.lastRun = { ...result, dayWindow, incremental: !!newTransactions };
+
+    debugLog('info', 'Transferências detectadas:', {
+        proposals: transfers.proposals.length,
+        found: result.pairs.length,
+        probes: result.probes,
+        incremental: !!newTransactions,
+        ms: result.ms
+    });
+
+    return transfers.proposals;
+}
+
+/**
+ * Marca pares como transferência entre contas: cada lado guarda o id do outro
+ * e deixa de contar como receita/despesa nas agregações
+ */
+async function acceptTransferPairs(pairs) {
+    // Propostas antigas podem apontar para linhas já excluídas ou marcadas
+    const stale = pairs.some(pair => !isTransferPairOpen(pair));
+    pairs = pairs.filter(isTransferPairOpen);
+    if (pairs.length === 0) {
+        if (stale) {
+            detectTransfers();
+            renderTransferProposals();
+            showNotification('Propostas desatualizadas: detecção refeita', 'info');
+        }
+        return;
+    }
+
+    try {
+        const counterpart = new Map();
+        pairs.forEach(pair => {
+            counterpart.set(pair.out, pair.in.id);
+            counterpart.set(pair.in, pair.out.id);
+        });
+
+        updateTransactionsBatch(Array.from(counterpart.keys()), transaction => ({
+            transferId: counterpart.get(transaction)
+        }));
+
+        // Pares aceitos (agora marcados) e pares desatualizados saem da lista
+        appState.transfers.proposals = (appState.transfers.proposals || []).filter(isTransferPairOpen);
+
+        await saveAppData();
+        renderTransferProposals();
+
+        showNotification(`${pairs.length.toLocaleString('pt-BR')} transferências entre contas marcadas`, 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro ao marcar transferências:', error);
+        showNotification('Erro ao marcar transferências', 'error');
+    }
+}
+
+/**
+ * Aceita todas as propostas com confiança mínima
+ */
+function acceptConfidentTransfers() {
+    const minimum = (parseInt(document.getElementById('transferMinConfidence')?.value, 10) || 0) / 100;
+    acceptTransferPairs((appState.transfers.proposals || []).filter(pair => pair.confidence >= minimum));
+}
+
+/**
+ * Transferências marcadas: pares completos e lados sem contrapartida (dados antigos)
+ */
+function countAcceptedTransfers() {
+    let paired = 0;
+    let orphans = 0;
+    appData.transactions.forEach(transaction => {
+        if (!isInternalTransfer(transaction)) return;
+        const counterpart = getTransactionById(transaction.transferId);
+        if (counterpart && counterpart.transferId === transaction.id) {
+            paired++;
+        } else {
+            orphans++;
+        }
+    });
+    return { pairs: paired / 2, orphans };
+}
+
+/**
+ * Texto da contagem de transferências marcadas
+ */
+function describeAcceptedTransfers(accepted = countAcceptedTransfers()) {
+    const text = `${accepted.pairs.toLocaleString('pt-BR')} transferências entre contas`;
+    return accepted.orphans > 0
+        ? `${text} (+${accepted.orphans.toLocaleString('pt-BR')} sem contrapartida)`
+        : text;
+}
+
+/**
+ * Desfaz todas as transferências marcadas
+ */
+async function clearAcceptedTransfers() {
+    try {
+        const tagged = appData.transactions.filter(isInternalTransfer);
+        if (tagged.length === 0) return;
+        if (!confirm(`Desmarcar ${describeAcceptedTransfers()}?`)) return;
+
+        updateTransactionsBatch(tagged, () => ({ transferId: null }));
+        await saveAppData();
+        detectTransfers();
+        renderTransferProposals();
+
+        showNotification('Transferências desmarcadas', 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro ao desmarcar transferências:', error);
+        showNotification('Erro ao desmarcar transferências', 'error');
+    }
+}
+
+/**
+ * Tabela de propostas e resumo
+ */
+function renderTransferProposals() {
+    const tbody = document.getElementById('transferProposalsBody');
+    const summary = document.getElementById('transferSummary');
+    const { proposals, lastRun } = appState.transfers;
+    const accepted = countAcceptedTransfers();
+
+    if (summary) {
+        const parts = [`${(proposals || []).length.toLocaleString('pt-BR')} pares propostos`];
+        if (lastRun) parts.push(`${lastRun.probes.toLocaleString('pt-BR')} lançamentos consultados em ${lastRun.ms} ms`);
+        parts.push(`${describeAcceptedTransfers(accepted)} já marcadas`);
+        summary.textContent = parts.join(' · ');
+    }
+
+    const clearButton = document.getElementById('clearTransfers');
+    if (clearButton) clearButton.disabled = accepted.pairs + accepted.orphans === 0;
+
+    if (!tbody) return;
+    tbody.innerHTML = '';
+
+    const fragment = document.createDocumentFragment();
+    (proposals || []).slice(0, TRANSFER_PREVIEW_ROWS).forEach((pair, index) => {
+        const row = document.createElement('tr');
+        row.dataset.pairIndex = index;
+        row.innerHTML = `
+            <td class="py-2 px-3 text-sm">${formatDate(pair.out['Data'])}</td>
+            <td class="py-2 px-3 text-sm">${escapeHtml(pair.out['Banco Origem/Destino'] || '')}</td>
+            <td class="py-2 px-3 text-sm">${formatDate(pair.in['Data'])}</td>
+            <td class="py-2 px-3 text-sm">${escapeHtml(pair.in['Banco Origem/Destino'] || '')}</td>
+            <td class="py-2 px-3 text-xs text-text-secondary">${escapeHtml(pair.out['Descrição Original'] || '')} → ${escapeHtml(pair.in['Descrição Original'] || '')}</td>
+            <td class="py-2 px-3 text-sm text-right">${formatCurrency(pair.amount)}</td>
+            <td class="py-2 px-3 text-sm text-right">${Math.round(pair.confidence * 100)}%</td>
+            <td class="py-2 px-3 text-center">
+                <button class="btn btn--sm btn--ghost transfer-accept" title="Marcar como transferência">Aceitar</button>
+            </td>
+        `;
+        fragment.appendChild(row);
+    });
+    tbody.appendChild(fragment);
+}
+
+/**
+ * Mostra/esconde o painel de transferências (detecta ao abrir se os dados mudaram)
+ */
+function toggleTransfersPanel(show) {
+    const panel = document.getElementById('transfersPanel');
+    if (!panel) return;
+
+    const visible = show === undefined ? panel.classList.contains('hidden') : show;
+    panel.classList.toggle('hidden', !visible);
+    if (visible) {
+        const transfers = appState.transfers;
+        if (!transfers.proposals || transfers.version !== appState.dataVersion) detectTransfers();
+        renderTransferProposals();
+    }
+}
+
+// Cascata de classificação (cards, formulário de regras) por delegação
+document.addEventListener('change', handleClassificationCascadeChange);
+
+// Event delegation para botões de conciliação
+document.addEventListener('click', function(event) {
+    const target = event.target.closest('button');
+    if (!target) return;
+
+    if (target.classList.contains('classifier-suggestion')) {
+        applyClassifierSuggestion(target);
+        return;
+    }
+
+    const transactionId = target.dataset.transactionId;
+    if (!transactionId) return;
+
+    if (target.classList.contains('auto-classify-btn')) {
+        autoClassifyTransaction(transactionId);
+    } else if (target.classList.contains('skip-transaction-btn')) {
+        skipTransaction(transactionId);
+    } else if (target.classList.contains('duplicate-classification-btn')) {
+        duplicateLastClassification(transactionId);
+    }
+});
+
+/**
+ * Pula uma transação (move para o final da fila)
+ */
+function skipTransaction(transactionId) {
+    const queue = appState.reconciliationQueue;
+    if (!queue) return;
+
+    const index = queue.items.findIndex(transaction => transaction.id === transactionId);
+    if (index === -1) return;
+
+    const [transaction] = queue.items.splice(index, 1);
+    queue.items.push(transaction);
+    queue.cards.forEach(card => { card._transaction = null; });
+    updateReconciliationWindow(true);
+
+    showNotification('Transação movida para o final da lista', 'info');
+}
+
+/**
+ * Duplica a última classificação usada
+ */
+function duplicateLastClassification(transactionId) {
+    try {
+        // Encontra a última transação conciliada
+        const reconciled = appData.transactions.filter(t => t['Status Conciliação'] === 'Conciliado');
+        if (reconciled.length === 0) {
+            showNotification('Não há transações conciliadas para duplicar', 'warning');
+            return;
+        }
+
+        // Pega a mais recente
+        const lastReconciled = reconciled[reconciled.length - 1];
+
+        const card = document.querySelector(`.reconciliation-card[data-transaction-id="${transactionId}"]`);
+        if (!card) return;
+
+        // Aplica classificação
+        const costCenterInput = card.querySelector('.cost-center');
+
+        if (lastReconciled['Classificação Nível 1']) {
+            setCardClassification(
+                card,
+                lastReconciled['Classificação Nível 1'],
+                lastReconciled['Classificação Nível 2'],
+                lastReconciled['Classificação Nível 3']
+            );
+        }
+
+        if (costCenterInput && lastReconciled['Centro de Custo']) {
+            costCenterInput.value = lastReconciled['Centro de Custo'];
+        }
+
+        // Registra como rascunho do card
+        card.querySelector('.classification-level-1')?.dispatchEvent(new Event('input', { bubbles: true }));
 
         showNotification('Última classificação aplicada', 'success');
 
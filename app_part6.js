@@ -10,8 +10,11 @@ async function loadReports() {
     try {
         debugLog('info', 'Carregando sistema de relatórios...');
 
-        // Carrega relatório DRE por padrão
-        await generateReport('dre');
+        // Exercícios fechados dependem dos meses presentes nos dados
+        renderReportPeriodOptions();
+
+        // Mantém o último relatório exibido (DRE por padrão)
+        await generateReport(appState.currentReport || 'dre');
 
         debugLog('info', 'Relatórios carregados com sucesso');
 
@@ -46,18 +49,7 @@ async function generateReport(reportType) {
             activeBtn.classList.remove('btn--ghost');
         }
 
-        // Mostra loading
-        reportContent.innerHTML = `
-            <div class="flex items-center justify-center py-12">
-                <div class="text-center">
-                    <div class="animate-spin w-8 h-8 border-2 border-primary border-t-transparent rounded-full mx-auto mb-4"></div>
-                    <p class="text-text-secondary">Gerando relatório...</p>
-                </div>
-            </div>
-        `;
-
-        // Aguarda um pouco para mostrar loading
-        await sleep(500);
+        appState.currentReport = reportType;
 
         // Gera relatório específico
         switch (reportType) {
@@ -84,6 +76,11 @@ async function generateReport(reportType) {
             lucide.createIcons();
         }
 
+        // Mantém o cache da aba coerente com o relatório exibido
+        if (appData.ui.currentTab === 'reports') {
+            appState.tabRenderCache.set('reports', getTabRenderKey('reports'));
+        }
+
         debugLog('info', `Relatório ${reportType} gerado com sucesso`);
 
     } catch (error) {
@@ -256,10 +253,17 @@ async function generateDREReport(container) {
     }
 }
 
+/**
+ * Dados do DRE do período (memoizados pela versão dos dados e pelo intervalo de meses)
+ */
+function calculateDREData(range = getReportPeriodRange()) {
+    return memoizeByVersion(`dre:${getReportPeriodKey(range)}`, () => computeDREData(range));
+}
+
 /**
  * Calcula dados para o DRE
  */
-function calculateDREData() {
+function computeDREData(range = { from: null, to: null }) {
     let totalRevenue = 0;
     let totalExpenses = 0;
     let financialResult = 0;
@@ -267,16 +271,12 @@ function calculateDREData() {
     const revenueByCategory = {};
     const expensesByCategory = {};
 
-    // Filtra transações conciliadas
-    const conciliatedTransactions = appData.transactions.filter(t => 
-        t['Status Conciliação'] === 'Conciliado'
-    );
-
-    conciliatedTransactions.forEach(transaction => {
-        const level1 = transaction['Classificação Nível 1'] || 'Não Classificado';
-        const level2 = transaction['Classificação Nível 2'] || '';
-        const income = parseValue(transaction['Entrada (R$)']);
-        const expense = parseValue(transaction['Saída (R$)']);
+    // Agrega transações conciliadas por nível 1 e 2 (roll-up só das partições do período)
+    rollupCube(['level1', 'level2'], { status: 'Conciliado', ...getReportMonthFilter(range) }).forEach(row => {
+        const level1 = row.level1 || 'Não Classificado';
+        const level2 = row.level2;
+        const income = row.revenue;
+        const expense = row.expenses;
 
         // Classifica por tipo de conta
         if (level1.includes('RECEITAS OPERACIONAIS') || level1.includes('1.0')) {
@@ -391,7 +391,7 @@ async function generateCashflowReport(container) {
                     <div>
                         <h3 class="text-2xl font-bold mb-2">Relatório de Fluxo de Caixa</h3>
                         <p class="text-text-secondary">
-                            Análise mensal consolidada | Gerado em ${new Date().toLocaleString('pt-BR')}
+                            Período: ${getReportPeriodText()} | Gerado em ${new Date().toLocaleString('pt-BR')}
                         </p>
                     </div>
                     <div class="flex items-center gap-2">
@@ -466,21 +466,21 @@ async function generateCashflowReport(container) {
     }
 }
 
+/**
+ * Fluxo de caixa mensal do período (memoizado pela versão dos dados e pelo intervalo de meses)
+ */
+function calculateMonthlyCashflow(range = getReportPeriodRange()) {
+    return memoizeByVersion(`cashflow:${getReportPeriodKey(range)}`, () => computeMonthlyCashflow(range));
+}
+
 /**
  * Calcula fluxo de caixa mensal
  */
-function calculateMonthlyCashflow() {
+function computeMonthlyCashflow(range = { from: null, to: null }) {
     const monthlyData = {};
 
-    appData.transactions.forEach(transaction => {
-        const month = transaction['Mes'] || formatMonthYear(new Date(transaction['Data']));
-
-        if (!monthlyData[month]) {
-            monthlyData[month] = { revenue: 0, expenses: 0 };
-        }
-
-        monthlyData[month].revenue += parseValue(transaction['Entrada (R$)']);
-        monthlyData[month].expenses += parseValue(transaction['Saída (R$)']);
+    rollupCube(['month'], getReportMonthFilter(range)).forEach(row => {
+        monthlyData[row.month] = { revenue: row.revenue, expenses: row.expenses };
     });
 
     // Calcula totais
@@ -519,10 +519,7 @@ function generateCashflowRows(monthlyData) {
         const result = data.revenue - data.expenses;
         accumulatedBalance += result;
 
-        const monthName = new Date(month + '-01').toLocaleDateString('pt-BR', { 
-            month: 'long', 
-            year: 'numeric' 
-        });
+        const monthName = formatLongMonthLabel(month);
 
         return `
             <tr class="border-b border-border hover:bg-secondary/30">
@@ -623,24 +620,181 @@ function generateCashflowCSV() {
     return csv;
 }
 
+// ==========================================
+// PERÍODO DOS RELATÓRIOS
+// ==========================================
+
+/**
+ * Desloca um mês (YYYY-MM) em delta meses
+ */
+function shiftMonth(month, delta) {
+    const [year, monthNum] = month.split('-').map(Number);
+    const index = year * 12 + (monthNum - 1) + delta;
+    return `${Math.floor(index / 12)}-${String(index % 12 + 1).padStart(2, '0')}`;
+}
+
+/**
+ * Nome do mês por extenso ("janeiro de 2025"); o rótulo curto é formatMonthLabel
+ */
+function formatLongMonthLabel(month) {
+    const [year, monthNum] = month.split('-').map(Number);
+    return new Date(year, monthNum - 1, 1).toLocaleDateString('pt-BR', { month: 'long', year: 'numeric' });
+}
+
+/**
+ * Mês (1-12) em que começa o exercício fiscal
+ */
+function getFiscalYearStartMonth() {
+    const startMonth = parseInt(appData.settings.fiscalYearStartMonth, 10);
+    return startMonth >= 1 && startMonth <= 12 ? startMonth : 1;
+}
+
+/**
+ * Ano de início do exercício fiscal que contém o mês
+ */
+function getFiscalYearOf(month) {
+    const [year, monthNum] = month.split('-').map(Number);
+    return monthNum >= getFiscalYearStartMonth() ? year : year - 1;
+}
+
+/**
+ * Intervalo de meses de um exercício fiscal
+ */
+function getFiscalYearRange(startYear) {
+    const from = `${startYear}-${String(getFiscalYearStartMonth()).padStart(2, '0')}`;
+    return { from, to: shiftMonth(from, 11) };
+}
+
+/**
+ * Nome de um exercício fiscal ("Exercício 2024" ou "Exercício 2024/2025")
+ */
+function getFiscalYearLabel(startYear) {
+    return getFiscalYearStartMonth() === 1 ? `Exercício ${startYear}` : `Exercício ${startYear}/${startYear + 1}`;
+}
+
+/**
+ * Intervalo de meses { from, to } (YYYY-MM, inclusivos; null = aberto) do período selecionado
+ */
+function getReportPeriodRange(period = document.getElementById('reportPeriod')?.value || 'all') {
+    const currentMonth = formatMonthYear(new Date());
+
+    switch (period) {
+        case 'current-month':
+            return { from: currentMonth, to: currentMonth };
+        case 'last-month': {
+            const lastMonth = shiftMonth(currentMonth, -1);
+            return { from: lastMonth, to: lastMonth };
+        }
+        case 'current-year': {
+            const year = currentMonth.slice(0, 4);
+            return { from: `${year}-01`, to: `${year}-12` };
+        }
+        case 'current-fiscal-year':
+            return getFiscalYearRange(getFiscalYearOf(currentMonth));
+        case 'custom': {
+            const from = document.getElementById('reportMonthFrom')?.value || null;
+            const to = document.getElementById('reportMonthTo')?.value || null;
+            return from && to && from > to ? { from: to, to: from } : { from, to };
+        }
+        default:
+            if (period.startsWith('fiscal:')) {
+                return getFiscalYearRange(parseInt(period.slice(7), 10));
+            }
+            return { from: null, to: null };
+    }
+}
+
+/**
+ * Chave do intervalo para memoização e cache de renderização
+ */
+function getReportPeriodKey(range = getReportPeriodRange()) {
+    return `${range.from || ''}~${range.to || ''}`;
+}
+
+/**
+ * Filtro de mês do cubo para o intervalo (o roll-up só visita as partições dos meses aceitos)
+ */
+function getReportMonthFilter(range) {
+    if (!range.from && !range.to) return {};
+    return {
+        month: month => (!range.from || month >= range.from) && (!range.to || month <= range.to)
+    };
+}
+
+/**
+ * Exercícios fiscais já encerrados com dados, do mais recente para o mais antigo
+ */
+function getClosedFiscalYears() {
+    const currentFiscalYear = getFiscalYearOf(formatMonthYear(new Date()));
+    const years = new Set();
+
+    appState.cube.partitions.forEach((partition, month) => {
+        const fiscalYear = getFiscalYearOf(month);
+        if (fiscalYear < currentFiscalYear) years.add(fiscalYear);
+    });
+
+    return Array.from(years).sort((a, b) => b - a);
+}
+
+/**
+ * Atualiza as opções de exercícios fechados do seletor de período (mantém a seleção)
+ */
+function renderReportPeriodOptions() {
+    const select = document.getElementById('reportPeriod');
+    if (!select) return;
+
+    const selected = select.value;
+    select.querySelectorAll('option[data-fiscal-year]').forEach(option => option.remove());
+
+    getClosedFiscalYears().forEach(fiscalYear => {
+        const option = document.createElement('option');
+        option.value = `fiscal:${fiscalYear}`;
+        option.dataset.fiscalYear = fiscalYear;
+        option.textContent = getFiscalYearLabel(fiscalYear);
+        select.appendChild(option);
+    });
+
+    select.value = selected;
+    if (select.value !== selected) select.value = 'all';
+
+    toggleReportCustomRange();
+}
+
+/**
+ * Exibe os campos de mês inicial/final quando o período é personalizado
+ */
+function toggleReportCustomRange() {
+    const customRange = document.getElementById('reportCustomRange');
+    if (customRange) {
+        customRange.classList.toggle('hidden', document.getElementById('reportPeriod')?.value !== 'custom');
+    }
+}
+
 /**
  * Obtém texto do período do relatório
  */
 function getReportPeriodText() {
     const reportPeriod = document.getElementById('reportPeriod')?.value || 'all';
+    const range = getReportPeriodRange(reportPeriod);
+    const rangeText = () => `${formatLongMonthLabel(range.from)} a ${formatLongMonthLabel(range.to)}`;
 
     switch (reportPeriod) {
         case 'current-month':
-            return new Date().toLocaleDateString('pt-BR', { month: 'long', year: 'numeric' });
         case 'last-month':
-            const lastMonth = new Date();
-            lastMonth.setMonth(lastMonth.getMonth() - 1);
-            return lastMonth.toLocaleDateString('pt-BR', { month: 'long', year: 'numeric' });
+            return formatLongMonthLabel(range.from);
         case 'current-year':
-            return new Date().getFullYear().toString();
+            return range.from.slice(0, 4);
+        case 'current-fiscal-year':
+            return `${getFiscalYearLabel(getFiscalYearOf(range.from))} (${rangeText()})`;
         case 'custom':
-            return 'Período personalizado';
+            if (range.from && range.to) return rangeText();
+            if (range.from) return `A partir de ${formatLongMonthLabel(range.from)}`;
+            if (range.to) return `Até ${formatLongMonthLabel(range.to)}`;
+            return 'Todo o período disponível';
         default:
+            if (reportPeriod.startsWith('fiscal:')) {
+                return `${getFiscalYearLabel(getFiscalYearOf(range.from))} (${rangeText()})`;
+            }
             return 'Todo o período disponível';
     }
 }
@@ -330,37 +330,31 @@ async function callGeminiAPI(userMessage) {
  */
 function prepareFinancialContext() {
     try {
-        // Calcula KPIs básicos
-        let totalRevenue = 0;
-        let totalExpenses = 0;
+        // Calcula KPIs básicos a partir do cubo
+        const totals = getCubeTotals();
+        const totalRevenue = totals.revenue;
+        const totalExpenses = totals.expenses;
         const transactionsByMonth = {};
         const transactionsByCategory = {};
 
-        appData.transactions.forEach(transaction => {
-            const revenue = parseValue(transaction['Entrada (R$)']);
-            const expense = parseValue(transaction['Saída (R$)']);
-            const month = transaction['Mes'] || formatMonthYear(new Date(transaction['Data']));
-            const category = transaction['Classificação Nível 1'] || 'Não Classificado';
-
-            totalRevenue += revenue;
-            totalExpenses += expense;
-
-            // Agrupa por mês
-            if (!transactionsByMonth[month]) {
-                transactionsByMonth[month] = { revenue: 0, expenses: 0, count: 0 };
-            }
-            transactionsByMonth[month].revenue += revenue;
-            transactionsByMonth[month].expenses += expense;
-            transactionsByMonth[month].count++;
+        // Agrupa por mês
+        rollupCube(['month']).forEach(row => {
+            transactionsByMonth[row.month] = {
+                revenue: row.revenue,
+                expenses: row.expenses,
+                count: row.count
+            };
+        });
 
-            // Agrupa por categoria
-            if (expense > 0) {
-                transactionsByCategory[category] = (transactionsByCategory[category] || 0) + expense;
+        // Agrupa por categoria
+        rollupCube(['level1']).forEach(row => {
+            if (row.expenses > 0) {
+                transactionsByCategory[row.level1 || 'Não Classificado'] = row.expenses;
             }
         });
 
         const netResult = totalRevenue - totalExpenses;
-        const transactionCount = appData.transactions.length;
+        const transactionCount = totals.count;
 
         // Top categorias de despesa
         const topExpenseCategories = Object.entries(transactionsByCategory)
@@ -378,9 +372,9 @@ function prepareFinancialContext() {
             )
             .join(' | ');
 
-        const pendingCount = appData.transactions.filter(t => 
-            (t['Status Conciliação'] || '').toLowerCase() === 'pendente'
-        ).length;
+        const pendingCount = getCubeTotals({
+            status: status => status.toLowerCase() === 'pendente'
+        }).count;
 
         const context = `
         RESUMO FINANCEIRO:
@@ -3,6 +3,87 @@
 // SISTEMA DE AUDITORIA
 // ==========================================
 
+/**
+ * Verificações da auditoria (chave do resultado -> fábrica da varredura)
+ */
+const AUDIT_CHECKS = [
+    ['unclassified', createUnclassifiedScan],
+    ['duplicates', createDuplicateScan],
+    ['outliers', createOutlierScan],
+    ['incomplete', createIncompleteScan],
+    ['dateIssues', createDateIssueScan],
+    ['balanceIssues', createBalanceIssueScan]
+];
+
+/**
+ * Linhas por fatia no pré-cálculo ocioso da auditoria
+ */
+const AUDIT_SLICE_ROWS = 4000;
+
+/**
+ * Executa uma varredura inteira de uma vez
+ */
+function runAuditScan(scan) {
+    const transactions = appData.transactions;
+    for (let i = 0; i < transactions.length; i++) {
+        scan.step(transactions[i], i);
+    }
+    return scan.finish();
+}
+
+/**
+ * Executa uma verificação da auditoria (memoizada pela versão dos dados)
+ */
+function runAuditCheck([key, createScan]) {
+    return memoizeByVersion(`audit:${key}`, () => runAuditScan(createScan()));
+}
+
+/**
+ * Avança uma verificação em uma fatia de linhas (pré-cálculo ocioso).
+ * Retorna false enquanto não terminar; o resultado final vai para o cache memoizado.
+ */
+function runAuditCheckSlice([key, createScan], chunkSize = AUDIT_SLICE_ROWS) {
+    const name = `audit:${key}`;
+    if (isWarm(name)) return true;
+
+    let build = appState.auditBuilds.get(key);
+    if (!build || build.version !== appState.dataVersion) {
+        build = { scan: createScan(), position: 0, version: appState.dataVersion };
+        appState.auditBuilds.set(key, build);
+    }
+
+    const transactions = appData.transactions;
+    const end = Math.min(transactions.length, build.position + chunkSize);
+    for (let i = build.position; i < end; i++) {
+        build.scan.step(transactions[i], i);
+    }
+    build.position = end;
+
+    if (end < transactions.length) return false;
+
+    appState.auditBuilds.delete(key);
+    memoizeByVersion(name, () => build.scan.finish());
+    return true;
+}
+
+/**
+ * Resultado completo da auditoria
+ */
+function getAuditData() {
+    const auditData = {};
+    AUDIT_CHECKS.forEach(entry => {
+        auditData[entry[0]] = runAuditCheck(entry);
+    });
+    return auditData;
+}
+
+/**
+ * Indica se todas as verificações já foram pré-calculadas
+ */
+function isAuditWarm() {
+    return AUDIT_CHECKS.every(([key]) => isWarm(`audit:${key}`));
+}
+
 /**
  * Carrega a tela de auditoria
  */
@@ -13,6 +94,13 @@ async function loadAudit() {
         const auditResults = document.getElementById('auditResults');
         if (!auditResults) return;
 
+        // Auditoria já pré-calculada: exibe os resultados imediatamente
+        if (appData.transactions.length > 0 && isAuditWarm()) {
+            renderAuditResults(getAuditData());
+            debugLog('info', 'Auditoria carregada do pré-cálculo');
+            return;
+        }
+
         auditResults.innerHTML = `
             <div class="text-center py-8">
                 <i data-lucide="search" class="w-12 h-12 text-primary mx-auto mb-4"></i>
@@ -47,27 +135,8 @@ async function runFullAudit() {
         const auditResults = document.getElementById('auditResults');
         if (!auditResults) return;
 
-        // Mostra loading
-        auditResults.innerHTML = `
-            <div class="text-center py-12">
-                <div class="animate-spin w-8 h-8 border-2 border-primary border-t-transparent rounded-full mx-auto mb-4"></div>
-                <h3 class="text-lg font-semibold mb-2">Executando Auditoria</h3>
-                <p class="text-text-secondary">Analisando dados e identificando inconsistências...</p>
-            </div>
-        `;
-
-        // Simula tempo de processamento
-        await sleep(2000);
-
-        // Executa verificações
-        const auditData = {
-            unclassified: findUnclassifiedTransactions(),
-            duplicates: findDuplicateTransactions(),
-            outliers: findOutlierTransactions(),
-            incomplete: findIncompleteTransactions(),
-            dateIssues: findDateIssues(),
-            balanceIssues: findBalanceIssues()
-        };
+        // Executa verificações (reaproveita o pré-cálculo ocioso quando disponível)
+        const auditData = getAuditData();
 
         // Renderiza resultados
         renderAuditResults(auditData);
@@ -84,151 +153,218 @@ async function runFullAudit() {
  * Encontra transações não classificadas
  */
 function findUnclassifiedTransactions() {
-    return appData.transactions.filter(t => 
-        !t['Classificação Nível 1'] || t['Classificação Nível 1'].trim() === ''
-    );
+    return runAuditScan(createUnclassifiedScan());
+}
+
+/**
+ * Varredura de transações não classificadas
+ */
+function createUnclassifiedScan() {
+    const unclassified = [];
+    return {
+        step(t) {
+            if ((!t['Classificação Nível 1'] || t['Classificação Nível 1'].trim() === '') && !getEffectiveAllocations(t)) {
+                unclassified.push(t);
+            }
+        },
+        finish: () => unclassified
+    };
 }
 
 /**
  * Encontra transações duplicadas
  */
 function findDuplicateTransactions() {
+    return runAuditScan(createDuplicateScan());
+}
+
+/**
+ * Varredura de transações duplicadas
+ */
+function createDuplicateScan() {
     const duplicates = [];
     const seen = new Map();
-
-    appData.transactions.forEach((transaction, index) => {
-        const key = `${transaction['Data']}_${transaction['Descrição Original']}_${transaction['Entrada (R$)']}_${transaction['Saída (R$)']}`;
-
-        if (seen.has(key)) {
-            duplicates.push({
-                original: seen.get(key),
-                duplicate: { ...transaction, index }
-            });
-        } else {
-            seen.set(key, { ...transaction, index });
-        }
-    });
-
-    return duplicates;
+    return {
+        step(transaction, index) {
+            const key = `${transaction['Data']}_${transaction['Descrição Original']}_${transaction['Entrada (R$)']}_${transaction['Saída (R$)']}`;
+
+            if (seen.has(key)) {
+                duplicates.push({
+                    original: seen.get(key),
+                    duplicate: { ...transaction, index }
+                });
+            } else {
+                seen.set(key, { ...transaction, index });
+            }
+        },
+        finish: () => duplicates
+    };
 }
 
 /**
  * Encontra transações com valores atípicos
  */
 function findOutlierTransactions() {
-    const amounts = appData.transactions.map(t => {
-        const income = parseValue(t['Entrada (R$)']);
-        const expense = parseValue(t['Saída (R$)']);
-        return Math.max(income, expense);
-    }).filter(amount => amount > 0);
-
-    if (amounts.length === 0) return [];
-
-    // Calcula estatísticas
-    amounts.sort((a, b) => a - b);
-    const q1 = amounts[Math.floor(amounts.length * 0.25)];
-    const q3 = amounts[Math.floor(amounts.length * 0.75)];
-    const iqr = q3 - q1;
-    const lowerBound = q1 - 1.5 * iqr;
-    const upperBound = q3 + 1.5 * iqr;
-
-    return appData.transactions.filter(t => {
-        const income = parseValue(t['Entrada (R$)']);
-        const expense = parseValue(t['Saída (R$)']);
-        const amount = Math.max(income, expense);
-        return amount < lowerBound || amount > upperBound;
-    });
+    return runAuditScan(createOutlierScan());
+}
+
+/**
+ * Varredura de valores atípicos: guarda o valor de cada linha e
+ * aplica os limites do intervalo interquartil ao final
+ */
+function createOutlierScan() {
+    const rowAmounts = new Float64Array(appData.transactions.length);
+    const rows = [];
+    return {
+        step(t, index) {
+            const income = parseValue(t['Entrada (R$)']);
+            const expense = parseValue(t['Saída (R$)']);
+            rowAmounts[index] = Math.max(income, expense);
+            rows.push(t);
+        },
+        finish() {
+            const amounts = rowAmounts.filter(amount => amount > 0);
+            if (amounts.length === 0) return [];
+
+            // Calcula estatísticas
+            amounts.sort();
+            const q1 = amounts[Math.floor(amounts.length * 0.25)];
+            const q3 = amounts[Math.floor(amounts.length * 0.75)];
+            const iqr = q3 - q1;
+            const lowerBound = q1 - 1.5 * iqr;
+            const upperBound = q3 + 1.5 * iqr;
+
+            return rows.filter((t, index) => rowAmounts[index] < lowerBound || rowAmounts[index] > upperBound);
+        }
+    };
 }
 
 /**
  * Encontra transações incompletas
  */
 function findIncompleteTransactions() {
-    return appData.transactions.filter(t => {
-        const hasDescription = t['Descrição Original'] && t['Descrição Original'].trim() !== '';
-        const hasAmount = (parseValue(t['Entrada (R$)']) > 0) || (parseValue(t['Saída (R$)']) > 0);
-        const hasDate = t['Data'] && t['Data'] !== '';
+    return runAuditScan(createIncompleteScan());
+}
 
-        return !hasDescription || !hasAmount || !hasDate;
-    });
+/**
+ * Varredura de transações incompletas
+ */
+function createIncompleteScan() {
+    const incomplete = [];
+    return {
+        step(t) {
+            const hasDescription = t['Descrição Original'] && t['Descrição Original'].trim() !== '';
+            const hasAmount = (parseValue(t['Entrada (R$)']) > 0) || (parseValue(t['Saída (R$)']) > 0);
+            const hasDate = t['Data'] && t['Data'] !== '';
+
+            if (!hasDescription || !hasAmount || !hasDate) incomplete.push(t);
+        },
+        finish: () => incomplete
+    };
 }
 
 /**
  * Encontra problemas de data
  */
 function findDateIssues() {
+    return runAuditScan(createDateIssueScan());
+}
+
+/**
+ * Varredura de problemas de data
+ */
+function createDateIssueScan() {
     const issues = [];
     const currentDate = new Date();
+    const futureLimit = new Date(currentDate.getTime() + 24 * 60 * 60 * 1000);
+    const oldLimit = new Date(currentDate.getFullYear() - 5, 0, 1);
 
-    appData.transactions.forEach((transaction, index) => {
-        const transactionDate = new Date(transaction['Data']);
-
-        // Data inválida
-        if (isNaN(transactionDate.getTime())) {
-            issues.push({
-                type: 'invalid_date',
-                transaction: { ...transaction, index },
-                message: 'Data inválida'
-            });
-        }
-        // Data futura (mais de 1 dia)
-        else if (transactionDate > new Date(currentDate.getTime() + 24 * 60 * 60 * 1000)) {
-            issues.push({
-                type: 'future_date',
-                transaction: { ...transaction, index },
-                message: 'Data no futuro'
-            });
-        }
-        // Data muito antiga (mais de 5 anos)
-        else if (transactionDate < new Date(currentDate.getFullYear() - 5, 0, 1)) {
-            issues.push({
-                type: 'old_date',
-                transaction: { ...transaction, index },
-                message: 'Data muito antiga'
-            });
-        }
-    });
-
-    return issues;
+    return {
+        step(transaction, index) {
+            const transactionDate = new Date(transaction['Data']);
+
+            // Data inválida
+            if (isNaN(transactionDate.getTime())) {
+                issues.push({
+                    type: 'invalid_date',
+                    transaction: { ...transaction, index },
+                    message: 'Data inválida'
+                });
+            }
+            // Data futura (mais de 1 dia)
+            else if (transactionDate > futureLimit) {
+                issues.push({
+                    type: 'future_date',
+                    transaction: { ...transaction, index },
+                    message: 'Data no futuro'
+                });
+            }
+            // Data muito antiga (mais de 5 anos)
+            else if (transactionDate < oldLimit) {
+                issues.push({
+                    type: 'old_date',
+                    transaction: { ...transaction, index },
+                    message: 'Data muito antiga'
+                });
+            }
+        },
+        finish: () => issues
+    };
 }
 
 /**
  * Encontra problemas de saldo (básico)
  */
 function findBalanceIssues() {
-    const issues = [];
-
-    // Verifica se há transações com valor zero
-    const zeroAmountTransactions = appData.transactions.filter(t => {
-        const income = parseValue(t['Entrada (R$)']);
-        const expense = parseValue(t['Saída (R$)']);
-        return income === 0 && expense === 0;
-    });
+    return runAuditScan(createBalanceIssueScan());
+}
 
-    zeroAmountTransactions.forEach(transaction => {
-        issues.push({
-            type: 'zero_amount',
-            transaction,
-            message: 'Transação sem valor'
-        });
-    });
+/**
+ * Varredura de problemas de saldo; cada tipo é acumulado separadamente
+ * para manter a ordem do relatório (sem valor, entrada e saída, rateio)
+ */
+function createBalanceIssueScan() {
+    const zeroAmount = [];
+    const doubleAmount = [];
+    const splitMismatch = [];
 
-    // Verifica transações com entrada E saída
-    const doubleAmountTransactions = appData.transactions.filter(t => {
-        const income = parseValue(t['Entrada (R$)']);
-        const expense = parseValue(t['Saída (R$)']);
-        return income > 0 && expense > 0;
-    });
+    return {
+        step(transaction) {
+            const income = parseValue(transaction['Entrada (R$)']);
+            const expense = parseValue(transaction['Saída (R$)']);
+
+            // Transação com valor zero
+            if (income === 0 && expense === 0) {
+                zeroAmount.push({
+                    type: 'zero_amount',
+                    transaction,
+                    message: 'Transação sem valor'
+                });
+            }
 
-    doubleAmountTransactions.forEach(transaction => {
-        issues.push({
-            type: 'double_amount',
-            transaction,
-            message: 'Transação com entrada e saída simultaneamente'
-        });
-    });
+            // Transação com entrada E saída
+            if (income > 0 && expense > 0) {
+                doubleAmount.push({
+                    type: 'double_amount',
+                    transaction,
+                    message: 'Transação com entrada e saída simultaneamente'
+                });
+            }
 
-    return issues;
+            // Rateio que não fecha com o valor da linha (ex.: valor alterado depois do rateio)
+            if (Array.isArray(transaction.allocations) && transaction.allocations.length > 0) {
+                const errors = validateAllocations(transaction, transaction.allocations);
+                if (errors.length > 0) {
+                    splitMismatch.push({
+                        type: 'split_mismatch',
+                        transaction,
+                        message: errors[0]
+                    });
+                }
+            }
+        },
+        finish: () => zeroAmount.concat(doubleAmount, splitMismatch)
+    };
 }
 
 /**
@@ -427,7 +563,7 @@ function generateAuditSection(title, subtitle, icon, type, transactions, issueTy
  * Corrige problema específico
  */
 function fixIssue(transactionId, issueType) {
-    const transaction = appData.transactions.find(t => t.id === transactionId);
+    const transaction = getTransactionById(transactionId);
     if (!transaction) return;
 
     switch (issueType) {
@@ -442,6 +578,13 @@ function fixIssue(transactionId, issueType) {
         case 'incompleto':
             editTransaction(transactionId);
             break;
+        case 'saldo':
+            if (transaction.allocations) {
+                splitTransaction(transactionId);
+            } else {
+                showNotification(`Correção para ${issueType} não implementada ainda`, 'info');
+            }
+            break;
         default:
             showNotification(`Correção para ${issueType} não implementada ainda`, 'info');
     }
@@ -530,20 +673,20 @@ async function generateProjections() {
 }
 
 /**
- * Calcula dados históricos mensais
+ * Dados históricos mensais (memoizados pela versão dos dados)
  */
 function calculateHistoricalMonthlyData() {
-    const monthlyData = {};
-
-    appData.transactions.forEach(transaction => {
-        const month = transaction['Mes'] || formatMonthYear(new Date(transaction['Data']));
+    return memoizeByVersion('projection:history', computeHistoricalMonthlyData);
+}
 
-        if (!monthlyData[month]) {
-            monthlyData[month] = { revenue: 0, expenses: 0 };
-        }
+/**
+ * Calcula dados históricos mensais
+ */
+function computeHistoricalMonthlyData() {
+    const monthlyData = {};
 
-        monthlyData[month].revenue += parseValue(transaction['Entrada (R$)']);
-        monthlyData[month].expenses += parseValue(transaction['Saída (R$)']);
+    rollupCube(['month']).forEach(row => {
+        monthlyData[row.month] = { revenue: row.revenue, expenses: row.expenses };
     });
 
     return monthlyData;
@@ -912,39 +1055,12 @@ async function convertCSVToExcel(file) {
  * Gera CSV melhorado e formatado
  */
 function generateImprovedCSV(transactions) {
-    // Cabeçalho padronizado
-    const headers = [
-        'Data',
-        'Descrição Original',
-        'Favorecido / Pagador Padronizado',
-        'Entrada (R$)',
-        'Saída (R$)',
-        'Banco Origem/Destino',
-        'Classificação Nível 1',
-        'Classificação Nível 2',
-        'Classificação Nível 3',
-        'Centro de Custo',
-        'Status Conciliação',
-        'Notas',
-        'Contrato/Nota?',
-        'Mês'
-    ];
-
-    let csv = headers.join(',') + '\n';
-
-    transactions.forEach(transaction => {
-        const row = headers.map(header => {
-            const value = transaction[header] || '';
-            // Escapa aspas e quebras de linha
-            const escapedValue = String(value).replace(/"/g, '""');
-            // Se contém vírgula, quebra de linha ou aspas, coloca entre aspas
-            return /[",\n\r]/.test(escapedValue) ? `"${escapedValue}"` : escapedValue;
-        });
-
-        csv += row.join(',') + '\n';
-    });
-
-    return csv;
+    // Monta o arquivo em blocos de linhas (partes de Blob) em vez de concatenar uma única string
+    const parts = [EXPORT_COLUMNS.join(',') + '\n'];
+    for (let start = 0; start < transactions.length; start += EXPORT_CHUNK_ROWS) {
+        parts.push(encodeCSVRows(transactions, start, Math.min(transactions.length, start + EXPORT_CHUNK_ROWS)));
+    }
+    return new Blob(parts, { type: 'text/csv' });
 }
 
 /**
@@ -974,4 +1090,430 @@ function downloadConvertedFile() {
         debugLog('error', 'Erro no download:', error);
         showNotification('Erro ao fazer download', 'error');
     }
-}
\ No newline at end of file
+}
+
+// ==========================================
+// EXPORTAÇÃO EM FLUXO (CSV/XLSX)
+// ==========================================
+
+/**
+ * Colunas padronizadas dos arquivos exportados
+ */
+const EXPORT_COLUMNS = [
+    'Data',
+    'Descrição Original',
+    'Favorecido / Pagador Padronizado',
+    'Entrada (R$)',
+    'Saída (R$)',
+    'Banco Origem/Destino',
+    'Classificação Nível 1',
+    'Classificação Nível 2',
+    'Classificação Nível 3',
+    'Centro de Custo',
+    'Status Conciliação',
+    'Notas',
+    'Contrato/Nota?',
+    'Mês',
+    'Rateio'
+];
+
+/**
+ * Colunas numéricas (gravadas como número no XLSX)
+ */
+const EXPORT_NUMERIC_COLUMNS = new Set(['Entrada (R$)', 'Saída (R$)']);
+
+/**
+ * Linhas por bloco na exportação (entre blocos a interface é atualizada)
+ */
+const EXPORT_CHUNK_ROWS = 5000;
+
+/**
+ * Valor de uma coluna exportada
+ */
+function getExportCellValue(transaction, column) {
+    if (column === 'Rateio') return formatAllocations(transaction.allocations);
+    const value = column === 'Mês' ? (transaction['Mês'] || transaction['Mes']) : transaction[column];
+    return value === undefined || value === null ? '' : value;
+}
+
+/**
+ * Escapa um valor para CSV
+ */
+function escapeCSVValue(value) {
+    // Escapa aspas e quebras de linha
+    const escapedValue = String(value).replace(/"/g, '""');
+    // Se contém vírgula, quebra de linha ou aspas, coloca entre aspas
+    return /[",\n\r]/.test(escapedValue) ? `"${escapedValue}"` : escapedValue;
+}
+
+/**
+ * Linhas [start, end) em CSV, como um único bloco de texto
+ */
+function encodeCSVRows(transactions, start, end) {
+    const lines = [];
+    for (let i = start; i < end; i++) {
+        lines.push(EXPORT_COLUMNS.map(column => escapeCSVValue(getExportCellValue(transactions[i], column))).join(','));
+    }
+    return lines.length > 0 ? lines.join('\n') + '\n' : '';
+}
+
+/**
+ * Destino da exportação.
+ * Usa o seletor de arquivos com WritableStream quando o navegador oferece;
+ * senão acumula os blocos como partes de um Blob e baixa no final.
+ * Retorna null se o usuário cancelar.
+ */
+async function createExportSink(fileName, mimeType, extension) {
+    if (typeof window.showSaveFilePicker === 'function') {
+        try {
+            const handle = await window.showSaveFilePicker({
+                suggestedName: fileName,
+                types: [{ description: extension.toUpperCase(), accept: { [mimeType]: ['.' + extension] } }]
+            });
+            const writable = await handle.createWritable();
+            return {
+                write: chunk => writable.write(chunk),
+                close: () => writable.close(),
+                abort: () => writable.abort()
+            };
+        } catch (error) {
+            if (error.name === 'AbortError') return null;
+            debugLog('warn', 'Seletor de arquivos indisponível, usando download:', error);
+        }
+    }
+
+    const parts = [];
+    return {
+        write: async chunk => {
+            parts.push(chunk);
+        },
+        close: async () => {
+            downloadFile(new Blob(parts, { type: mimeType }), fileName, mimeType);
+            parts.length = 0;
+        },
+        abort: async () => {
+            parts.length = 0;
+        }
+    };
+}
+
+/**
+ * Escreve o CSV em blocos no destino
+ */
+async function writeTransactionsCSV(transactions, sink, onProgress) {
+    // BOM para o Excel reconhecer UTF-8
+    await sink.write('\uFEFF' + EXPORT_COLUMNS.join(',') + '\n');
+
+    for (let start = 0; start < transactions.length; start += EXPORT_CHUNK_ROWS) {
+        const end = Math.min(transactions.length, start + EXPORT_CHUNK_ROWS);
+        await sink.write(encodeCSVRows(transactions, start, end));
+        await onProgress(end);
+    }
+}
+
+/**
+ * Tabela de CRC-32 (polinômio 0xEDB88320), criada no primeiro uso
+ */
+let crc32Table = null;
+
+/**
+ * Atualiza um CRC-32 em andamento (começa em 0xFFFFFFFF; finalize com ~crc >>> 0)
+ */
+function crc32Update(crc, bytes) {
+    if (!crc32Table) {
+        crc32Table = new Int32Array(256);
+        for (let n = 0; n < 256; n++) {
+            let c = n;
+            for (let k = 0; k < 8; k++) {
+                c = c & 1 ? 0xEDB88320 ^ (c >>> 1) : c >>> 1;
+            }
+            crc32Table[n] = c;
+        }
+    }
+
+    for (let i = 0; i < bytes.length; i++) {
+        crc = crc32Table[(crc ^ bytes[i]) & 0xFF] ^ (crc >>> 8);
+    }
+    return crc;
+}
+
+/**
+ * Gravador ZIP em fluxo para o destino da exportação.
+ * Comprime com CompressionStream ("deflate-raw") quando disponível, senão
+ * grava sem compressão ("stored"). Tamanhos e CRC vão num descritor após os
+ * dados (bit 3), então o conteúdo nunca precisa ficar inteiro em memória.
+ */
+function createZipWriter(sink) {
+    const encoder = new TextEncoder();
+    const entries = [];
+    const now = new Date();
+    const dosTime = (now.getHours() << 11) | (now.getMinutes() << 5) | (now.getSeconds() >> 1);
+    const dosDate = ((now.getFullYear() - 1980) << 9) | ((now.getMonth() + 1) << 5) | now.getDate();
+    let deflate = true;
+    try {
+        new CompressionStream('deflate-raw');
+    } catch (error) {
+        deflate = false;
+    }
+    const method = deflate ? 8 : 0;
+    let offset = 0;
+
+    const write = async bytes => {
+        await sink.write(bytes);
+        offset += bytes.length;
+    };
+
+    const header = (signature, size) => {
+        const bytes = new Uint8Array(size);
+        const view = new DataView(bytes.buffer);
+        view.setUint32(0, signature, true);
+        return { bytes, view };
+    };
+
+    return {
+        /**
+         * Adiciona um arquivo; produce recebe uma função para escrever blocos (texto ou bytes)
+         */
+        async addFile(name, produce) {
+            const nameBytes = encoder.encode(name);
+            const entry = { nameBytes, offset, crc: 0, size: 0, compressedSize: 0 };
+
+            const local = header(0x04034b50, 30 + nameBytes.length);
+            local.view.setUint16(4, 20, true);
+            local.view.setUint16(6, 0x0808, true); // descritor de dados + nomes UTF-8
+            local.view.setUint16(8, method, true);
+            local.view.setUint16(10, dosTime, true);
+            local.view.setUint16(12, dosDate, true);
+            local.view.setUint16(26, nameBytes.length, true);
+            local.bytes.set(nameBytes, 30);
+            await write(local.bytes);
+
+            // Com compressão, a saída do compressor é drenada para o destino em paralelo
+            let compressor = null;
+            let drained = null;
+            if (deflate) {
+                const stream = new CompressionStream('deflate-raw');
+                const reader = stream.readable.getReader();
+                compressor = stream.writable.getWriter();
+                drained = (async () => {
+                    for (;;) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        entry.compressedSize += value.length;
+                        await write(value);
+                    }
+                })();
+            }
+
+            let crc = 0xFFFFFFFF;
+            await produce(async chunk => {
+                const bytes = typeof chunk === 'string' ? encoder.encode(chunk) : chunk;
+                crc = crc32Update(crc, bytes);
+                entry.size += bytes.length;
+                if (compressor) {
+                    await compressor.write(bytes);
+                } else {
+                    entry.compressedSize += bytes.length;
+                    await write(bytes);
+                }
+            });
+            if (compressor) {
+                await compressor.close();
+                await drained;
+            }
+            entry.crc = ~crc >>> 0;
+
+            const descriptor = header(0x08074b50, 16);
+            descriptor.view.setUint32(4, entry.crc, true);
+            descriptor.view.setUint32(8, entry.compressedSize, true);
+            descriptor.view.setUint32(12, entry.size, true);
+            await write(descriptor.bytes);
+
+            entries.push(entry);
+        },
+
+        /**
+         * Escreve o diretório central e o registro final
+         */
+        async close() {
+            const directoryOffset = offset;
+
+            for (const entry of entries) {
+                const central = header(0x02014b50, 46 + entry.nameBytes.length);
+                central.view.setUint16(4, 20, true);
+                central.view.setUint16(6, 20, true);
+                central.view.setUint16(8, 0x0808, true);
+                central.view.setUint16(10, method, true);
+                central.view.setUint16(12, dosTime, true);
+                central.view.setUint16(14, dosDate, true);
+                central.view.setUint32(16, entry.crc, true);
+                central.view.setUint32(20, entry.compressedSize, true);
+                central.view.setUint32(24, entry.size, true);
+                central.view.setUint16(28, entry.nameBytes.length, true);
+                central.view.setUint32(42, entry.offset, true);
+                central.bytes.set(entry.nameBytes, 46);
+                await write(central.bytes);
+            }
+
+            const end = header(0x06054b50, 22);
+            end.view.setUint16(8, entries.length, true);
+            end.view.setUint16(10, entries.length, true);
+            end.view.setUint32(12, offset - directoryOffset, true);
+            end.view.setUint32(16, directoryOffset, true);
+            await write(end.bytes);
+        }
+    };
+}
+
+/**
+ * Escapa texto para XML (remove caracteres de controle inválidos)
+ */
+function escapeXML(value) {
+    return String(value)
+        .replace(/[\x00-\x08\x0B\x0C\x0E-\x1F]/g, '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+/**
+ * Uma linha da planilha (texto inline, sem tabela de strings compartilhadas)
+ */
+function encodeXLSXRow(values) {
+    const cells = values.map(({ value, numeric }) => {
+        if (numeric) return `<c><v>${value}</v></c>`;
+        if (value === '') return '<c/>';
+        return `<c t="inlineStr"><is><t xml:space="preserve">${escapeXML(value)}</t></is></c>`;
+    });
+    return `<row>${cells.join('')}</row>`;
+}
+
+/**
+ * Escreve o XLSX (pacote ZIP com uma planilha) em blocos no destino
+ */
+async function writeTransactionsXLSX(transactions, sink, onProgress) {
+    const zip = createZipWriter(sink);
+    const xmlHeader = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n';
+
+    await zip.addFile('[Content_Types].xml', write => write(xmlHeader +
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">' +
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>' +
+        '<Default Extension="xml" ContentType="application/xml"/>' +
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>' +
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' +
+        '</Types>'));
+
+    await zip.addFile('_rels/.rels', write => write(xmlHeader +
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' +
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>' +
+        '</Relationships>'));
+
+    await zip.addFile('xl/workbook.xml', write => write(xmlHeader +
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" ' +
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">' +
+        '<sheets><sheet name="Transações" sheetId="1" r:id="rId1"/></sheets></workbook>'));
+
+    await zip.addFile('xl/_rels/workbook.xml.rels', write => write(xmlHeader +
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' +
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>' +
+        '</Relationships>'));
+
+    await zip.addFile('xl/worksheets/sheet1.xml', async write => {
+        await write(xmlHeader +
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>' +
+            encodeXLSXRow(EXPORT_COLUMNS.map(column => ({ value: column, numeric: false }))));
+
+        for (let start = 0; start < transactions.length; start += EXPORT_CHUNK_ROWS) {
+            const end = Math.min(transactions.length, start + EXPORT_CHUNK_ROWS);
+            const rows = [];
+            for (let i = start; i < end; i++) {
+                rows.push(encodeXLSXRow(EXPORT_COLUMNS.map(column => {
+                    const value = getExportCellValue(transactions[i], column);
+                    return EXPORT_NUMERIC_COLUMNS.has(column)
+                        ? { value: parseValue(value), numeric: true }
+                        : { value, numeric: false };
+                })));
+            }
+            await write(rows.join(''));
+            await onProgress(end);
+        }
+
+        await write('</sheetData></worksheet>');
+    });
+
+    await zip.close();
+}
+
+/**
+ * Mostra o progresso da exportação (null esconde)
+ */
+function updateExportProgress(done, total) {
+    const progress = document.getElementById('exportProgress');
+    if (!progress) return;
+
+    if (done === null) {
+        progress.classList.add('hidden');
+        return;
+    }
+    progress.classList.remove('hidden');
+    progress.textContent = `Exportando... ${done.toLocaleString('pt-BR')} de ${total.toLocaleString('pt-BR')} (${total ? Math.round(done / total * 100) : 100}%)`;
+}
+
+/**
+ * Exporta a visão atual de transações (filtrada e ordenada) em CSV ou XLSX
+ */
+async function exportCurrentView(format) {
+    if (appState.exportInProgress) {
+        showNotification('Já existe uma exportação em andamento', 'warning');
+        return;
+    }
+
+    const transactions = appState.cache.filteredTransactions || [];
+    if (transactions.length === 0) {
+        showNotification('Nenhuma transação na visão atual', 'warning');
+        return;
+    }
+
+    const isXLSX = format === 'xlsx';
+    const mimeType = isXLSX ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' : 'text/csv';
+    const fileName = `transacoes_${new Date().toISOString().slice(0, 10)}.${format}`;
+
+    // O seletor de arquivos precisa ser aberto ainda dentro do clique
+    const sink = await createExportSink(fileName, mimeType, format);
+    if (!sink) return;
+
+    appState.exportInProgress = true;
+    const startTime = performance.now();
+
+    try {
+        const onProgress = async done => {
+            updateExportProgress(done, transactions.length);
+            // Devolve o controle ao navegador entre blocos
+            await new Promise(resolve => setTimeout(resolve, 0));
+        };
+
+        updateExportProgress(0, transactions.length);
+        if (isXLSX) {
+            await writeTransactionsXLSX(transactions, sink, onProgress);
+        } else {
+            await writeTransactionsCSV(transactions, sink, onProgress);
+        }
+        await sink.close();
+
+        debugLog('info', 'Visão exportada:', {
+            format,
+            rows: transactions.length,
+            ms: Math.round(performance.now() - startTime)
+        });
+        showNotification(`${transactions.length.toLocaleString('pt-BR')} transações exportadas`, 'success');
+
+    } catch (error) {
+        debugLog('error', 'Erro na exportação:', error);
+        showNotification('Erro na exportação: ' + error.message, 'error');
+        await sink.abort();
+    } finally {
+        appState.exportInProgress = false;
+        updateExportProgress(null);
+    }
+}